@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Optional
+from starlette.responses import JSONResponse
+from config import settings
+from metrics import ADMISSION_ACTIVE, ADMISSION_LIMIT, ADMISSION_REJECTED, ADMISSION_WAIT, ADMISSION_WAITING
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# (path prefixes, methods or None for any, group); the first match wins.
+# Anything unmatched (/health, /metrics, /events/stream, docs) is never held back.
+ROUTE_GROUPS = (
+    (("/quotes",), None, "reads"),  # POST /quotes prices a stay without writing
+    (("/rooms", "/guests", "/reservations", "/reports", "/inventory", "/rates"), READ_METHODS, "reads"),
+    (("/reservations",), None, "bookings"),
+    (("/rooms", "/guests", "/inventory", "/rates"), None, "writes"),
+)
+
+# Waiting requests are admitted in this order as slots free up
+PRIORITY = ("bookings", "writes", "reads")
+
+
+def route_group(method: str, path: str) -> Optional[str]:
+    for prefixes, methods, group in ROUTE_GROUPS:
+        if path.startswith(prefixes) and (methods is None or method in methods):
+            return group
+    return None
+
+
+class _Group:
+    __slots__ = ("name", "limit", "queue_limit", "active", "waiters")
+
+    def __init__(self, name: str, limit: int, queue_limit: int):
+        self.name = name
+        self.limit = limit
+        self.queue_limit = queue_limit
+        self.active = 0
+        self.waiters = deque()
+
+
+class AdmissionController:
+    """Concurrency slots shared by route groups, with bounded per-group wait queues.
+
+    A request runs when both its group and the whole process are under
+    their limits and no earlier request of its group is waiting. Freed slots
+    go to waiting groups in ``PRIORITY`` order, FIFO within a group. All
+    state is touched only from the event loop, so no lock is needed.
+    """
+
+    def __init__(self, max_concurrency: int, limits: Dict[str, int], queue_limits: Dict[str, int]):
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.groups = {name: _Group(name, limits.get(name, max_concurrency), queue_limits.get(name, 0)) for name in PRIORITY}
+        ADMISSION_LIMIT.labels("all", "concurrency").set(max_concurrency)
+        for group in self.groups.values():
+            ADMISSION_LIMIT.labels(group.name, "concurrency").set(group.limit)
+            ADMISSION_LIMIT.labels(group.name, "queue").set(group.queue_limit)
+            ADMISSION_ACTIVE.labels(group.name).set_function(lambda group=group: group.active)
+            ADMISSION_WAITING.labels(group.name).set_function(lambda group=group: len(group.waiters))
+
+    def _can_run(self, group: _Group) -> bool:
+        return self.active < self.max_concurrency and group.active < group.limit
+
+    def _take(self, group: _Group):
+        self.active += 1
+        group.active += 1
+
+    def _dispatch(self):
+        for name in PRIORITY:
+            group = self.groups[name]
+            while group.waiters and self._can_run(group):
+                waiter = group.waiters.popleft()
+                if not waiter.done():
+                    self._take(group)
+                    waiter.set_result(None)
+
+    async def acquire(self, name: str, timeout: float) -> Optional[str]:
+        """Wait for a slot; returns None once admitted, or why the request is shed"""
+        group = self.groups[name]
+        if not group.waiters and self._can_run(group):
+            self._take(group)
+            ADMISSION_WAIT.labels(name).observe(0)
+            return None
+        if len(group.waiters) >= group.queue_limit:
+            return "queue_full"
+        waiter = asyncio.get_running_loop().create_future()
+        group.waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                waiter.cancel()
+                group.waiters.remove(waiter)
+                return "timeout"
+        except asyncio.CancelledError:
+            # Client went away while waiting
+            if waiter.done():
+                self.release(name)
+            else:
+                waiter.cancel()
+                group.waiters.remove(waiter)
+            raise
+        ADMISSION_WAIT.labels(name).observe(time.perf_counter() - started)
+        return None
+
+    def release(self, name: str):
+        group = self.groups[name]
+        self.active -= 1
+        group.active -= 1
+        self._dispatch()
+
+
+admission = AdmissionController(
+    settings.admission_max_concurrency, settings.admission_limits, settings.admission_queue_limits
+)
+
+
+class AdmissionMiddleware:
+    """ASGI middleware shedding load before it queues on the DB pool.
+
+    Requests that cannot get a slot within ``admission_queue_timeout_seconds``,
+    or find their group's wait queue full, get an immediate 503 with
+    Retry-After instead of waiting in the threadpool for a connection.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        group = route_group(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if group is None or not settings.admission_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        rejected = await self.controller.acquire(group, settings.admission_queue_timeout_seconds)
+        if rejected:
+            ADMISSION_REJECTED.labels(group, rejected).inc()
+            response = JSONResponse(
+                {"detail": "Server is busy, retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(settings.admission_retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(group)
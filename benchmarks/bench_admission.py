@@ -0,0 +1,113 @@
+"""Benchmark for admission control under a traffic spike.
+
+Drives AdmissionMiddleware directly over ASGI in front of a fake endpoint
+that holds one of ``--pool`` connections for ``--service-ms`` and fails
+after waiting ``--pool-timeout`` seconds for one, like a request stuck in
+get_db. An open-loop spike of catalogue reads plus a steady trickle of
+booking writes is replayed with admission control off and on, reporting
+latency and outcome per kind of request.
+
+    python -m benchmarks.bench_admission --reads-per-s 600 --bookings-per-s 40
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+
+from admission import AdmissionController, AdmissionMiddleware
+from config import settings
+
+
+def fake_endpoint(pool: asyncio.Semaphore, service_ms: float, pool_timeout: float):
+    async def app(scope, receive, send):
+        try:
+            await asyncio.wait_for(pool.acquire(), pool_timeout)
+        except asyncio.TimeoutError:
+            status = 500  # sqlalchemy.exc.TimeoutError: QueuePool limit reached
+        else:
+            try:
+                await asyncio.sleep(random.expovariate(1000 / service_ms))
+            finally:
+                pool.release()
+            status = 200
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+    return app
+
+
+async def request(app, method: str, path: str, results, kind: str):
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "query_string": b""}
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    results[kind].append((status, (time.perf_counter() - started) * 1000))
+
+
+async def replay(app, args) -> dict:
+    results = defaultdict(list)
+    tasks = []
+    arrivals = sorted(
+        [(random.uniform(0, args.seconds), "GET", "/rooms/", "read") for _ in range(int(args.reads_per_s * args.seconds))]
+        + [(random.uniform(0, args.seconds), "POST", "/reservations/", "booking")
+           for _ in range(int(args.bookings_per_s * args.seconds))]
+    )
+    started = time.perf_counter()
+    for at, method, path, kind in arrivals:
+        delay = at - (time.perf_counter() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(app, method, path, results, kind)))
+    await asyncio.gather(*tasks)
+    return results
+
+
+def report(label: str, results: dict):
+    print(label)
+    for kind in ("booking", "read"):
+        outcomes = Counter(status for status, _ in results[kind])
+        ok = sorted(ms for status, ms in results[kind] if status == 200)
+        p99 = ok[int(len(ok) * 0.99) - 1] if ok else float("nan")
+        p50 = statistics.median(ok) if ok else float("nan")
+        print(f"  {kind:8} {len(results[kind]):6} requests  ok {outcomes[200]:6}  "
+              f"shed 503 {outcomes[503]:6}  pool timeout 500 {outcomes[500]:6}  "
+              f"ok latency p50 {p50:7.1f} ms  p99 {p99:7.1f} ms")
+
+
+async def main_async(args):
+    settings.admission_queue_timeout_seconds = args.queue_timeout
+    for enabled in (False, True):
+        settings.admission_enabled = enabled
+        endpoint = fake_endpoint(asyncio.Semaphore(args.pool), args.service_ms, args.pool_timeout)
+        controller = AdmissionController(
+            args.pool,
+            {"bookings": args.pool, "writes": args.pool, "reads": max(1, args.pool * 2 // 3)},
+            {"bookings": 100, "writes": 30, "reads": 50},
+        )
+        report(f"admission control {'on' if enabled else 'off'}", await replay(AdmissionMiddleware(endpoint, controller), args))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--reads-per-s", type=float, default=600)
+    parser.add_argument("--bookings-per-s", type=float, default=40)
+    parser.add_argument("--pool", type=int, default=15)
+    parser.add_argument("--service-ms", type=float, default=30)
+    parser.add_argument("--pool-timeout", type=float, default=30)
+    parser.add_argument("--queue-timeout", type=float, default=settings.admission_queue_timeout_seconds)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
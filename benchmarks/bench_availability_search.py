@@ -0,0 +1,115 @@
+"""Latency benchmark for GET /rooms/available/search.
+
+Seeds 5k rooms and 1M reservations into the configured database, then runs
+random date-range searches through the same statement the route uses.
+
+    python -m benchmarks.bench_availability_search --seed
+    python -m benchmarks.bench_availability_search --runs 500
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from database import SessionLocal, init_db
+from models.guests import Guest  # noqa: F401  (registers the mapper)
+from models.rooms import RoomType
+from services.availability import available_rooms_statement
+
+ROOM_PREFIX = "BENCH-"
+EPOCH = datetime(2024, 1, 1)
+SPAN_DAYS = 730
+
+
+def seed(db, rooms: int, reservations: int):
+    """Bulk-load benchmark rows with set-based INSERT ... SELECT"""
+    db.execute(text("""
+        INSERT INTO guests (first_name, last_name, email, phone, id_number, created_at)
+        VALUES ('Bench', 'Guest', 'bench@example.com', '0000000000', 'BENCH-ID', now())
+        ON CONFLICT DO NOTHING
+    """))
+    db.execute(text("""
+        INSERT INTO rooms (room_number, room_type, price, status, floor, capacity, created_at)
+        SELECT :prefix || g,
+               (ARRAY['SINGLE','DOUBLE','SUITE','DELUXE'])[1 + g % 4]::roomtype,
+               50 + (g % 20) * 10,
+               'AVAILABLE'::roomstatus,
+               1 + g / 100,
+               1 + g % 4,
+               now()
+        FROM generate_series(1, :rooms) g
+        ON CONFLICT DO NOTHING
+    """), {"prefix": ROOM_PREFIX, "rooms": rooms})
+    db.execute(text("""
+        WITH bench_rooms AS (
+            SELECT array_agg(id) AS ids FROM rooms WHERE room_number LIKE :prefix || '%'
+        ), stays AS (
+            SELECT ids[1 + floor(random() * array_length(ids, 1))::int] AS room_id,
+                   :epoch + floor(random() * :span) * interval '1 day' AS check_in,
+                   1 + floor(random() * 7)::int AS nights,
+                   (ARRAY['PENDING','CONFIRMED','CHECKED_IN','CHECKED_OUT','CANCELLED'])
+                       [1 + floor(random() * 5)::int] AS status
+            FROM bench_rooms, generate_series(1, :reservations)
+        )
+        INSERT INTO reservations (guest_id, room_id, check_in_date, check_out_date,
+                                  status, total_price, number_of_guests, created_at)
+        SELECT (SELECT id FROM guests WHERE email = 'bench@example.com'),
+               room_id, check_in, check_in + nights * interval '1 day',
+               status::reservationstatus, 100 * nights, 1, now()
+        FROM stays
+    """), {"prefix": ROOM_PREFIX, "epoch": EPOCH, "span": SPAN_DAYS, "reservations": reservations})
+    db.execute(text("ANALYZE rooms"))
+    db.execute(text("ANALYZE reservations"))
+    db.commit()
+
+
+def run(db, runs: int):
+    timings = []
+    found = 0
+    for _ in range(runs):
+        check_in = EPOCH + timedelta(days=random.randrange(SPAN_DAYS))
+        check_out = check_in + timedelta(days=random.randint(1, 7))
+        stmt = available_rooms_statement(
+            check_in,
+            check_out,
+            room_type=random.choice([None, *RoomType]),
+            min_capacity=random.choice([None, 2]),
+            max_price=random.choice([None, 150.0]),
+        )
+        started = time.perf_counter()
+        found += len(db.scalars(stmt).all())
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    print(f"searches: {runs}, avg rooms returned: {found / runs:.0f}")
+    print(f"p50 {statistics.median(timings):.2f} ms | "
+          f"p95 {timings[int(runs * 0.95) - 1]:.2f} ms | "
+          f"p99 {timings[int(runs * 0.99) - 1]:.2f} ms | "
+          f"max {timings[-1]:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", action="store_true", help="load benchmark data first")
+    parser.add_argument("--rooms", type=int, default=5_000)
+    parser.add_argument("--reservations", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        if args.seed:
+            started = time.perf_counter()
+            seed(db, args.rooms, args.reservations)
+            print(f"seeded in {time.perf_counter() - started:.1f}s")
+        run(db, args.runs)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
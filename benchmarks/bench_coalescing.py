@@ -0,0 +1,91 @@
+"""Benchmark for single-flight coalescing of catalogue cache misses.
+
+Fires bursts of identical GET /rooms/available/search requests from a
+thread pool (as FastAPI runs sync handlers) at catalogue_cache.load_and_store
+with a fake query that takes ``--query-ms``. Each burst starts on a fresh
+cache generation, as after a booking commits, so every request misses. Reports
+queries run per burst and request latency with coalescing off and on, and
+checks that followers sharing a response still get their own 304.
+
+    python -m benchmarks.bench_coalescing --clients 200 --bursts 20
+"""
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from cache import cache
+from config import settings
+from models.rooms import RoomStatus, RoomType
+from schemas.rooms import RoomResponse
+from services import catalogue_cache
+
+adapter = TypeAdapter(List[RoomResponse])
+ROOMS = [
+    {"id": i, "room_number": f"R{i}", "room_type": RoomType.DOUBLE, "price": 120.0, "floor": i % 10,
+     "capacity": 2, "description": None, "status": RoomStatus.AVAILABLE}
+    for i in range(1, 201)
+]
+QUERY = b"check_in_date=2025-06-01&check_out_date=2025-06-04&room_type=DOUBLE"
+
+
+def make_request(etag: str = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({
+        "type": "http", "method": "GET", "path": "/rooms/available/search", "query_string": QUERY,
+        "headers": headers, "app": None,
+    })
+
+
+def run_burst(pool: ThreadPoolExecutor, clients: int, query_ms: float, queries: Counter, etag: str = None):
+    cache.invalidate(catalogue_cache.AVAILABILITY)
+    start = threading.Barrier(clients)
+
+    def load():
+        queries["n"] += 1
+        time.sleep(query_ms / 1000)
+        return ROOMS
+
+    def client(i):
+        request = make_request(etag if i % 2 else None)
+        start.wait()
+        started = time.perf_counter()
+        cached, key = catalogue_cache.lookup(request, catalogue_cache.AVAILABILITY)
+        response = cached or catalogue_cache.load_and_store(request, Response(), key, adapter, load)
+        return (time.perf_counter() - started) * 1000, response
+
+    return list(pool.map(client, range(clients)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--bursts", type=int, default=20)
+    parser.add_argument("--query-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    with ThreadPoolExecutor(args.clients) as pool:
+        for enabled in (False, True):
+            settings.coalesce_enabled = enabled
+            queries, latencies = Counter(), []
+            for _ in range(args.bursts):
+                results = run_burst(pool, args.clients, args.query_ms, queries)
+                latencies += [ms for ms, _ in results]
+            print(f"coalescing {'on' if enabled else 'off'}: {args.clients} identical requests per burst")
+            print(f"  queries per burst  {queries['n'] / args.bursts:8.1f}")
+            print(f"  latency            p50 {statistics.median(latencies):.1f} ms, "
+                  f"max {max(latencies):.1f} ms")
+
+        etag = results[0][1].headers["etag"]
+        statuses = Counter(response.status_code for _, response in run_burst(pool, args.clients, args.query_ms, Counter(), etag))
+        print(f"  with If-None-Match on half the burst: {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark for the in-process event broker behind GET /events/stream.
+
+Parks N idle subscribers on the broker, then publishes events from another
+thread (as the LISTEN thread does) and measures how long it takes for every
+subscriber to receive each one, plus the memory an idle subscriber costs.
+Also checks resume: a subscriber starting from an old sequence number gets
+the buffered events after it, and one older than the buffer gets a reset.
+
+    python -m benchmarks.bench_event_fanout --subscribers 5000 --events 50
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+import tracemalloc
+
+from services.events import EventBroker
+
+
+async def consume(broker: EventBroker, since, received: list, done: asyncio.Event, expected: int):
+    stream = broker.subscribe(since)
+    await stream.__anext__()  # retry: hint
+    count = 0
+    async for chunk in stream:
+        if chunk.startswith(b":"):
+            continue
+        count += chunk.count(b"event: ")
+        received.append((time.perf_counter(), chunk))
+        if count >= expected:
+            done.set()
+            return
+
+
+def frames_in(chunks) -> int:
+    return sum(chunk.count(b"event: ") for _, chunk in chunks)
+
+
+async def main_async(args):
+    loop = asyncio.get_running_loop()
+    broker = EventBroker(args.buffer)
+    broker.bind(loop)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    finished = []
+    tasks = []
+    published = {}
+    for _ in range(args.subscribers):
+        received, done = [], asyncio.Event()
+        finished.append((received, done))
+        tasks.append(asyncio.create_task(consume(broker, None, received, done, args.events)))
+    await asyncio.sleep(0.1)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    idle_bytes = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    def publisher():
+        for seq in range(1, args.events + 1):
+            published[seq] = time.perf_counter()
+            broker.publish_threadsafe([{"seq": seq, "type": "room", "data": {"id": seq % 100, "status": "occupied"}}])
+            time.sleep(args.interval)
+
+    started = time.perf_counter()
+    thread = threading.Thread(target=publisher)
+    thread.start()
+    await asyncio.wait_for(asyncio.gather(*(done.wait() for _, done in finished)), 60)
+    elapsed = time.perf_counter() - started
+    thread.join()
+
+    # Delivery latency of each subscriber's final event
+    last_published = published[args.events]
+    lags = [(received[-1][0] - last_published) * 1000 for received, _ in finished]
+
+    print(f"{args.subscribers} subscribers, {args.events} events, buffer {args.buffer}")
+    print(f"  idle cost        {idle_bytes / args.subscribers:8.0f} bytes per subscriber")
+    print(f"  fan-out          {args.subscribers * args.events / elapsed:8.0f} deliveries/s")
+    print(f"  last-event lag   p50 {statistics.median(lags):.1f} ms, max {max(lags):.1f} ms")
+    print(f"  every subscriber got every event: {all(frames_in(received) == args.events for received, _ in finished)}")
+
+    # Resume from the middle of the buffer, and from before it
+    middle = args.events // 2
+    resumed = broker.subscribe(middle)
+    await resumed.__anext__()
+    replay = await resumed.__anext__()
+    print(f"  resume from {middle}: replayed {replay.count(b'event: ')} events")
+    broker._publish([{"seq": args.events + i, "type": "room", "data": {}} for i in range(1, args.buffer + 2)])
+    stale = broker.subscribe(1)
+    await stale.__anext__()
+    reset = (await stale.__anext__()).decode().splitlines()[1]
+    print(f"  resume from evicted seq 1: {reset}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between published events")
+    parser.add_argument("--buffer", type=int, default=1000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
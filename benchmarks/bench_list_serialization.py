@@ -0,0 +1,112 @@
+"""Benchmark for list endpoints: ORM + response_model versus rows + orjson.
+
+Loads a page of reservations (optionally expanded with room and guest) from
+an in-memory SQLite copy of the schema and times the two ways of turning it
+into a response body:
+
+  orm   load Reservation entities, build ReservationExpandedResponse via
+        expanded(), then what FastAPI does with a response_model: dump,
+        re-validate, serialize and json.dumps
+  rows  select response_columns() as rows, expanded_rows(), orjson.dumps
+
+and checks that both produce the same JSON.
+
+    python -m benchmarks.bench_list_serialization --items 500 --expand room,guest
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from database import Base
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus, RoomType
+from schemas.reservations import ReservationExpandedResponse, ReservationResponse
+from services.expansion import expand_options, expanded, expanded_rows, parse_expand
+from services.fast_lists import response_columns
+
+adapter = TypeAdapter(List[ReservationExpandedResponse])
+
+
+def seed(engine, items: int):
+    Base.metadata.create_all(engine, tables=[Guest.__table__, Room.__table__, Reservation.__table__])
+    now = datetime(2024, 6, 1, 12, 30, 15, 250000)
+    with engine.begin() as connection:
+        connection.execute(insert(Room), [
+            {"id": i, "room_number": f"R{i}", "room_type": random.choice(list(RoomType)), "price": 80.0 + i,
+             "status": RoomStatus.AVAILABLE, "floor": i % 10, "capacity": 2, "description": "Sea view", "created_at": now, "change_seq": i}
+            for i in range(1, 101)
+        ])
+        connection.execute(insert(Guest), [
+            {"id": i, "first_name": "Ada", "last_name": f"Guest{i}", "email": f"guest{i}@example.com",
+             "phone": "5550000000", "address": None, "id_number": f"ID{i}", "created_at": now, "change_seq": i}
+            for i in range(1, 201)
+        ])
+        connection.execute(insert(Reservation), [
+            {"id": i, "guest_id": random.randint(1, 200), "room_id": random.randint(1, 100),
+             "check_in_date": now + timedelta(days=i), "check_out_date": now + timedelta(days=i + 3),
+             "number_of_guests": 2, "status": ReservationStatus.CONFIRMED, "total_price": 301.5,
+             "special_requests": "Late check-in" if i % 3 else None, "created_at": now, "updated_at": now, "change_seq": i}
+            for i in range(1, items + 1)
+        ])
+
+
+def orm_body(db: Session, fields, items: int) -> bytes:
+    reservations = db.scalars(
+        select(Reservation).options(*expand_options(fields, many=True)).order_by(Reservation.id).limit(items)
+    ).all()
+    content = [expanded(reservation, fields) for reservation in reservations]
+    # fastapi.routing.serialize_response with response_model_exclude_unset=True
+    prepared = [item.model_dump(exclude_unset=True) for item in content]
+    data = adapter.dump_python(adapter.validate_python(prepared), mode="json", exclude_unset=True)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def rows_body(db: Session, fields, items: int) -> bytes:
+    rows = db.execute(
+        select(*response_columns(Reservation, ReservationResponse)).order_by(Reservation.id).limit(items)
+    ).all()
+    return orjson.dumps(expanded_rows(db, rows, fields))
+
+
+def timed(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        body = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return body, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--expand", default="")
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    seed(engine, args.items)
+    fields = parse_expand(args.expand)
+    with Session(engine) as db:
+        orm, orm_ms = timed(lambda: orm_body(db, fields, args.items), args.runs)
+        db.expunge_all()
+        rows, rows_ms = timed(lambda: rows_body(db, fields, args.items), args.runs)
+
+    print(f"{args.items} reservations, expand={sorted(fields) or 'none'}, median of {args.runs}")
+    print(f"  orm + response_model  {orm_ms:8.2f} ms")
+    print(f"  rows + orjson         {rows_ms:8.2f} ms  ({orm_ms / rows_ms:.1f}x)")
+    print(f"  identical JSON: {orm == rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Request throughput with logging disabled, queued (current) and synchronous.
+
+Drives the ASGI app directly (no server, no sockets) with GET /health, every
+request logged (sampling forced to 1.0), so the numbers isolate what logging
+costs a request:
+
+  disabled  the hms logger drops everything
+  queued    QueueHandler on the request path, file I/O on the listener thread
+  sync      the previous setup: RotatingFileHandler written on the request path
+
+--write-latency-ms adds a sleep to every file write, standing in for a slow
+or contended volume or a backed-up log collector pipe; that is where a
+handler on the request path (the event loop, for access logs) stalls
+every request.
+
+    python -m benchmarks.bench_logging --requests 5000 --concurrency 50
+    python -m benchmarks.bench_logging --write-latency-ms 1
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+# Before the app is imported: log to a scratch directory, not the console
+os.environ["LOG_DIR"] = tempfile.mkdtemp(prefix="hms-bench-logs-")
+os.environ["LOG_CONSOLE"] = "false"
+
+from config import settings  # noqa: E402
+from logger import JsonFormatter, RequestContextFilter, listener, logger, stop_logging  # noqa: E402
+from main import app  # noqa: E402
+
+
+async def request(path: str):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run(path: str, requests: int, concurrency: int) -> float:
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            assert await request(path) == 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+def slow_down(handler: logging.Handler, seconds: float):
+    if not seconds:
+        return
+    emit = handler.emit
+
+    def slow_emit(record):
+        time.sleep(seconds)
+        emit(record)
+
+    handler.emit = slow_emit
+
+
+def configure(mode: str, write_latency: float):
+    """Point the hms logger at the handler setup being measured"""
+    queued = logger.handlers[0]
+    logger.disabled = mode == "disabled"
+    if mode == "sync":
+        handler = RotatingFileHandler(os.path.join(settings.log_dir, "sync.log"), maxBytes=5 * 1024 * 1024, backupCount=5)
+        handler.setFormatter(JsonFormatter())
+        handler.addFilter(RequestContextFilter())
+        slow_down(handler, write_latency)
+        logger.handlers[:] = [handler]
+    return queued
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--write-latency-ms", type=float, default=0)
+    args = parser.parse_args()
+    settings.log_sample_rates[args.path] = 1.0
+    write_latency = args.write_latency_ms / 1000
+    for handler in listener.handlers:
+        slow_down(handler, write_latency)
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(run(args.path, 200, args.concurrency))  # warm-up
+    results = {}
+    for mode in ("disabled", "sync", "queued"):
+        queued = configure(mode, write_latency)
+        results[mode] = loop.run_until_complete(run(args.path, args.requests, args.concurrency))
+        logger.handlers[:] = [queued]
+        logger.disabled = False
+    drain_started = time.perf_counter()
+    stop_logging()
+    drained = time.perf_counter() - drain_started
+
+    print(f"GET {args.path}: {args.requests} requests, concurrency {args.concurrency}, "
+          f"write latency {args.write_latency_ms}ms, logs in {settings.log_dir}")
+    for mode, throughput in results.items():
+        print(f"  {mode:<9} {throughput:9.0f} req/s  ({throughput / results['disabled']:.0%} of disabled)")
+    print(f"  then {drained:.2f}s for the listener to drain its backlog")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark for POST /quotes: 10k room x stay quotes per call.
+
+In-process mode prices 100 rooms x 100 stays through RateCalendar.price
+against a per-quote, per-night Python loop over the same rates. --db also
+times quote_matrix() (calendar load included) against the configured
+database, using the rooms seeded by benchmarks.bench_availability_search.
+
+    python -m benchmarks.bench_quotes
+    python -m benchmarks.bench_quotes --rooms 200 --stays 50 --db
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from models.guests import Guest  # noqa: F401  (registers the mapper)
+from models.rates import RateRule, RateRuleKind
+from models.reservations import Reservation  # noqa: F401
+from models.rooms import RoomType
+from services.pricing import TYPE_INDEX, RateCalendar
+
+FIRST = date(2024, 6, 1)
+SPAN_DAYS = 365
+
+
+def synthetic_calendar():
+    """Weekend uplift, random seasonal overrides and a weekly discount"""
+    factors = np.ones((len(TYPE_INDEX), SPAN_DAYS + 30))
+    weekdays = (np.arange(FIRST.toordinal(), FIRST.toordinal() + factors.shape[1]) - 1) % 7
+    factors[:, np.isin(weekdays, [4, 5])] *= 1.25
+    factors *= np.random.uniform(0.8, 1.6, size=factors.shape)
+    weekly = RateRule(kind=RateRuleKind.LENGTH_OF_STAY, min_nights=7, multiplier=0.9)
+    return RateCalendar(FIRST.toordinal(), factors.shape[1], factors, [weekly]), factors
+
+
+def naive_quotes(rooms, stays, factors):
+    totals = []
+    for price, room_type in rooms:
+        row = []
+        for check_in, check_out in stays:
+            total = sum(
+                price * factors[TYPE_INDEX[room_type], (check_in - FIRST).days + night]
+                for night in range((check_out - check_in).days)
+            )
+            row.append(round(total * (0.9 if (check_out - check_in).days >= 7 else 1.0), 2))
+        totals.append(row)
+    return totals
+
+
+def timed(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return result, timings
+
+
+def report(label, timings):
+    print(f"{label:<20} p50 {statistics.median(timings):8.2f} ms | max {timings[-1]:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--stays", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--db", action="store_true", help="also time quote_matrix() against the database")
+    args = parser.parse_args()
+
+    rooms = [(random.choice([80.0, 120.0, 200.0, 350.0]), random.choice(list(RoomType))) for _ in range(args.rooms)]
+    stays = []
+    for _ in range(args.stays):
+        check_in = FIRST + timedelta(days=random.randrange(SPAN_DAYS))
+        stays.append((check_in, check_in + timedelta(days=random.randint(1, 14))))
+    print(f"quotes per call: {args.rooms * args.stays}")
+
+    calendar, factors = synthetic_calendar()
+    base = np.array([price for price, _ in rooms])[:, None]
+    types = np.array([TYPE_INDEX[room_type] for _, room_type in rooms])[:, None]
+    check_ins = np.array([check_in.toordinal() for check_in, _ in stays])[None, :]
+    check_outs = np.array([check_out.toordinal() for _, check_out in stays])[None, :]
+
+    vectorized, timings = timed(lambda: calendar.price(base, types, check_ins, check_outs), args.runs)
+    report("vectorized", timings)
+    naive, timings = timed(lambda: naive_quotes(rooms, stays, factors), max(args.runs // 10, 1))
+    report("per-quote loop", timings)
+    print(f"max abs difference: {np.abs(vectorized - np.array(naive)).max():.4f}")
+
+    if args.db:
+        from sqlalchemy import select
+        from database import SessionLocal
+        from models.rooms import Room
+        from services.pricing import quote_matrix
+        db = SessionLocal()
+        try:
+            db_rooms = db.scalars(select(Room).limit(args.rooms)).all()
+            _, timings = timed(lambda: quote_matrix(db, db_rooms, stays), args.runs)
+            report(f"db ({len(db_rooms)} rooms)", timings)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
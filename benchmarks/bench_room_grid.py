@@ -0,0 +1,98 @@
+"""Benchmark for GET /rooms/grid: 1000 rooms x 90 days.
+
+In-process mode times building and encoding the grid from synthetic stays
+against a naive per-cell build, and compares response sizes. --db also
+times room_grid() against the configured database (seed it with
+benchmarks.bench_availability_search --seed).
+
+    python -m benchmarks.bench_room_grid
+    python -m benchmarks.bench_room_grid --db --runs 50
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from services.room_grid import build_bitsets, encode_bitmap, encode_runs, room_grid
+
+START = date(2024, 6, 1)
+
+
+def synthetic_stays(rooms: int, days: int, occupancy: float):
+    """Back-to-back stays of 1-7 nights filling roughly ``occupancy`` of each room"""
+    stays = []
+    for room_id in range(1, rooms + 1):
+        night = -random.randint(0, 6)
+        while night < days:
+            nights = random.randint(1, 7)
+            if random.random() < occupancy:
+                stays.append((room_id, START + timedelta(days=night), START + timedelta(days=night + nights)))
+            night += nights
+    return stays
+
+
+def naive_grid(room_ids, stays, days):
+    """The shape a client gets today: one JSON object per room per day"""
+    held = {(room_id, day) for room_id, check_in, check_out in stays
+            for day in range(max((check_in - START).days, 0), min((check_out - START).days, days))}
+    return [
+        {"room_id": room_id, "date": (START + timedelta(days=day)).isoformat(), "occupied": (room_id, day) in held}
+        for room_id in room_ids for day in range(days)
+    ]
+
+
+def timed(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return result, timings
+
+
+def report(label, timings):
+    print(f"{label:<22} p50 {statistics.median(timings):8.2f} ms | max {timings[-1]:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=1_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--occupancy", type=float, default=0.7)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--db", action="store_true", help="also time room_grid() against the database")
+    args = parser.parse_args()
+
+    room_ids = list(range(1, args.rooms + 1))
+    stays = synthetic_stays(args.rooms, args.days, args.occupancy)
+    print(f"rooms: {args.rooms}, days: {args.days}, stays: {len(stays)}")
+
+    naive, timings = timed(lambda: naive_grid(room_ids, stays, args.days), max(args.runs // 4, 1))
+    report("naive per-cell", timings)
+    bits, timings = timed(lambda: build_bitsets(room_ids, stays, START, args.days), args.runs)
+    report("bitsets", timings)
+    bitmaps, timings = timed(lambda: [encode_bitmap(b, args.days) for b in bits], args.runs)
+    report("encode bitmap", timings)
+    runs, timings = timed(lambda: [encode_runs(b, args.days) for b in bits], args.runs)
+    report("encode rle", timings)
+
+    for label, body in (("naive", naive), ("bitmap", bitmaps), ("rle", runs)):
+        print(f"{label + ' body':<22} {len(json.dumps(body)) / 1024:8.1f} KiB")
+
+    if args.db:
+        from database import SessionLocal
+        from models.guests import Guest  # noqa: F401  (registers the mapper)
+        db = SessionLocal()
+        try:
+            for encoding in ("bitmap", "rle"):
+                grid, timings = timed(lambda: room_grid(db, START, args.days, encoding), args.runs)
+                report(f"db {encoding} ({len(grid['room_ids'])} rooms)", timings)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
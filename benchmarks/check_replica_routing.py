@@ -0,0 +1,66 @@
+"""Check read-replica routing and the read-your-writes guard.
+
+Runs get_db() for a set of requests and reports which engine each one was
+given. With --live it also asks each session's server whether it is a
+standby, so run it against a primary and a streaming replica:
+
+    DATABASE_URL=postgresql://localhost:5432/hms \\
+    REPLICA_DATABASE_URL=postgresql://localhost:5433/hms \\
+        python -m benchmarks.check_replica_routing --live
+"""
+import argparse
+import sys
+import time
+
+from fastapi import Response
+from sqlalchemy import text
+from starlette.requests import Request
+
+from database import LAST_WRITE_COOKIE, engine, get_db, replica_engine
+
+# (method, path, seconds since this client's last write or None, expected engine)
+CASES = [
+    ("GET", "/rooms/", None, "replica"),
+    ("GET", "/guests/search/email/a@example.com", None, "replica"),
+    ("GET", "/reports/occupancy", None, "replica"),
+    ("GET", "/reservations/", None, "primary"),
+    ("POST", "/rooms/", None, "primary"),
+    ("GET", "/rooms/", 1, "primary"),
+    ("GET", "/rooms/", 3600, "replica"),
+]
+
+
+def make_request(method: str, path: str, wrote_ago):
+    headers = []
+    if wrote_ago is not None:
+        headers.append((b"cookie", f"{LAST_WRITE_COOKIE}={time.time() - wrote_ago}".encode()))
+    return Request({"type": "http", "method": method, "path": path, "query_string": b"", "headers": headers})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--live", action="store_true", help="query pg_is_in_recovery() through each session")
+    args = parser.parse_args()
+    if replica_engine is None:
+        sys.exit("REPLICA_DATABASE_URL is not set")
+
+    failures = 0
+    for method, path, wrote_ago, expected in CASES:
+        response = Response()
+        sessions = get_db(make_request(method, path, wrote_ago), response)
+        db = next(sessions)
+        routed = "replica" if db.get_bind() is replica_engine else "primary" if db.get_bind() is engine else "?"
+        detail = ""
+        if args.live:
+            detail = f" standby={db.scalar(text('SELECT pg_is_in_recovery()'))}"
+        sessions.close()
+        cookie = " sets cookie" if LAST_WRITE_COOKIE in response.headers.get("set-cookie", "") else ""
+        ok = routed == expected
+        failures += not ok
+        wrote = "" if wrote_ago is None else f" (wrote {wrote_ago}s ago)"
+        print(f"{'ok ' if ok else 'BAD'} {method:<4} {path}{wrote} -> {routed}{detail}{cookie}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""HTTP load test for comparing the sync and async database paths.
+
+Run the same workload against each mode and compare the summaries:
+
+    uvicorn main:app --port 8000                   # threadpool + psycopg2
+    DB_ASYNC=true uvicorn main:app --port 8001     # async def + asyncpg
+    python -m benchmarks.load_test --base-url http://localhost:8000
+    python -m benchmarks.load_test --base-url http://localhost:8001
+
+Uses keep-alive HTTP/1.1 connections on asyncio, so the client is not the bottleneck.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    "/rooms/?limit=20",
+    "/guests/?limit=20",
+    "/reservations/?limit=20",
+    "/rooms/available/search?check_in_date=2030-01-01T14:00:00&check_out_date=2030-01-04T11:00:00",
+]
+
+
+async def worker(host: str, port: int, paths, deadline: float, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode())
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            status_line, *header_lines = head.decode("latin-1").split("\r\n")
+            length = 0
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not status_line.split()[1].startswith("2"):
+                errors.append(status_line)
+    finally:
+        writer.close()
+
+
+async def run(base_url: str, concurrency: int, duration: float, paths):
+    url = urlsplit(base_url)
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        worker(url.hostname, url.port or 80, paths, deadline, latencies, errors)
+        for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"{base_url}: {concurrency} connections for {elapsed:.1f}s")
+    print(f"requests {len(latencies)} | {len(latencies) / elapsed:.0f} req/s | non-2xx {len(errors)}")
+    if latencies:
+        print(f"p50 {statistics.median(latencies):.1f} ms | "
+              f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--path", action="append", dest="paths", help="repeatable; defaults to a read mix")
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.concurrency, args.duration, args.paths or DEFAULT_PATHS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Concurrency stress test: parallel bookings for the same room and dates.
+
+Start the API (ideally with several workers), then run:
+
+    BOOKING_MODE=exclusion uvicorn main:app --workers 4
+    python -m benchmarks.stress_concurrent_bookings --requests 200 --threads 50
+
+Exactly one booking must win per round; every other request must get the
+400 "Room is not available" response. The final count of active
+reservations is read back from the database.
+"""
+import argparse
+import json
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib import error, request
+
+from sqlalchemy import func, select
+
+from database import SessionLocal
+from models.guests import Guest
+from models.reservations import Reservation
+from models.rooms import Room, RoomType
+from services.availability import active_overlap
+
+
+def seed_room_and_guest():
+    tag = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        guest = Guest(first_name="Stress", last_name="Test", email=f"stress-{tag}@example.com",
+                      phone="0000000000", id_number=f"STRESS-{tag}", created_at=datetime.now())
+        room = Room(room_number=f"STRESS-{tag}", room_type=RoomType.SINGLE, price=100, capacity=2,
+                    created_at=datetime.now())
+        db.add_all([guest, room])
+        db.commit()
+        return guest.id, room.id
+
+
+def book(base_url: str, payload: dict) -> int:
+    req = request.Request(
+        f"{base_url}/reservations/",
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with request.urlopen(req, timeout=30) as resp:
+            return resp.status
+    except error.HTTPError as exc:
+        return exc.code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=50)
+    args = parser.parse_args()
+
+    guest_id, room_id = seed_room_and_guest()
+    check_in = datetime(2030, 1, 1)
+    check_out = check_in + timedelta(days=3)
+    # Staggered but overlapping stays, so every pair of requests conflicts
+    payloads = [
+        {
+            "guest_id": guest_id,
+            "room_id": room_id,
+            "check_in_date": (check_in + timedelta(hours=i % 24)).isoformat(),
+            "check_out_date": (check_out + timedelta(hours=i % 24)).isoformat(),
+        }
+        for i in range(args.requests)
+    ]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        statuses = Counter(pool.map(lambda p: book(args.base_url, p), payloads))
+    elapsed = time.perf_counter() - started
+
+    with SessionLocal() as db:
+        booked = db.scalar(
+            select(func.count()).select_from(Reservation)
+            .where(Reservation.room_id == room_id, active_overlap(check_in, check_out + timedelta(days=1)))
+        )
+
+    print(f"{args.requests} requests in {elapsed:.2f}s, status codes: {dict(statuses)}")
+    print(f"active reservations for room {room_id}: {booked}")
+    if booked != 1:
+        raise SystemExit(f"FAIL: expected exactly 1 booking, found {booked}")
+    print("OK: no double booking")
+
+
+if __name__ == "__main__":
+    main()
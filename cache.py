@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from config import settings
+
+
+class LocalBackend:
+    """In-process LRU with per-entry TTL. Also the stand-in for the shared backend."""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Counters live outside the LRU: evicting one would resurrect stale entries
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key]).encode()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisBackend:
+    """Shared backend, so every worker sees the same entries and invalidations"""
+
+    def __init__(self, url: str):
+        # Optional dependency: only needed when CACHE_BACKEND=redis
+        import redis
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        self._client.set(key, value, ex=ttl)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+class Cache:
+    """Namespaced cache. Invalidating a namespace bumps its generation
+    counter, which orphans every key written under the old one; orphans age
+    out through TTL (and LRU locally) instead of being scanned and deleted.
+    """
+
+    def __init__(self, backend, ttl: int, prefix: str = "hms"):
+        self.backend = backend
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _generation(self, namespace: str) -> int:
+        value = self.backend.get(f"{self.prefix}:gen:{namespace}")
+        return int(value) if value else 0
+
+    def key(self, namespace: str, key: str) -> str:
+        """Resolve a key under the namespace's current generation.
+
+        Resolve once, before reading the database, and reuse it for ``set``:
+        a value computed while an invalidation lands is then stored under
+        the old generation where nobody will read it.
+        """
+        return f"{self.prefix}:{namespace}:{self._generation(namespace)}:{key}"
+
+    def get(self, full_key: str) -> Optional[bytes]:
+        return self.backend.get(full_key)
+
+    def set(self, full_key: str, value: bytes):
+        self.backend.set(full_key, value, self.ttl)
+
+    def invalidate(self, namespace: str):
+        self.backend.incr(f"{self.prefix}:gen:{namespace}")
+
+
+def _make_backend():
+    if settings.cache_backend == "redis":
+        return RedisBackend(settings.cache_url)
+    return LocalBackend(settings.cache_max_entries)
+
+
+cache = Cache(_make_backend(), settings.cache_ttl_seconds)
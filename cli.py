@@ -0,0 +1,114 @@
+"""Operational commands for HMS.
+
+    python cli.py import-guests guests.csv
+    python cli.py import-guests guests.ndjson --batch-size 5000 > rejects.ndjson
+    python cli.py rebuild-room-nights
+    python cli.py check-inventory --fix
+    python cli.py archive --months 12
+    python cli.py lifecycle
+    python cli.py init-db
+"""
+import argparse
+import json
+import sys
+
+from config import settings
+from database import SessionLocal, init_db
+import models.reservations  # noqa: F401  (registers mappers used by relationships)
+import models.rooms  # noqa: F401
+from services.guest_import import import_guests, iter_records
+from services.archive import archive_old_rows
+from services.changes import backfill_change_seq
+from services.inventory import check_inventory
+from services.lifecycle import run_lifecycle
+from services.room_nights import rebuild_room_nights
+
+
+def cmd_import_guests(args):
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    with open(args.path, encoding="utf-8", newline="") as lines, SessionLocal() as db:
+        for event in import_guests(db, iter_records(lines, fmt), args.batch_size):
+            if event["type"] == "reject":
+                print(json.dumps(event), flush=True)
+            else:
+                print(
+                    f"{event['type']}: processed {event['processed']}, "
+                    f"inserted {event['inserted']}, rejected {event['rejected']}",
+                    file=sys.stderr,
+                )
+
+
+def cmd_rebuild_room_nights(args):
+    with SessionLocal() as db:
+        rebuild_room_nights(db)
+    print("room_nights rebuilt", file=sys.stderr)
+
+
+def cmd_check_inventory(args):
+    with SessionLocal() as db:
+        drift = check_inventory(db, fix=args.fix)
+    for row in drift:
+        print(json.dumps(row, default=str), flush=True)
+    print(f"{len(drift)} drifted counters" + (" fixed" if args.fix and drift else ""), file=sys.stderr)
+    if drift and not args.fix:
+        sys.exit(1)
+
+
+def cmd_archive(args):
+    with SessionLocal() as db:
+        moved = archive_old_rows(db, args.months, args.batch_size)
+    for table, rows in moved.items():
+        print(f"{table}: {rows} archived", file=sys.stderr)
+
+
+def cmd_lifecycle(args):
+    with SessionLocal() as db:
+        counts = run_lifecycle(db, args.batch_size)
+    for name, count in counts.items():
+        print(f"{name}: {count}", file=sys.stderr)
+
+
+def cmd_init_db(args):
+    init_db()
+    with SessionLocal() as db:
+        numbered = backfill_change_seq(db)
+    for table, count in numbered.items():
+        print(f"{table}: {count} rows numbered for the change feed", file=sys.stderr)
+    print("schema up to date", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cli.py", description="HMS operational commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import-guests", help="stream a CSV/NDJSON guest file into the database")
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=["csv", "ndjson"])
+    importer.add_argument("--batch-size", type=int, default=1000)
+    importer.set_defaults(func=cmd_import_guests)
+
+    rebuild = commands.add_parser("rebuild-room-nights", help="recompute the room-night fact table behind /reports")
+    rebuild.set_defaults(func=cmd_rebuild_room_nights)
+
+    checker = commands.add_parser("check-inventory", help="reconcile room_inventory counters against reservations")
+    checker.add_argument("--fix", action="store_true", help="overwrite drifted counters with the expected values")
+    checker.set_defaults(func=cmd_check_inventory)
+
+    archiver = commands.add_parser("archive", help="move soft-deleted rows and old checked-out stays to archive tables")
+    archiver.add_argument("--months", type=int, default=settings.archive_after_months)
+    archiver.add_argument("--batch-size", type=int, default=settings.archive_batch_size)
+    archiver.set_defaults(func=cmd_archive)
+
+    lifecycle = commands.add_parser("lifecycle", help="cancel stale holds, flag overdue check-outs, reconcile room status")
+    lifecycle.add_argument("--batch-size", type=int, default=settings.lifecycle_batch_size)
+    lifecycle.set_defaults(func=cmd_lifecycle)
+
+    initializer = commands.add_parser("init-db", help="create missing tables, add new columns and indexes, number rows for the change feed")
+    initializer.set_defaults(func=cmd_init_db)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
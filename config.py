@@ -1,3 +1,4 @@
+from typing import Dict, Literal, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -11,6 +12,103 @@ class Settings(BaseSettings):
 
     app_name: str = "Hotel Management System"
     debug: bool = True
+
+    # Serve booking conflict checks from the in-process interval index
+    availability_index_enabled: bool = True
+    # "check": check availability, then insert
+    # "exclusion": the insert is the check, via a GiST exclusion constraint
+    booking_mode: Literal["check", "exclusion"] = "check"
+    # Longest stay accepted: every night is a room_nights row, a
+    # room_inventory counter and a rate calendar slot
+    max_stay_nights: int = 365
+
+    # Connection pools (per engine, per worker process)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    # Seconds before a pooled connection is replaced; -1 keeps them
+    db_pool_recycle: int = -1
+    # Server-side statement_timeout in milliseconds; 0 leaves the server default
+    db_statement_timeout_ms: int = 0
+
+    # Read-only replica for safe GETs (see database.get_db). Replica lag can
+    # outlive a catalogue cache invalidation by up to cache_ttl_seconds.
+    replica_database_url: Optional[str] = None
+    # After a write, the same client reads from the primary for this long
+    read_your_writes_seconds: int = 5
+
+    # Serve rooms/guests/reservations from async def handlers on AsyncSession
+    db_async: bool = False
+    # Defaults to database_url with the asyncpg driver
+    async_database_url: Optional[str] = None
+
+    # Room catalogue cache: "local" (in-process LRU) or "redis" (shared)
+    cache_backend: Literal["local", "redis"] = "local"
+    cache_url: Optional[str] = None
+    cache_ttl_seconds: int = 60
+    cache_max_entries: int = 1024
+    # Concurrent identical catalogue cache misses (room lists, availability
+    # searches) share one query and one serialized response. A micro-TTL
+    # above 0 also hands that response to requests arriving within it.
+    # A sync request waiting longer than coalesce_wait_ms for another's query
+    # runs its own instead, so slow queries cannot tie up the threadpool.
+    coalesce_enabled: bool = True
+    coalesce_ttl_ms: int = 0
+    coalesce_wait_ms: int = 1000
+
+    # Move soft-deleted rows and old checked-out stays to *_archive tables.
+    # archive_interval_seconds = 0 leaves it to `python cli.py archive`.
+    archive_after_months: int = 12
+    archive_batch_size: int = 1000
+    archive_interval_seconds: int = 0
+
+    # Reservation lifecycle job (services/lifecycle.py): cancels PENDING holds
+    # older than pending_hold_hours or past check-in by no_show_grace_hours,
+    # flags stays past check-out by checkout_grace_minutes, and reconciles
+    # every room's status flag. 0 leaves it to `python cli.py lifecycle`.
+    lifecycle_interval_seconds: int = 600
+    # Room status flags are derived from reservations by a set-based job,
+    # not by booking writes; they trail a write by at most this long
+    room_status_interval_seconds: int = 30
+    lifecycle_batch_size: int = 500
+    pending_hold_hours: int = 48
+    no_show_grace_hours: int = 24
+    checkout_grace_minutes: int = 120
+
+    # Live event stream (GET /events/stream). "postgres" numbers events from
+    # hms_event_seq and fans them out to every worker with LISTEN/NOTIFY;
+    # "local" keeps them inside one process.
+    events_backend: Literal["local", "postgres"] = "postgres"
+    # Events kept for clients resuming with Last-Event-ID
+    events_buffer_size: int = 10000
+    events_heartbeat_seconds: int = 15
+    # How long an event arriving ahead of a lower number waits for it
+    events_gap_timeout_seconds: float = 2.0
+
+    # Admission control (admission.py), per worker process. API requests are
+    # grouped: "bookings" (writes under /reservations), other "writes", and
+    # "reads". At most admission_limits[group] run at once and
+    # admission_queue_limits[group] wait, each for up to
+    # admission_queue_timeout_seconds; the rest get a 503 with Retry-After.
+    # admission_max_concurrency caps all groups together, so size it to the
+    # primary pool (db_pool_size + db_max_overflow). Freed slots go to waiting
+    # bookings first, then writes, then reads, and capping reads below the
+    # total keeps slots free for writes.
+    admission_enabled: bool = True
+    admission_max_concurrency: int = 15
+    admission_limits: Dict[str, int] = {"bookings": 15, "writes": 10, "reads": 10}
+    admission_queue_limits: Dict[str, int] = {"bookings": 100, "writes": 30, "reads": 50}
+    admission_queue_timeout_seconds: float = 2.0
+    admission_retry_after_seconds: int = 1
+
+    # Logging: records are queued and written by a background listener thread
+    log_level: str = "INFO"
+    log_format: Literal["json", "text"] = "json"
+    # Empty string disables the rotating file; log_console the stderr stream
+    log_dir: str = "logs"
+    log_console: bool = True
+    # Fraction of non-error requests logged per route template (default 1.0)
+    log_sample_rates: Dict[str, float] = {"/health": 0.01, "/metrics": 0.0}
     
     model_config = {
         "env_file": ".env",
@@ -1,20 +1,134 @@
-from sqlalchemy import create_engine
+import time
+from fastapi import Request, Response
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+# Cookie set on every write; while fresh, that client's reads go to the primary
+LAST_WRITE_COOKIE = "hms_last_write"
+
+# GET endpoints that may be served from the replica
+REPLICA_READ_PREFIXES = ("/rooms", "/guests", "/reports", "/inventory")
+
+
+def engine_options(is_async: bool = False) -> dict:
+    options = {
+        "pool_pre_ping": True,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if settings.db_statement_timeout_ms:
+        timeout = str(settings.db_statement_timeout_ms)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+engine = create_engine(settings.database_url, **engine_options())
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engine = (
+    create_engine(settings.replica_database_url, **engine_options()) if settings.replica_database_url else None
+)
+
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine is not None else None
+)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+
+def async_database_url(url: str = None) -> str:
+    """Async URL from settings, or database_url with its driver swapped for asyncpg"""
+    if url is None and settings.async_database_url:
+        return settings.async_database_url
+    return make_url(url or settings.database_url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+# Only built in async mode, so the sync deployment does not need asyncpg
+async_engine = create_async_engine(async_database_url(), **engine_options(is_async=True)) if settings.db_async else None
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False) if settings.db_async else None
+
+async_replica_engine = (
+    create_async_engine(async_database_url(settings.replica_database_url), **engine_options(is_async=True))
+    if settings.db_async and settings.replica_database_url else None
+)
+
+AsyncReplicaSessionLocal = (
+    async_sessionmaker(async_replica_engine, class_=AsyncSession, autoflush=False)
+    if async_replica_engine is not None else None
+)
+
+
+def wrote_recently(request: Request) -> bool:
+    """Whether this client wrote within read_your_writes_seconds (see mark_write)"""
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        last_write = 0
+    return time.time() - last_write <= settings.read_your_writes_seconds
+
+
+def reads_from_replica(request: Request) -> bool:
+    """Safe reads of replica-tolerant endpoints, unless this client wrote recently"""
+    if request.method not in ("GET", "HEAD") or not request.url.path.startswith(REPLICA_READ_PREFIXES):
+        return False
+    return not wrote_recently(request)
+
+
+def mark_write(request: Request, response: Response):
+    """Pin the client's next reads to the primary until the replica has caught up"""
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        response.set_cookie(
+            LAST_WRITE_COOKIE, str(time.time()), max_age=settings.read_your_writes_seconds, httponly=True
+        )
+
+
+def get_db(request: Request, response: Response):
+    if ReplicaSessionLocal is not None and reads_from_replica(request):
+        db = ReplicaSessionLocal()
+    else:
+        mark_write(request, response)
+        db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+async def get_async_db(request: Request, response: Response):
+    if AsyncReplicaSessionLocal is not None and reads_from_replica(request):
+        session_factory = AsyncReplicaSessionLocal
+    else:
+        mark_write(request, response)
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
 def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    """Create missing tables, then add the columns and indexes introduced
+    since a table was created.
+
+    Added columns are nullable, so ADD COLUMN needs no backfill.
+    """
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        existing = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            present = {column["name"] for column in existing.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in present and column.nullable:
+                    column_type = column.type.compile(dialect=connection.dialect)
+                    connection.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS "{column.name}" {column_type}'
+                    ))
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
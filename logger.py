@@ -1,38 +1,172 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import random
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+from config import settings
+from metrics import route_template
 
-# Create logs directory if missing
-LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
+# Request id and route of the request being served; copied into every record
+# logged while it runs, including from threadpool workers running sync handlers
+request_context: ContextVar[Optional[dict]] = ContextVar("hms_request_context", default=None)
 
-log_file = os.path.join(LOG_DIR, "hms.log")
+# LogRecord attributes that are not caller-supplied ``extra`` fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the current request's id and route"""
+
+    def filter(self, record):
+        context = request_context.get()
+        if context is not None:
+            for key, value in context.items():
+                if not hasattr(record, key):
+                    setattr(record, key, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extra fields"""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_") and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
 
-# Configure root logger
-logger = logging.getLogger("hms")
-logger.setLevel(logging.INFO)
 
-# File handler (rotating)
-file_handler = RotatingFileHandler(
-    log_file,
-    maxBytes=5 * 1024 * 1024,  # 5 MB
-    backupCount=5              # Keep last 5 logs
-)
-file_handler.setLevel(logging.INFO)
+class _PreparedQueueHandler(QueueHandler):
+    """QueueHandler that keeps extra fields on the record.
 
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
+    The stock prepare() flattens the record to a preformatted message, which
+    would drop request_id/route/latency before the JSON formatter sees them.
+    """
 
-# Log format
-formatter = logging.Formatter(
-    "%(asctime)s - %(levelname)s - %(name)s - %(message)s", datefmt="%H:%M:%S"
-)
+    def prepare(self, record):
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _make_formatter() -> logging.Formatter:
+    if settings.log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s", datefmt="%H:%M:%S")
+
+
+def _make_handlers():
+    formatter = _make_formatter()
+    handlers = []
+    if settings.log_dir:
+        os.makedirs(settings.log_dir, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            os.path.join(settings.log_dir, "hms.log"),
+            maxBytes=5 * 1024 * 1024,  # 5 MB
+            backupCount=5              # Keep last 5 logs
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    if settings.log_console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+    return handlers
+
+
+logger = logging.getLogger("hms")
+logger.setLevel(settings.log_level.upper())
+logger.propagate = False
 
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
+# Request threads only enqueue; a single listener thread does the file and
+# console I/O. The queue is unbounded, so a stalled disk grows memory rather
+# than blocking requests.
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+listener = QueueListener(log_queue, *_make_handlers(), respect_handler_level=True)
 
 # Add handlers only once
 if not logger.handlers:
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    queue_handler = _PreparedQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    logger.addHandler(queue_handler)
+    listener.start()
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread (idempotent)"""
+    if listener._thread is not None:
+        listener.stop()
+
+
+# Drain what is queued before the interpreter exits
+atexit.register(stop_logging)
+
+
+def sample_rate(route: str) -> float:
+    """Fraction of successful requests to ``route`` that get an access log line"""
+    return settings.log_sample_rates.get(route, 1.0)
+
+
+class RequestLogMiddleware:
+    """ASGI middleware assigning request ids and writing sampled access logs.
+
+    Requests get the caller's X-Request-ID or a fresh one, echoed on the
+    response. Error responses (>= 500) are always logged; others are sampled
+    per route template by ``log_sample_rates``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        route = route_template(scope)
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode())]
+            await send(message)
+
+        token = request_context.set({"request_id": request_id, "route": route})
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            latency_ms = round((time.perf_counter() - started) * 1000, 2)
+            if status_code >= 500 or random.random() < sample_rate(route):
+                level = logging.ERROR if status_code >= 500 else logging.INFO
+                logger.log(level, "request", extra={
+                    "method": scope["method"], "status": status_code, "latency_ms": latency_ms,
+                })
+            request_context.reset(token)
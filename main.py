@@ -1,15 +1,41 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import APIRouter, FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse, ORJSONResponse
+from admission import AdmissionMiddleware
 from config import settings
-from routes import rooms, guests, reservations
+from database import SessionLocal, async_engine, async_replica_engine, engine, replica_engine
+from metrics import MetricsMiddleware, instrument_engine, render_metrics
+from routes import rooms, guests, reservations, reports, inventory, rates, quotes, events
 from fastapi.openapi.utils import get_openapi
-from logger import logger
+from services.availability import RoomUnavailableError, install_exclusion_constraint
+from services.availability_index import availability_index
+import services.soft_delete  # noqa: F401  (registers the global soft-delete filter)
+from services.archive import run_archive_job
+from services.events import start_event_stream, stop_event_stream
+from services.lifecycle import run_lifecycle_job, run_room_status_job
+from scheduler import scheduler
+from logger import RequestLogMiddleware, logger
 
 app = FastAPI(
     title=settings.app_name,
     description="A comprehensive hotel management system API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Innermost, so shed requests still show up in metrics and access logs
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(MetricsMiddleware)
+# Outermost, so the request id is set for everything below it
+app.add_middleware(RequestLogMiddleware)
+instrument_engine(engine, "primary")
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine, "primary_async")
+if replica_engine is not None:
+    instrument_engine(replica_engine, "replica")
+if async_replica_engine is not None:
+    instrument_engine(async_replica_engine.sync_engine, "replica_async")
+
 
 def custom_openapi():
     if app.openapi_schema:
@@ -45,11 +71,83 @@ app.openapi = custom_openapi
 
 
 
+def use_async_routes(sync_router: APIRouter, async_router: APIRouter):
+    """Swap sync endpoints for their async ports in place, keeping route order.
+
+    Endpoints without an async port stay on the threadpool.
+    """
+    ports = {(route.path, frozenset(route.methods)): route for route in async_router.routes}
+    sync_router.routes[:] = [
+        ports.get((route.path, frozenset(route.methods)), route) for route in sync_router.routes
+    ]
+
+
+if settings.db_async:
+    from routes import async_rooms, async_guests, async_reservations
+    use_async_routes(rooms.router, async_rooms.router)
+    use_async_routes(guests.router, async_guests.router)
+    use_async_routes(reservations.router, async_reservations.router)
+
 app.include_router(rooms.router)
 app.include_router(guests.router)
 app.include_router(reservations.router)
+app.include_router(reports.router)
+app.include_router(inventory.router)
+app.include_router(rates.router)
+app.include_router(quotes.router)
+app.include_router(events.router)
+
+
+@app.on_event("startup")
+def install_booking_constraint():
+    if settings.booking_mode == "exclusion":
+        install_exclusion_constraint(engine)
+        logger.info("Booking mode: exclusion constraint")
+
+
+@app.on_event("startup")
+def warm_availability_index():
+    if not settings.availability_index_enabled:
+        return
+    with SessionLocal() as db:
+        availability_index.warm(db)
+    logger.info("Availability index warmed")
+
+
+@app.on_event("startup")
+def start_scheduler():
+    if settings.archive_interval_seconds:
+        scheduler.every(settings.archive_interval_seconds, "archive", run_archive_job)
+    if settings.lifecycle_interval_seconds:
+        scheduler.every(settings.lifecycle_interval_seconds, "lifecycle", run_lifecycle_job)
+    if settings.room_status_interval_seconds:
+        scheduler.every(settings.room_status_interval_seconds, "room-status", run_room_status_job)
+    scheduler.start()
 
 
+@app.on_event("shutdown")
+def stop_scheduler():
+    scheduler.stop()
+
+
+@app.on_event("startup")
+async def start_events():
+    start_event_stream(asyncio.get_running_loop())
+
+
+@app.on_event("shutdown")
+def stop_events():
+    stop_event_stream()
+
+
+@app.exception_handler(RoomUnavailableError)
+def room_unavailable_handler(request: Request, exc: RoomUnavailableError):
+    # Raised at commit when a booking lost a race the pre-check could not see
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": "Room is not available for the selected dates"}
+    )
+
 
 @app.get("/")
 def read_root():
@@ -61,9 +159,15 @@ def read_root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/health")
 def health_check():
-    logger.info("Health Check endpoint called")
+    # Logged by RequestLogMiddleware, sampled by log_sample_rates["/health"]
     return {"status": "healthy"}
 
 
@@ -0,0 +1,158 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from starlette.routing import Match
+
+REQUEST_LATENCY = Histogram(
+    "hms_http_request_duration_seconds", "Request latency by route", ["method", "route"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "hms_http_requests_in_flight", "Requests currently being served", ["method", "route"]
+)
+RESPONSES = Counter(
+    "hms_http_responses_total", "Responses by status code", ["method", "route", "status"]
+)
+REQUEST_STATEMENTS = Histogram(
+    "hms_db_statements_per_request", "SQL statements issued per request", ["method", "route"],
+    buckets=(0, 1, 2, 3, 4, 6, 8, 12, 16, 25, 50, 100),
+)
+REQUEST_DB_TIME = Histogram(
+    "hms_db_time_per_request_seconds", "Time spent executing SQL per request", ["method", "route"]
+)
+POOL_WAIT = Histogram(
+    "hms_db_pool_checkout_wait_seconds", "Time waiting to check a connection out of the pool", ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CHECKED_OUT = Gauge(
+    "hms_db_pool_checked_out", "Connections currently checked out", ["engine"]
+)
+POOL_SATURATION = Gauge(
+    "hms_db_pool_saturation", "Checked-out connections / (pool_size + max_overflow)", ["engine"]
+)
+COALESCED = Counter(
+    "hms_coalesced_requests_total",
+    "Catalogue cache misses by whether they ran the query (leader) or shared another's (follower)",
+    ["route", "role"],
+)
+ADMISSION_LIMIT = Gauge(
+    "hms_admission_limit", "Configured admission limits per route group", ["group", "kind"]
+)
+ADMISSION_ACTIVE = Gauge(
+    "hms_admission_active", "Admitted requests currently running", ["group"]
+)
+ADMISSION_WAITING = Gauge(
+    "hms_admission_waiting", "Requests waiting for admission", ["group"]
+)
+ADMISSION_WAIT = Histogram(
+    "hms_admission_wait_seconds", "Time admitted requests waited for a slot", ["group"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+ADMISSION_REJECTED = Counter(
+    "hms_admission_rejected_total", "Requests shed with a 503", ["group", "reason"]
+)
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_time")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+
+
+# Shared by reference with the threadpool worker that runs a sync endpoint
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("hms_request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def instrument_engine(engine, name: str):
+    """Count statements and DB time per request, and time pool checkouts.
+
+    ``engine`` is a sync Engine; pass ``async_engine.sync_engine`` for asyncio.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("hms_statement_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["hms_statement_start"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += elapsed
+
+    pool = engine.pool
+    # The pool has no "checkout requested" event, so wrap the blocking get
+    blocking_get = pool._do_get
+
+    def timed_get():
+        started = time.perf_counter()
+        try:
+            return blocking_get()
+        finally:
+            POOL_WAIT.labels(name).observe(time.perf_counter() - started)
+
+    pool._do_get = timed_get
+
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    POOL_CHECKED_OUT.labels(name).set_function(pool.checkedout)
+    POOL_SATURATION.labels(name).set_function(lambda: pool.checkedout() / capacity if capacity else 0.0)
+
+
+def route_template(scope) -> str:
+    """Route path template (e.g. /rooms/{room_id}) to keep label cardinality bounded"""
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight, status and per-request DB load"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        in_flight = REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            in_flight.dec()
+            RESPONSES.labels(method, route, str(status_code)).inc()
+            REQUEST_STATEMENTS.labels(method, route).observe(stats.statements)
+            REQUEST_DB_TIME.labels(method, route).observe(stats.db_time)
+            _request_stats.reset(token)
+
+
+def render_metrics():
+    """Prometheus text exposition body and content type"""
+    return generate_latest(), CONTENT_TYPE_LATEST
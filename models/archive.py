@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Table
+from database import Base
+from models.guests import Guest
+from models.reservations import Reservation
+from models.rooms import Room
+
+
+def _archive_table(model) -> Table:
+    """Same columns as the live table, without its foreign keys and indexes:
+    archived rows may outlive the rows they reference."""
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+        for column in model.__table__.columns
+    ]
+    return Table(
+        f"{model.__tablename__}_archive", Base.metadata,
+        *columns,
+        Column("archived_at", DateTime, nullable=False),
+    )
+
+
+guests_archive = _archive_table(Guest)
+rooms_archive = _archive_table(Room)
+reservations_archive = _archive_table(Reservation)
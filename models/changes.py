@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, Text, cast, func
+
+
+def current_xact_id():
+    """The writing transaction's id. pg_current_xact_id() is an xid8, 64 bits
+    with the epoch folded in so it never wraps; text is its only cast to bigint"""
+    return cast(cast(func.pg_current_xact_id(), Text), BigInteger)
+
+
+def snapshot_xmin():
+    """Oldest transaction still running: every id below it has committed or rolled back"""
+    return cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+
+def change_seq_column() -> Column:
+    """Set to the writing transaction's id by every INSERT and UPDATE of the
+    row, flushed or issued as a statement. Ids are handed out in start order,
+    not commit order: the change feeds only serve ids below ``snapshot_xmin``"""
+    return Column(
+        BigInteger,
+        default=current_xact_id(),
+        onupdate=current_xact_id(),
+        index=True,
+    )
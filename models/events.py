@@ -0,0 +1,5 @@
+from sqlalchemy import Sequence
+from database import Base
+
+# Global order of the live event stream (services/events.py), shared by all workers
+event_sequence = Sequence("hms_event_seq", metadata=Base.metadata)
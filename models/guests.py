@@ -1,6 +1,8 @@
+from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.orm import relationship
 from database import Base
+from models.changes import change_seq_column
 
 
 class Guest(Base):
@@ -13,7 +15,9 @@ class Guest(Base):
     phone = Column(String, nullable=False)
     address = Column(String, nullable=True)
     id_number = Column(String, unique=True, nullable=False)
-    created_at = Column(DateTime, default=None)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, index=True)
+    change_seq = change_seq_column()
     deleted_at = Column(DateTime, default=None)
     
     # Relationship
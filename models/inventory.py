@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Date, Enum
+from database import Base
+from models.rooms import RoomType
+
+
+class RoomInventory(Base):
+    """Rooms of a type and how many of them are held, per night.
+
+    ``sold`` counts reservations that block the room (the same statuses
+    check_room_availability treats as active); ``total`` counts the type's
+    non-deleted rooms. Maintained by services/inventory.py.
+    """
+    __tablename__ = "room_inventory"
+
+    room_type = Column(Enum(RoomType), primary_key=True)
+    night = Column(Date, primary_key=True)
+    total = Column(Integer, nullable=False)
+    sold = Column(Integer, nullable=False, default=0)
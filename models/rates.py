@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Float, Date, Enum
+from database import Base
+from models.rooms import RoomType
+import enum
+
+
+class RateRuleKind(enum.Enum):
+    WEEKDAY = "weekday"
+    LENGTH_OF_STAY = "length_of_stay"
+
+class RateRule(Base):
+    """A multiplier on the room's base price.
+
+    WEEKDAY rules apply to each night whose weekday is listed in ``weekdays``
+    (comma-separated, Monday=0). LENGTH_OF_STAY rules apply to the whole
+    stay when it has at least ``min_nights``; the one with the highest
+    ``min_nights`` wins. ``room_type`` None applies to every type, and
+    ``valid_from``/``valid_to`` (exclusive) bound the nights (WEEKDAY) or
+    check-in dates (LENGTH_OF_STAY) the rule covers.
+    """
+    __tablename__ = "rate_rules"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(Enum(RateRuleKind), nullable=False)
+    room_type = Column(Enum(RoomType), nullable=True)
+    multiplier = Column(Float, nullable=False)
+    weekdays = Column(String, nullable=True)
+    min_nights = Column(Integer, nullable=True)
+    valid_from = Column(Date, nullable=True)
+    valid_to = Column(Date, nullable=True)
+
+class RateOverride(Base):
+    """Calendar override: multiplies a room type's nightly price on one night"""
+    __tablename__ = "rate_overrides"
+    
+    room_type = Column(Enum(RoomType), primary_key=True)
+    night = Column(Date, primary_key=True)
+    multiplier = Column(Float, nullable=False)
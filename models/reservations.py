@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Enum
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from database import Base
+from models.changes import change_seq_column
 import enum
 
 class ReservationStatus(enum.Enum):
@@ -12,6 +14,15 @@ class ReservationStatus(enum.Enum):
 
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        # Serves per-room overlap lookups: seeks past history on check_out_date.
+        # Partial indexes skip soft-deleted rows, which reads never look up.
+        Index(
+            "ix_reservations_live_room_stay", "room_id", "check_out_date", "check_in_date", "status",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_reservations_live_guest", "guest_id", postgresql_where=text("deleted_at IS NULL")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     guest_id = Column(Integer, ForeignKey("guests.id"), nullable=False)
@@ -22,9 +33,12 @@ class Reservation(Base):
     total_price = Column(Float, nullable=False)
     number_of_guests = Column(Integer, default=1)
     special_requests = Column(String, nullable=True)
-    updated_at = Column(DateTime, default=None)
-    created_at = Column(DateTime, default=None)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, index=True)
+    created_at = Column(DateTime, default=datetime.now)
+    change_seq = change_seq_column()
     deleted_at = Column(DateTime, default=None)
+    # Set by the lifecycle job when a checked-in stay runs past check-out
+    overdue_at = Column(DateTime, default=None)
     
     # Relationships
     guest = relationship("Guest", back_populates="reservations")
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, Float, Date, Enum, Index
+from database import Base
+from models.rooms import RoomType
+
+
+class RoomNight(Base):
+    """One row per sold room per night: the fact table behind /reports.
+
+    Maintained incrementally from reservation writes (services/room_nights.py)
+    and rebuildable with ``python cli.py rebuild-room-nights``. room_type and
+    floor are copied from the room so reports never join ``rooms``.
+    """
+    __tablename__ = "room_nights"
+    __table_args__ = (
+        Index("ix_room_nights_night_room_type", "night", "room_type"),
+        Index("ix_room_nights_night_floor", "night", "floor"),
+        Index("ix_room_nights_room_id", "room_id"),
+    )
+
+    # Primary key (reservation_id, night) also serves the per-reservation resync
+    reservation_id = Column(Integer, primary_key=True)
+    night = Column(Date, primary_key=True)
+    room_id = Column(Integer, nullable=False)
+    room_type = Column(Enum(RoomType), nullable=False)
+    floor = Column(Integer)
+    revenue = Column(Float, nullable=False)
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, Enum , DateTime
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, Enum , DateTime, Index, text
 from sqlalchemy.orm import relationship
 from database import Base
+from models.changes import change_seq_column
 import enum
 
 
@@ -18,6 +20,13 @@ class RoomType(enum.Enum):
 
 class Room(Base):
     __tablename__ = "rooms"
+    __table_args__ = (
+        # Partial: searches only ever look at rooms that are not soft-deleted
+        Index(
+            "ix_rooms_live_type_capacity_price", "room_type", "capacity", "price",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     room_number = Column(String, unique=True, index=True, nullable=False)
@@ -27,7 +36,9 @@ class Room(Base):
     floor = Column(Integer)
     capacity = Column(Integer, default=1)
     description = Column(String, nullable=True)
-    created_at = Column(DateTime, default=None)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, index=True)
+    change_seq = change_seq_column()
     deleted_at = Column(DateTime, default=None)
     
     # Relationship
@@ -0,0 +1,134 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db
+from models.guests import Guest
+from models.reservations import Reservation
+from schemas.guests import GuestCreate, GuestUpdate, GuestResponse
+from routes.guests import GUEST_COLUMNS
+from services.constraints import write_returning
+from services.fast_lists import list_response
+from services.pagination import keyset, set_next_cursor
+from auth import CurrentUser
+from datetime import datetime
+from logger import logger
+
+# async def ports of routes/guests.py, swapped in by main.py when settings.db_async
+router = APIRouter(
+    prefix="/guests",
+    tags=["guests"],
+)
+
+@router.post("/", response_model=GuestResponse, status_code=status.HTTP_201_CREATED)
+async def create_guest(
+    guest: GuestCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+
+    # The unique constraints on email and id_number are the duplicate check
+    row = await db.run_sync(write_returning, insert(Guest).values(**guest.model_dump()).returning(Guest))
+    db_guest = GuestResponse.model_validate(row[0])
+    await db.commit()
+    logger.info(f"guest created with name {db_guest.first_name}")
+    return db_guest
+
+@router.get("/", response_model=List[GuestResponse])
+async def get_guests(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_deleted: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Get all guests, paged by cursor (see X-Next-Cursor) or skip/limit"""
+    query = select(*GUEST_COLUMNS).execution_options(include_deleted=include_deleted)
+    rows = (await db.execute(keyset(query, Guest.id, cursor, skip).limit(limit))).all()
+    set_next_cursor(response, rows, limit)
+    return list_response([row._asdict() for row in rows], response)
+
+@router.get("/{guest_id}", response_model=GuestResponse)
+async def get_guest(
+    guest_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Get a specific guest by ID"""
+    guest = await db.scalar(select(Guest).where(Guest.id == guest_id))
+    if not guest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Guest not found"
+        )
+    return guest
+
+@router.get("/search/email/{email}", response_model=GuestResponse)
+async def get_guest_by_email(
+    email: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Search for a guest by email"""
+    guest = await db.scalar(select(Guest).where(Guest.email == email))
+    if not guest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Guest not found"
+        )
+    return guest
+
+@router.put("/{guest_id}", response_model=GuestResponse)
+async def update_guest(
+    guest_id: int,
+    guest_update: GuestUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Update a guest"""
+    update_data = guest_update.model_dump(exclude_unset=True)
+    if update_data:
+        stmt = update(Guest).where(Guest.id == guest_id).values(**update_data).returning(Guest)
+    else:
+        stmt = select(Guest).where(Guest.id == guest_id)
+    row = await db.run_sync(write_returning, stmt)
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Guest not found"
+        )
+
+    # Serialize before commit expires the returned row
+    db_guest = GuestResponse.model_validate(row[0])
+    await db.commit()
+    return db_guest
+
+@router.delete("/{guest_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_guest(
+    guest_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Delete a guest"""
+    # Fetch the guest and whether it has reservations in one query
+    row = (await db.execute(
+        select(Guest, exists().where(Reservation.guest_id == Guest.id)).where(Guest.id == guest_id)
+    )).first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Guest not found"
+        )
+    db_guest, has_reservations = row
+
+    # Check if guest has reservations
+    if has_reservations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete guest with existing reservations"
+        )
+    db_guest.deleted_at = datetime.now()
+    await db.commit()
+    return None
@@ -0,0 +1,263 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from datetime import datetime
+from config import settings
+from database import get_async_db
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room
+from models.guests import Guest
+from routes.reservations import RESERVATION_COLUMNS, check_room_availability
+from schemas.reservations import (
+    ReservationCreate, ReservationUpdate, ReservationResponse, ReservationExpandedResponse,
+)
+from services.availability import check_stay_length, commit_booking
+from services.expansion import expand_options, expanded, expanded_rows, parse_expand
+from services.fast_lists import list_response
+from services.pagination import keyset, set_next_cursor
+from services.events import emit_event, reservation_event
+from services.pricing import quote_price
+from auth import CurrentUser
+
+# async def ports of routes/reservations.py, swapped in by main.py when settings.db_async.
+# Sync helpers that need the database (availability check, pricing, booking commit) run
+# through AsyncSession.run_sync, so both paths share one implementation.
+router = APIRouter(
+    prefix="/reservations",
+    tags=["reservations"],
+)
+
+async def get_reservation_with_room(db: AsyncSession, reservation_id: int):
+    """Load a reservation and its room in one query (lazy loads are not allowed under asyncio)"""
+    reservation = await db.scalar(
+        select(Reservation).options(joinedload(Reservation.room)).where(Reservation.id == reservation_id)
+    )
+    if not reservation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+    return reservation
+
+@router.post("/", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
+async def create_reservation(
+    reservation: ReservationCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Create a new reservation"""
+    # Verify guest exists
+    guest = await db.scalar(select(Guest).where(Guest.id == reservation.guest_id))
+    if not guest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Guest not found"
+        )
+
+    # Verify room exists
+    room = await db.scalar(select(Room).where(Room.id == reservation.room_id))
+    if not room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found"
+        )
+
+    # Check room availability (in exclusion mode the insert itself is the check)
+    exclusion_mode = settings.booking_mode == "exclusion"
+    if not exclusion_mode and not await db.run_sync(
+        check_room_availability, reservation.room_id, reservation.check_in_date, reservation.check_out_date
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Room is not available for the selected dates"
+        )
+
+    # Check if number of guests exceeds room capacity
+    if reservation.number_of_guests > room.capacity:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Number of guests exceeds room capacity ({room.capacity})"
+        )
+
+    # Calculate total price from the room already loaded
+    total_price = await db.run_sync(quote_price, room, reservation.check_in_date, reservation.check_out_date)
+
+    # Create reservation
+    db_reservation = Reservation(
+        **reservation.model_dump(),
+        total_price=total_price
+    )
+    db.add(db_reservation)
+
+    await db.run_sync(commit_booking, reservation.room_id)
+    await db.refresh(db_reservation)
+    return db_reservation
+
+@router.get("/", response_model=List[ReservationExpandedResponse], response_model_exclude_unset=True)
+async def get_reservations(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: ReservationStatus = None,
+    expand: Optional[str] = None,
+    include_deleted: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Get all reservations with optional status filter, paged by cursor or skip/limit"""
+    fields = parse_expand(expand)
+    query = select(*RESERVATION_COLUMNS).execution_options(include_deleted=include_deleted)
+    if status:
+        query = query.where(Reservation.status == status)
+    rows = (await db.execute(keyset(query, Reservation.id, cursor, skip).limit(limit))).all()
+    set_next_cursor(response, rows, limit)
+    return list_response(await db.run_sync(expanded_rows, rows, fields), response)
+
+@router.get("/{reservation_id}", response_model=ReservationExpandedResponse, response_model_exclude_unset=True)
+async def get_reservation(
+    reservation_id: int,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Get a specific reservation by ID"""
+    fields = parse_expand(expand)
+    reservation = await db.scalar(
+        select(Reservation).options(*expand_options(fields)).where(Reservation.id == reservation_id)
+    )
+    if not reservation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+    return expanded(reservation, fields)
+
+@router.get("/guest/{guest_id}", response_model=List[ReservationExpandedResponse], response_model_exclude_unset=True)
+async def get_guest_reservations(
+    guest_id: int,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Get all reservations for a specific guest"""
+    fields = parse_expand(expand)
+    rows = (await db.execute(select(*RESERVATION_COLUMNS).where(Reservation.guest_id == guest_id))).all()
+    return list_response(await db.run_sync(expanded_rows, rows, fields))
+
+@router.get("/room/{room_id}", response_model=List[ReservationExpandedResponse], response_model_exclude_unset=True)
+async def get_room_reservations(
+    room_id: int,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Get all reservations for a specific room"""
+    fields = parse_expand(expand)
+    rows = (await db.execute(select(*RESERVATION_COLUMNS).where(Reservation.room_id == room_id))).all()
+    return list_response(await db.run_sync(expanded_rows, rows, fields))
+
+@router.put("/{reservation_id}", response_model=ReservationResponse)
+async def update_reservation(
+    reservation_id: int,
+    reservation_update: ReservationUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Update a reservation"""
+    db_reservation = await get_reservation_with_room(db, reservation_id)
+    room = db_reservation.room
+
+    # If dates are being updated, check availability
+    check_in = reservation_update.check_in_date or db_reservation.check_in_date
+    check_out = reservation_update.check_out_date or db_reservation.check_out_date
+
+    if reservation_update.check_in_date or reservation_update.check_out_date:
+        try:
+            check_stay_length(check_in, check_out)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+        exclusion_mode = settings.booking_mode == "exclusion"
+        if not exclusion_mode and not await db.run_sync(
+            check_room_availability, db_reservation.room_id, check_in, check_out, reservation_id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Room is not available for the selected dates"
+            )
+
+        # Recalculate total price if dates changed
+        db_reservation.total_price = await db.run_sync(quote_price, room, check_in, check_out)
+
+    # Update fields
+    update_data = reservation_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_reservation, field, value)
+    emit_event(db, "reservation", reservation_event(db_reservation, "updated"))
+
+    await db.run_sync(commit_booking, db_reservation.room_id)
+    await db.refresh(db_reservation)
+    return db_reservation
+
+@router.delete("/{reservation_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_reservation(
+    reservation_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Delete a reservation"""
+    db_reservation = await get_reservation_with_room(db, reservation_id)
+
+    # The room's status flag follows with the room status job (services/lifecycle.py)
+    db_reservation.deleted_at = datetime.now()
+    await db.commit()
+    return None
+
+@router.post("/{reservation_id}/check-in", response_model=ReservationResponse)
+async def check_in(
+    reservation_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Check in a guest"""
+    reservation = await get_reservation_with_room(db, reservation_id)
+
+    if reservation.status != ReservationStatus.CONFIRMED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only confirmed reservations can be checked in"
+        )
+
+    reservation.status = ReservationStatus.CHECKED_IN
+    emit_event(db, "reservation", reservation_event(reservation, "checked_in"))
+
+    await db.commit()
+    await db.refresh(reservation)
+    return reservation
+
+@router.post("/{reservation_id}/check-out", response_model=ReservationResponse)
+async def check_out(
+    reservation_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Check out a guest"""
+    reservation = await get_reservation_with_room(db, reservation_id)
+
+    if reservation.status != ReservationStatus.CHECKED_IN:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only checked-in reservations can be checked out"
+        )
+
+    reservation.status = ReservationStatus.CHECKED_OUT
+    emit_event(db, "reservation", reservation_event(reservation, "checked_out"))
+
+    await db.commit()
+    await db.refresh(reservation)
+    return reservation
@@ -0,0 +1,169 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db
+from models.rooms import Room, RoomStatus, RoomType
+from routes.rooms import ROOM_COLUMNS, restamp_room
+from schemas.rooms import RoomCreate, RoomUpdate, RoomResponse
+from services.availability import available_rooms_statement, check_search_dates
+from services import catalogue_cache
+from services.constraints import write_returning
+from services.events import emit_event, room_event
+from services.inventory import apply_room_change
+from services.pagination import keyset, set_next_cursor
+from auth import CurrentUser
+from datetime import datetime
+
+# async def ports of routes/rooms.py, swapped in by main.py when settings.db_async
+router = APIRouter(
+    prefix="/rooms",
+    tags=["rooms"],
+)
+
+room_adapter = TypeAdapter(RoomResponse)
+room_list_adapter = TypeAdapter(List[RoomResponse])
+
+@router.post("/", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
+async def create_room(
+    room: RoomCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Create a new room"""
+    # The unique constraint on room_number is the duplicate check
+    row = await db.run_sync(write_returning, insert(Room).values(**room.model_dump()).returning(Room))
+    db_room = row[0]
+    await db.run_sync(apply_room_change, db_room.id, None, (db_room.room_type, True))
+    db_room = RoomResponse.model_validate(db_room)
+    await db.commit()
+    return db_room
+
+@router.get("/", response_model=List[RoomResponse])
+async def get_rooms(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: RoomStatus = None,
+    include_deleted: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all rooms with optional filtering, paged by cursor or skip/limit"""
+    cached, key = catalogue_cache.lookup(request, catalogue_cache.ROOMS)
+    if cached is not None:
+        return cached
+    query = select(*ROOM_COLUMNS).execution_options(include_deleted=include_deleted)
+    if status:
+        query = query.where(Room.status == status)
+
+    async def load():
+        rooms = (await db.execute(keyset(query, Room.id, cursor, skip).limit(limit))).all()
+        set_next_cursor(response, rooms, limit)
+        return rooms
+
+    return await catalogue_cache.load_and_store_async(request, response, key, room_list_adapter, load)
+
+@router.get("/{room_id}", response_model=RoomResponse)
+async def get_room(
+    room_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a specific room by ID"""
+    cached, key = catalogue_cache.lookup(request, catalogue_cache.ROOMS)
+    if cached is not None:
+        return cached
+    room = await db.scalar(select(Room).where(Room.id == room_id))
+    if not room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found"
+        )
+    return catalogue_cache.store(request, response, key, room_adapter, room)
+
+@router.put("/{room_id}", response_model=RoomResponse)
+async def update_room(
+    room_id: int,
+    room_update: RoomUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Update a room"""
+    update_data = room_update.model_dump(exclude_unset=True)
+    if not update_data:
+        db_room = await db.get(Room, room_id)
+        if not db_room:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Room not found"
+            )
+        return db_room
+
+    # Self-join so RETURNING also carries the pre-update type and floor
+    old = Room.__table__.alias("old")
+    row = await db.run_sync(
+        write_returning,
+        update(Room).where(Room.id == room_id, old.c.id == Room.id).values(**update_data)
+        .returning(Room, old.c.room_type, old.c.floor, old.c.deleted_at)
+    )
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found"
+        )
+    db_room, old_type, old_floor, old_deleted_at = row
+    await db.run_sync(restamp_room, db_room, old_type, old_floor, old_deleted_at)
+
+    # Serialize before commit expires the returned row
+    db_room = RoomResponse.model_validate(db_room)
+    emit_event(db, "room", room_event(db_room))
+    await db.commit()
+    return db_room
+
+@router.delete("/{room_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_room(
+    room_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = CurrentUser
+):
+    """Delete a room"""
+    db_room = await db.scalar(select(Room).where(Room.id == room_id))
+    if not db_room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found"
+        )
+
+    db_room.deleted_at = datetime.now()
+    await db.commit()
+    return None
+
+@router.get("/available/search", response_model=List[RoomResponse])
+async def search_available_rooms(
+    request: Request,
+    response: Response,
+    check_in_date: Optional[datetime] = None,
+    check_out_date: Optional[datetime] = None,
+    room_type: Optional[RoomType] = None,
+    min_capacity: Optional[int] = Query(None, ge=1),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search rooms free for a stay, filtered by type, capacity and price"""
+    check_search_dates(check_in_date, check_out_date)
+    cached, key = catalogue_cache.lookup(request, catalogue_cache.AVAILABILITY)
+    if cached is not None:
+        return cached
+    stmt = available_rooms_statement(
+        check_in_date, check_out_date, room_type, min_capacity, min_price, max_price
+    )
+
+    async def load():
+        return (await db.scalars(stmt)).all()
+
+    return await catalogue_cache.load_and_store_async(request, response, key, room_list_adapter, load)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from services.events import event_broker
+from auth import CurrentUser
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+)
+
+@router.get("/stream")
+async def stream_events(
+    since: Optional[int] = Query(None, ge=0, description="Resume after this sequence number"),
+    last_event_id: Optional[str] = Header(None),
+    current_user = CurrentUser
+):
+    """Server-sent events for room status and reservation lifecycle changes.
+
+    Reconnecting EventSource clients resume from Last-Event-ID; others may
+    pass ?since=. A ``reset`` event means the gap could not be replayed.
+    """
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    return StreamingResponse(
+        event_broker.subscribe(since),
+        media_type="text/event-stream",
+        # Keep proxies from buffering or caching the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,13 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+import json
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import exists, insert, select, update
 from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from typing import List, Literal, Optional
+from database import SessionLocal, get_db
 from models.guests import Guest
+from models.reservations import Reservation
+from schemas.changes import GuestChanges
 from schemas.guests import GuestCreate, GuestUpdate, GuestResponse
+from services.changes import change_feed
+from services.constraints import write_returning
+from services.export import EXPORT_MEDIA_TYPES, stream_export
+from services.fast_lists import list_response, response_columns
+from services.guest_import import import_guests, iter_records
+from services.pagination import keyset, set_next_cursor
 from auth import CurrentUser
 from datetime import datetime
 from logger import logger
 
+# List endpoints select these as rows and serialize them without ORM objects
+GUEST_COLUMNS = response_columns(Guest, GuestResponse)
+
 router = APIRouter(
     prefix="/guests",
     tags=["guests"],
@@ -20,38 +35,83 @@ def create_guest(
     current_user = CurrentUser
 ):
     
-    db_guest = db.query(Guest).filter(Guest.email == guest.email).first()
-    if db_guest:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    # Check if ID number already exists
-    db_guest = db.query(Guest).filter(Guest.id_number == guest.id_number).first()
-    if db_guest:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="ID number already registered"
-        )
-    
-    db_guest = Guest(**guest.model_dump())
-    db.add(db_guest)
+    # The unique constraints on email and id_number are the duplicate check
+    row = write_returning(db, insert(Guest).values(**guest.model_dump()).returning(Guest))
+    db_guest = GuestResponse.model_validate(row[0])
     db.commit()
-    db.refresh(db_guest)
     logger.info(f"guest created with name {db_guest.first_name}")
     return db_guest
 
+@router.post("/import")
+def import_guests_file(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    batch_size: int = Query(1000, ge=1, le=10000),
+    current_user = CurrentUser
+):
+    """Stream a CSV or NDJSON guest file into the database.
+
+    Responds with NDJSON events: one per rejected row, one progress line per
+    committed batch, and a final summary.
+    """
+    fmt = format or ("ndjson" if (file.filename or "").endswith((".ndjson", ".jsonl")) else "csv")
+    
+    def events():
+        lines = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+        with SessionLocal() as db:
+            for event in import_guests(db, iter_records(lines, fmt), batch_size):
+                yield json.dumps(event) + "\n"
+        logger.info(f"guest import finished: {event}")
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 @router.get("/", response_model=List[GuestResponse])
 def get_guests(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    include_deleted: bool = False,
     db: Session = Depends(get_db),
     current_user = CurrentUser
 ):
-    """Get all guests"""
-    guests = db.query(Guest).offset(skip).limit(limit).all()
-    return guests
+    """Get all guests, paged by cursor (see X-Next-Cursor) or skip/limit"""
+    query = select(*GUEST_COLUMNS).execution_options(include_deleted=include_deleted)
+    rows = db.execute(keyset(query, Guest.id, cursor, skip).limit(limit)).all()
+    set_next_cursor(response, rows, limit)
+    return list_response([row._asdict() for row in rows], response)
+
+@router.get("/changes", response_model=GuestChanges)
+def get_guest_changes(
+    since_seq: int = Query(0, ge=0),
+    since_id: int = Query(0, ge=0),
+    updated_since: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Guests written after the ``since_seq``/``since_id`` cursor, plus tombstones, for downstream sync"""
+    return ORJSONResponse(change_feed(db, Guest, GUEST_COLUMNS, since_seq, since_id, updated_since, limit))
+
+@router.get("/export")
+def export_guests(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    current_user = CurrentUser
+):
+    """Stream every matching guest as NDJSON or CSV in constant memory"""
+    columns = ["id", *(name for name in GuestResponse.model_fields if name != "id")]
+    stmt = select(*[getattr(Guest, column) for column in columns]).order_by(Guest.id)
+    if created_from:
+        stmt = stmt.where(Guest.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(Guest.created_at < created_to)
+    return StreamingResponse(
+        stream_export(stmt, columns, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=guests.{format}"}
+    )
 
 @router.get("/{guest_id}", response_model=GuestResponse)
 def get_guest(
@@ -91,38 +151,21 @@ def update_guest(
     current_user = CurrentUser
 ):
     """Update a guest"""
-    db_guest = db.query(Guest).filter(Guest.id == guest_id).first()
-    if not db_guest:
+    update_data = guest_update.model_dump(exclude_unset=True)
+    if update_data:
+        stmt = update(Guest).where(Guest.id == guest_id).values(**update_data).returning(Guest)
+    else:
+        stmt = select(Guest).where(Guest.id == guest_id)
+    row = write_returning(db, stmt)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Guest not found"
         )
     
-    # Check if email is being changed and if it already exists
-    if guest_update.email and guest_update.email != db_guest.email:
-        existing_guest = db.query(Guest).filter(Guest.email == guest_update.email).first()
-        if existing_guest:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-    
-    # Check if ID number is being changed and if it already exists
-    if guest_update.id_number and guest_update.id_number != db_guest.id_number:
-        existing_guest = db.query(Guest).filter(Guest.id_number == guest_update.id_number).first()
-        if existing_guest:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="ID number already registered"
-            )
-    
-    # Update fields
-    update_data = guest_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_guest, field, value)
-    
+    # Serialize before commit expires the returned row
+    db_guest = GuestResponse.model_validate(row[0])
     db.commit()
-    db.refresh(db_guest)
     return db_guest
 
 @router.delete("/{guest_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -132,18 +175,21 @@ def delete_guest(
     current_user = CurrentUser
 ):
     """Delete a guest"""
-    db_guest = db.query(Guest).filter(Guest.id == guest_id).first()
-    if not db_guest:
+    # Fetch the guest and whether it has reservations in one query
+    row = db.query(Guest, exists().where(Reservation.guest_id == Guest.id)).filter(Guest.id == guest_id).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Guest not found"
         )
+    db_guest, has_reservations = row
     
     # Check if guest has active reservations
-    if db_guest.reservations:
+    if has_reservations:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete guest with existing reservations"
         )
     db_guest.deleted_at = datetime.now()
+    db.commit()
     return None
\ No newline at end of file
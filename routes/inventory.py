@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+from database import get_db
+from schemas.inventory import InventoryNight
+from services.inventory import inventory_grid
+from services.room_nights import check_report_window
+from auth import CurrentUser
+from datetime import date
+
+router = APIRouter(
+    prefix="/inventory",
+    tags=["inventory"],
+)
+
+@router.get("/", response_model=List[InventoryNight])
+def get_inventory(
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Total, sold and available rooms per room type for each night in [from, to)"""
+    check_report_window(start, end)
+    return inventory_grid(db, start, end)
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from database import get_db
+from models.rooms import Room
+from schemas.quotes import QuoteRequest, QuoteResponse
+from services.pricing import quote_matrix
+from auth import CurrentUser
+
+router = APIRouter(
+    prefix="/quotes",
+    tags=["quotes"],
+)
+
+@router.post("/", response_model=QuoteResponse)
+def create_quotes(
+    quote_request: QuoteRequest,
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Price every requested room for every requested stay in one call"""
+    rooms = {
+        room.id: room for room in db.scalars(
+            select(Room).where(Room.id.in_(set(quote_request.room_ids)), Room.deleted_at.is_(None))
+        )
+    }
+    known = [room_id for room_id in quote_request.room_ids if room_id in rooms]
+    rows = {}
+    if known:
+        stays = [(stay.check_in_date, stay.check_out_date) for stay in quote_request.stays]
+        totals = quote_matrix(db, [rooms[room_id] for room_id in known], stays)
+        rows = dict(zip(known, totals.tolist()))
+    return QuoteResponse(
+        room_ids=quote_request.room_ids,
+        stays=quote_request.stays,
+        totals=[rows.get(room_id) for room_id in quote_request.room_ids]
+    )
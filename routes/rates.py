@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from database import get_db
+from models.rates import RateOverride, RateRule
+from models.rooms import RoomType
+from schemas.rates import RateRuleCreate, RateRuleResponse, RateOverrideSet, RateOverrideResponse
+from auth import CurrentUser
+from datetime import date, timedelta
+
+router = APIRouter(
+    prefix="/rates",
+    tags=["rates"],
+)
+
+@router.post("/rules", response_model=RateRuleResponse, status_code=status.HTTP_201_CREATED)
+def create_rate_rule(
+    rule: RateRuleCreate,
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Add a weekday or length-of-stay pricing rule"""
+    db_rule = RateRule(**rule.model_dump())
+    db.add(db_rule)
+    db.commit()
+    db.refresh(db_rule)
+    return db_rule
+
+@router.get("/rules", response_model=List[RateRuleResponse])
+def get_rate_rules(
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Get all pricing rules"""
+    return db.scalars(select(RateRule).order_by(RateRule.id)).all()
+
+@router.delete("/rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_rate_rule(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Delete a pricing rule"""
+    db_rule = db.get(RateRule, rule_id)
+    if not db_rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rate rule not found"
+        )
+    db.delete(db_rule)
+    db.commit()
+    return None
+
+@router.get("/overrides", response_model=List[RateOverrideResponse])
+def get_rate_overrides(
+    start: date,
+    end: date,
+    room_type: Optional[RoomType] = None,
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Get calendar overrides for the nights in [start, end)"""
+    query = select(RateOverride).where(RateOverride.night >= start, RateOverride.night < end)
+    if room_type:
+        query = query.where(RateOverride.room_type == room_type)
+    return db.scalars(query.order_by(RateOverride.night, RateOverride.room_type)).all()
+
+@router.put("/overrides", response_model=List[RateOverrideResponse])
+def set_rate_overrides(
+    override: RateOverrideSet,
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Set (or with multiplier null, clear) a room type's multiplier for every night in [start, end)"""
+    db.execute(delete(RateOverride).where(
+        RateOverride.room_type == override.room_type,
+        RateOverride.night >= override.start,
+        RateOverride.night < override.end,
+    ))
+    overrides = []
+    if override.multiplier is not None:
+        overrides = [
+            RateOverride(room_type=override.room_type, night=override.start + timedelta(days=offset), multiplier=override.multiplier)
+            for offset in range((override.end - override.start).days)
+        ]
+        db.add_all(overrides)
+    db.commit()
+    return overrides
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List, Literal
+from database import get_db
+from schemas.reports import OccupancyReportRow, RevenueReportRow
+from services.room_nights import check_report_window, room_night_report
+from auth import CurrentUser
+from datetime import date
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["reports"],
+)
+
+Grouping = Literal["day", "room_type", "floor"]
+
+@router.get("/occupancy", response_model=List[OccupancyReportRow])
+def get_occupancy_report(
+    start: date,
+    end: date,
+    group_by: Grouping = "day",
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Occupancy for the nights in [start, end), by day, room type or floor"""
+    check_report_window(start, end)
+    return room_night_report(db, start, end, group_by)
+
+@router.get("/revenue", response_model=List[RevenueReportRow])
+def get_revenue_report(
+    start: date,
+    end: date,
+    group_by: Grouping = "day",
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Revenue, ADR and RevPAR for the nights in [start, end), by day, room type or floor"""
+    check_report_window(start, end)
+    return room_night_report(db, start, end, group_by)
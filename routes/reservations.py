@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Literal, Optional
 from datetime import datetime
+from config import settings
 from database import get_db
 from models.reservations import Reservation, ReservationStatus
-from models.rooms import Room, RoomStatus
+from models.rooms import Room
 from models.guests import Guest
-from schemas.reservations import ReservationCreate, ReservationUpdate, ReservationResponse
+from schemas.changes import ReservationChanges
+from schemas.reservations import (
+    ReservationCreate, ReservationUpdate, ReservationResponse,
+    ReservationBulkCreate, ReservationBulkResponse, ReservationExpandedResponse,
+)
+from services.availability import active_overlap, check_stay_length, commit_booking
+from services.availability_index import availability_index
+from services.bulk_booking import plan_bulk_reservations
+from services.changes import change_feed
+from services.expansion import expand_options, expanded, expanded_rows, parse_expand
+from services.export import EXPORT_MEDIA_TYPES, stream_export
+from services.fast_lists import list_response, response_columns
+from services.pagination import keyset, set_next_cursor
+from services.events import emit_event, reservation_event
+from services.pricing import quote_price, quote_stays
 from auth import CurrentUser
 
 router = APIRouter(
@@ -15,16 +31,21 @@ router = APIRouter(
     tags=["reservations"],
 )
 
+# List endpoints select these as rows and serialize them without ORM objects
+RESERVATION_COLUMNS = response_columns(Reservation, ReservationResponse)
+
 def check_room_availability(db: Session, room_id: int, check_in: datetime, check_out: datetime, exclude_reservation_id: int = None):
     """Check if a room is available for the given date range"""
-    query = db.query(Reservation).filter(
+    if settings.availability_index_enabled:
+        if availability_index.is_free(db, room_id, check_in, check_out, exclude_reservation_id):
+            return True
+        # Another worker may have freed the room since we indexed it
+        availability_index.load_room(db, room_id)
+        return availability_index.is_free(db, room_id, check_in, check_out, exclude_reservation_id)
+    
+    query = db.query(Reservation.id).filter(
         Reservation.room_id == room_id,
-        Reservation.status.in_([ReservationStatus.PENDING, ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN]),
-        or_(
-            and_(Reservation.check_in_date <= check_in, Reservation.check_out_date > check_in),
-            and_(Reservation.check_in_date < check_out, Reservation.check_out_date >= check_out),
-            and_(Reservation.check_in_date >= check_in, Reservation.check_out_date <= check_out)
-        )
+        active_overlap(check_in, check_out)
     )
     
     if exclude_reservation_id:
@@ -35,12 +56,12 @@ def check_room_availability(db: Session, room_id: int, check_in: datetime, check
 
 def calculate_total_price(db: Session, room_id: int, check_in: datetime, check_out: datetime):
     """Calculate total price for the reservation"""
-    room = db.query(Room).filter(Room.id == room_id).first()
+    # Identity-map lookup: no query when the handler already loaded the room
+    room = db.get(Room, room_id)
     if not room:
         return 0
     
-    nights = (check_out - check_in).days
-    return room.price * nights
+    return quote_price(db, room, check_in, check_out)
 
 @router.post("/", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
 def create_reservation(
@@ -65,8 +86,9 @@ def create_reservation(
             detail="Room not found"
         )
     
-    # Check room availability
-    if not check_room_availability(db, reservation.room_id, reservation.check_in_date, reservation.check_out_date):
+    # Check room availability (in exclusion mode the insert itself is the check)
+    exclusion_mode = settings.booking_mode == "exclusion"
+    if not exclusion_mode and not check_room_availability(db, reservation.room_id, reservation.check_in_date, reservation.check_out_date):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Room is not available for the selected dates"
@@ -89,62 +111,144 @@ def create_reservation(
     )
     db.add(db_reservation)
     
-    # Update room status to reserved
-    room.status = RoomStatus.RESERVED
-    
-    db.commit()
+    commit_booking(db, reservation.room_id)
     db.refresh(db_reservation)
     return db_reservation
 
-@router.get("/", response_model=List[ReservationResponse])
+@router.post("/bulk", response_model=ReservationBulkResponse, status_code=status.HTTP_201_CREATED)
+def create_reservations_bulk(
+    batch: ReservationBulkCreate,
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Create many reservations in one transaction with set-based validation"""
+    accepted, errors = plan_bulk_reservations(db, batch.items)
+    if errors and batch.all_or_nothing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=[error.model_dump() for error in errors]
+        )
+    if not accepted:
+        return ReservationBulkResponse(created=[], errors=errors)
+    
+    totals = quote_stays(
+        db, [room for _, _, room in accepted], [(item.check_in_date, item.check_out_date) for _, item, _ in accepted]
+    )
+    db_reservations = [
+        Reservation(**item.model_dump(), total_price=float(total_price))
+        for (_, item, _), total_price in zip(accepted, totals)
+    ]
+    db.add_all(db_reservations)
+    
+    # The flush happens inside commit_booking, so an exclusion violation
+    # raised by the INSERT is mapped to a 400 like any other booking
+    commit_booking(db, accepted[0][2].id)
+    # Primary keys survive expiry on commit: read them without a reload
+    created_ids = [inspect(db_reservation).identity[0] for db_reservation in db_reservations]
+    
+    # One query to reload the batch instead of a refresh per row
+    created = db.query(Reservation).filter(Reservation.id.in_(created_ids)).order_by(Reservation.id).all()
+    return ReservationBulkResponse(
+        created=[ReservationResponse.model_validate(reservation) for reservation in created],
+        errors=errors
+    )
+
+@router.get("/", response_model=List[ReservationExpandedResponse], response_model_exclude_unset=True)
 def get_reservations(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status: ReservationStatus = None,
+    expand: Optional[str] = None,
+    include_deleted: bool = False,
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Get all reservations with optional status filter, paged by cursor or skip/limit"""
+    fields = parse_expand(expand)
+    query = select(*RESERVATION_COLUMNS).execution_options(include_deleted=include_deleted)
+    if status:
+        query = query.where(Reservation.status == status)
+    rows = db.execute(keyset(query, Reservation.id, cursor, skip).limit(limit)).all()
+    set_next_cursor(response, rows, limit)
+    return list_response(expanded_rows(db, rows, fields), response)
+
+@router.get("/changes", response_model=ReservationChanges)
+def get_reservation_changes(
+    since_seq: int = Query(0, ge=0),
+    since_id: int = Query(0, ge=0),
+    updated_since: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=10000),
     db: Session = Depends(get_db),
     current_user = CurrentUser
 ):
-    """Get all reservations with optional status filter"""
-    query = db.query(Reservation)
+    """Reservations written after the ``since_seq``/``since_id`` cursor, plus tombstones, for downstream sync"""
+    return ORJSONResponse(change_feed(db, Reservation, RESERVATION_COLUMNS, since_seq, since_id, updated_since, limit))
+
+@router.get("/export")
+def export_reservations(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status: ReservationStatus = None,
+    check_in_from: Optional[datetime] = None,
+    check_in_to: Optional[datetime] = None,
+    current_user = CurrentUser
+):
+    """Stream every matching reservation as NDJSON or CSV in constant memory"""
+    columns = ["id", *(name for name in ReservationResponse.model_fields if name != "id")]
+    stmt = select(*[getattr(Reservation, column) for column in columns]).order_by(Reservation.id)
     if status:
-        query = query.filter(Reservation.status == status)
-    reservations = query.offset(skip).limit(limit).all()
-    return reservations
+        stmt = stmt.where(Reservation.status == status)
+    if check_in_from:
+        stmt = stmt.where(Reservation.check_in_date >= check_in_from)
+    if check_in_to:
+        stmt = stmt.where(Reservation.check_in_date < check_in_to)
+    return StreamingResponse(
+        stream_export(stmt, columns, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=reservations.{format}"}
+    )
 
-@router.get("/{reservation_id}", response_model=ReservationResponse)
+@router.get("/{reservation_id}", response_model=ReservationExpandedResponse, response_model_exclude_unset=True)
 def get_reservation(
     reservation_id: int,
+    expand: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user = CurrentUser
 ):
     """Get a specific reservation by ID"""
-    reservation = db.query(Reservation).filter(Reservation.id == reservation_id).first()
+    fields = parse_expand(expand)
+    reservation = db.query(Reservation).options(*expand_options(fields)).filter(Reservation.id == reservation_id).first()
     if not reservation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reservation not found"
         )
-    return reservation
+    return expanded(reservation, fields)
 
-@router.get("/guest/{guest_id}", response_model=List[ReservationResponse])
+@router.get("/guest/{guest_id}", response_model=List[ReservationExpandedResponse], response_model_exclude_unset=True)
 def get_guest_reservations(
     guest_id: int,
+    expand: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user = CurrentUser
 ):
     """Get all reservations for a specific guest"""
-    reservations = db.query(Reservation).filter(Reservation.guest_id == guest_id).all()
-    return reservations
+    fields = parse_expand(expand)
+    rows = db.execute(select(*RESERVATION_COLUMNS).where(Reservation.guest_id == guest_id)).all()
+    return list_response(expanded_rows(db, rows, fields))
 
-@router.get("/room/{room_id}", response_model=List[ReservationResponse])
+@router.get("/room/{room_id}", response_model=List[ReservationExpandedResponse], response_model_exclude_unset=True)
 def get_room_reservations(
     room_id: int,
+    expand: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user = CurrentUser
 ):
     """Get all reservations for a specific room"""
-    reservations = db.query(Reservation).filter(Reservation.room_id == room_id).all()
-    return reservations
+    fields = parse_expand(expand)
+    rows = db.execute(select(*RESERVATION_COLUMNS).where(Reservation.room_id == room_id)).all()
+    return list_response(expanded_rows(db, rows, fields))
 
 @router.put("/{reservation_id}", response_model=ReservationResponse)
 def update_reservation(
@@ -154,7 +258,7 @@ def update_reservation(
     current_user = CurrentUser
 ):
     """Update a reservation"""
-    db_reservation = db.query(Reservation).filter(Reservation.id == reservation_id).first()
+    db_reservation = db.query(Reservation).options(joinedload(Reservation.room)).filter(Reservation.id == reservation_id).first()
     if not db_reservation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -166,7 +270,15 @@ def update_reservation(
     check_out = reservation_update.check_out_date or db_reservation.check_out_date
     
     if reservation_update.check_in_date or reservation_update.check_out_date:
-        if not check_room_availability(db, db_reservation.room_id, check_in, check_out, reservation_id):
+        try:
+            check_stay_length(check_in, check_out)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+        exclusion_mode = settings.booking_mode == "exclusion"
+        if not exclusion_mode and not check_room_availability(db, db_reservation.room_id, check_in, check_out, reservation_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Room is not available for the selected dates"
@@ -179,24 +291,9 @@ def update_reservation(
     update_data = reservation_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_reservation, field, value)
+    emit_event(db, "reservation", reservation_event(db_reservation, "updated"))
     
-    # Update room status based on reservation status
-    room = db_reservation.room
-    if reservation_update.status == ReservationStatus.CHECKED_IN:
-        room.status = RoomStatus.OCCUPIED
-    elif reservation_update.status == ReservationStatus.CHECKED_OUT:
-        room.status = RoomStatus.AVAILABLE
-    elif reservation_update.status == ReservationStatus.CANCELLED:
-        # Check if there are other active reservations for this room
-        active_reservations = db.query(Reservation).filter(
-            Reservation.room_id == room.id,
-            Reservation.id != reservation_id,
-            Reservation.status.in_([ReservationStatus.PENDING, ReservationStatus.CONFIRMED])
-        ).first()
-        if not active_reservations:
-            room.status = RoomStatus.AVAILABLE
-    
-    db.commit()
+    commit_booking(db, db_reservation.room_id)
     db.refresh(db_reservation)
     return db_reservation
 
@@ -214,17 +311,7 @@ def delete_reservation(
             detail="Reservation not found"
         )
     
-    # Update room status if this was the only active reservation
-    room = db_reservation.room
-    active_reservations = db.query(Reservation).filter(
-        Reservation.room_id == room.id,
-        Reservation.id != reservation_id,
-        Reservation.status.in_([ReservationStatus.PENDING, ReservationStatus.CONFIRMED])
-    ).first()
-    
-    if not active_reservations:
-        room.status = RoomStatus.AVAILABLE
-    
+    # The room's status flag follows with the room status job (services/lifecycle.py)
     db_reservation.deleted_at = datetime.now()
     db.commit()
     return None
@@ -250,7 +337,7 @@ def check_in(
         )
     
     reservation.status = ReservationStatus.CHECKED_IN
-    reservation.room.status = RoomStatus.OCCUPIED
+    emit_event(db, "reservation", reservation_event(reservation, "checked_in"))
     
     db.commit()
     db.refresh(reservation)
@@ -277,7 +364,7 @@ def check_out(
         )
     
     reservation.status = ReservationStatus.CHECKED_OUT
-    reservation.room.status = RoomStatus.AVAILABLE
+    emit_event(db, "reservation", reservation_event(reservation, "checked_out"))
     
     db.commit()
     db.refresh(reservation)
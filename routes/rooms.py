@@ -1,17 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from database import get_db
-from models.rooms import Room, RoomStatus
-from schemas.rooms import RoomCreate, RoomUpdate, RoomResponse
+from models.rooms import Room, RoomStatus, RoomType
+from schemas.changes import RoomChanges
+from schemas.rooms import RoomCreate, RoomUpdate, RoomResponse, RoomGridResponse
+from services.availability import available_rooms_statement, check_search_dates
+from services import catalogue_cache
+from services.changes import change_feed
+from services.constraints import write_returning
+from services.fast_lists import response_columns
+from services.events import emit_event, room_event
+from services.inventory import apply_room_change
+from services.pagination import keyset, set_next_cursor
+from services.room_grid import room_grid
+from services.room_nights import restamp_room_nights
 from auth import CurrentUser
-from datetime import datetime
+from datetime import date, datetime
 
 router = APIRouter(
     prefix="/rooms",
     tags=["rooms"],
 )
 
+room_adapter = TypeAdapter(RoomResponse)
+room_list_adapter = TypeAdapter(List[RoomResponse])
+room_grid_adapter = TypeAdapter(RoomGridResponse)
+# The list endpoint selects these as rows rather than loading Room objects
+ROOM_COLUMNS = response_columns(Room, RoomResponse)
+
+def restamp_room(db: Session, room: Room, old_type: RoomType, old_floor: Optional[int], old_deleted_at: Optional[datetime]):
+    """Carry a room UPDATE statement into room_nights and room_inventory, which
+    copy its type and floor; flushed updates reach them through session hooks"""
+    if (old_type, old_floor) == (room.room_type, room.floor):
+        return
+    restamp_room_nights(db, room.id, room.room_type, room.floor)
+    apply_room_change(db, room.id, (old_type, old_deleted_at is None), (room.room_type, room.deleted_at is None))
+
 @router.post("/", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
 def create_room(
     room: RoomCreate,
@@ -19,44 +47,87 @@ def create_room(
     current_user = CurrentUser
 ):
     """Create a new room"""
-    # Check if room number already exists
-    db_room = db.query(Room).filter(Room.room_number == room.room_number).first()
-    if db_room:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Room number already exists"
-        )
-    
-    db_room = Room(**room.model_dump())
-    db.add(db_room)
+    # The unique constraint on room_number is the duplicate check
+    row = write_returning(db, insert(Room).values(**room.model_dump()).returning(Room))
+    db_room = row[0]
+    apply_room_change(db, db_room.id, None, (db_room.room_type, True))
+    db_room = RoomResponse.model_validate(db_room)
     db.commit()
-    db.refresh(db_room)
     return db_room
 
 @router.get("/", response_model=List[RoomResponse])
 def get_rooms(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status: RoomStatus = None,
+    include_deleted: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get all rooms with optional filtering"""
-    query = db.query(Room)
+    """Get all rooms with optional filtering, paged by cursor or skip/limit"""
+    cached, key = catalogue_cache.lookup(request, catalogue_cache.ROOMS)
+    if cached is not None:
+        return cached
+    query = select(*ROOM_COLUMNS).execution_options(include_deleted=include_deleted)
     if status:
-        query = query.filter(Room.status == status)
-    rooms = query.offset(skip).limit(limit).all()
-    return rooms
+        query = query.where(Room.status == status)
+    
+    def load():
+        rooms = db.execute(keyset(query, Room.id, cursor, skip).limit(limit)).all()
+        set_next_cursor(response, rooms, limit)
+        return rooms
+    
+    return catalogue_cache.load_and_store(request, response, key, room_list_adapter, load)
+
+@router.get("/changes", response_model=RoomChanges)
+def get_room_changes(
+    since_seq: int = Query(0, ge=0),
+    since_id: int = Query(0, ge=0),
+    updated_since: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user = CurrentUser
+):
+    """Rooms written after the ``since_seq``/``since_id`` cursor, plus tombstones, for downstream sync"""
+    return ORJSONResponse(change_feed(db, Room, ROOM_COLUMNS, since_seq, since_id, updated_since, limit))
+
+@router.get("/grid", response_model=RoomGridResponse)
+def get_room_grid(
+    request: Request,
+    response: Response,
+    start: date,
+    days: int = Query(30, ge=1, le=366),
+    encoding: Literal["bitmap", "rle"] = "bitmap",
+    room_type: Optional[RoomType] = None,
+    db: Session = Depends(get_db)
+):
+    """Room x day occupancy for the tape chart, one compact entry per room"""
+    cached, key = catalogue_cache.lookup(request, catalogue_cache.AVAILABILITY)
+    if cached is not None:
+        return cached
+    grid = room_grid(db, start, days, encoding, room_type)
+    return catalogue_cache.store(request, response, key, room_grid_adapter, grid)
 
 @router.get("/{room_id}", response_model=RoomResponse)
-def get_room(room_id: int, db: Session = Depends(get_db)):
+def get_room(
+    room_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     """Get a specific room by ID"""
+    cached, key = catalogue_cache.lookup(request, catalogue_cache.ROOMS)
+    if cached is not None:
+        return cached
     room = db.query(Room).filter(Room.id == room_id).first()
     if not room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found"
         )
-    return room
+    return catalogue_cache.store(request, response, key, room_adapter, room)
 
 @router.put("/{room_id}", response_model=RoomResponse)
 def update_room(
@@ -66,29 +137,35 @@ def update_room(
     current_user = CurrentUser
 ):
     """Update a room"""
-    db_room = db.query(Room).filter(Room.id == room_id).first()
-    if not db_room:
+    update_data = room_update.model_dump(exclude_unset=True)
+    if not update_data:
+        db_room = db.get(Room, room_id)
+        if not db_room:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Room not found"
+            )
+        return db_room
+    
+    # Self-join so RETURNING also carries the pre-update type and floor
+    old = Room.__table__.alias("old")
+    row = write_returning(
+        db,
+        update(Room).where(Room.id == room_id, old.c.id == Room.id).values(**update_data)
+        .returning(Room, old.c.room_type, old.c.floor, old.c.deleted_at)
+    )
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found"
         )
+    db_room, old_type, old_floor, old_deleted_at = row
+    restamp_room(db, db_room, old_type, old_floor, old_deleted_at)
     
-    # Check if room number is being changed and if it already exists
-    if room_update.room_number and room_update.room_number != db_room.room_number:
-        existing_room = db.query(Room).filter(Room.room_number == room_update.room_number).first()
-        if existing_room:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Room number already exists"
-            )
-    
-    # Update fields
-    update_data = room_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_room, field, value)
-    
+    # Serialize before commit expires the returned row
+    db_room = RoomResponse.model_validate(db_room)
+    emit_event(db, "room", room_event(db_room))
     db.commit()
-    db.refresh(db_room)
     return db_room
 
 @router.delete("/{room_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -111,8 +188,24 @@ def delete_room(
 
 @router.get("/available/search", response_model=List[RoomResponse])
 def search_available_rooms(
+    request: Request,
+    response: Response,
+    check_in_date: Optional[datetime] = None,
+    check_out_date: Optional[datetime] = None,
+    room_type: Optional[RoomType] = None,
+    min_capacity: Optional[int] = Query(None, ge=1),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
     db: Session = Depends(get_db)
 ):
-    """Get all available rooms"""
-    rooms = db.query(Room).filter(Room.status == RoomStatus.AVAILABLE).all()
-    return rooms
\ No newline at end of file
+    """Search rooms free for a stay, filtered by type, capacity and price"""
+    check_search_dates(check_in_date, check_out_date)
+    cached, key = catalogue_cache.lookup(request, catalogue_cache.AVAILABILITY)
+    if cached is not None:
+        return cached
+    stmt = available_rooms_statement(
+        check_in_date, check_out_date, room_type, min_capacity, min_price, max_price
+    )
+    return catalogue_cache.load_and_store(
+        request, response, key, room_list_adapter, lambda: db.scalars(stmt).all()
+    )
\ No newline at end of file
@@ -0,0 +1,51 @@
+import threading
+from typing import Callable, List
+from logger import logger
+
+
+class PeriodicJob:
+    """Runs ``fn`` every ``interval`` seconds on a daemon thread.
+
+    Every worker process runs its own copy, so jobs must tolerate running
+    concurrently with themselves (e.g. claim rows with SKIP LOCKED).
+    """
+
+    def __init__(self, name: str, interval: float, fn: Callable[[], None]):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"hms-job-{name}", daemon=True)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.fn()
+            except Exception:
+                logger.exception(f"Scheduled job {self.name} failed")
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+
+class Scheduler:
+    def __init__(self):
+        self.jobs: List[PeriodicJob] = []
+
+    def every(self, interval: float, name: str, fn: Callable[[], None]):
+        self.jobs.append(PeriodicJob(name, interval, fn))
+
+    def start(self):
+        for job in self.jobs:
+            job.start()
+            logger.info(f"Scheduled job {job.name} every {job.interval}s")
+
+    def stop(self):
+        for job in self.jobs:
+            job.stop()
+
+
+scheduler = Scheduler()
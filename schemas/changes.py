@@ -0,0 +1,28 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import List
+from schemas.guests import GuestResponse
+from schemas.reservations import ReservationResponse
+from schemas.rooms import RoomResponse
+
+class Tombstone(BaseModel):
+    id: int
+    change_seq: int
+    deleted_at: datetime
+
+class ChangeFeed(BaseModel):
+    # Soft-deleted since the cursor: drop these ids downstream
+    tombstones: List[Tombstone]
+    # Pass back as since_seq and since_id for the next page
+    next_since_seq: int
+    next_since_id: int
+    has_more: bool
+
+class GuestChanges(ChangeFeed):
+    changes: List[GuestResponse]
+
+class RoomChanges(ChangeFeed):
+    changes: List[RoomResponse]
+
+class ReservationChanges(ChangeFeed):
+    changes: List[ReservationResponse]
@@ -23,7 +23,10 @@ class GuestUpdate(BaseModel):
 
 class GuestResponse(GuestBase):
     id: int
-    created_at: datetime
+    # Unset on rows written before these were maintained
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    change_seq: Optional[int] = None
     
     class Config:
         from_attributes = True
\ No newline at end of file
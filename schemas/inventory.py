@@ -0,0 +1,13 @@
+from datetime import date
+from pydantic import BaseModel
+from typing import Dict
+from models.rooms import RoomType
+
+class InventoryCell(BaseModel):
+    total: int
+    sold: int
+    available: int
+
+class InventoryNight(BaseModel):
+    night: date
+    rooms: Dict[RoomType, InventoryCell]
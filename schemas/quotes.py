@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
+from datetime import datetime
+from services.availability import check_stay_length
+
+# Rooms x stays priced in one call
+MAX_QUOTES = 10_000
+
+class QuoteStay(BaseModel):
+    check_in_date: datetime
+    check_out_date: datetime
+    
+    @field_validator('check_out_date')
+    @classmethod
+    def check_dates(cls, v, info):
+        if 'check_in_date' in info.data and v <= info.data['check_in_date']:
+            raise ValueError('check_out_date must be after check_in_date')
+        if 'check_in_date' in info.data:
+            check_stay_length(info.data['check_in_date'], v)
+        return v
+
+class QuoteRequest(BaseModel):
+    room_ids: List[int] = Field(..., min_length=1)
+    stays: List[QuoteStay] = Field(..., min_length=1)
+    
+    @model_validator(mode='after')
+    def check_size(self):
+        if len(self.room_ids) * len(self.stays) > MAX_QUOTES:
+            raise ValueError(f'At most {MAX_QUOTES} room x stay quotes per request')
+        return self
+
+class QuoteResponse(BaseModel):
+    room_ids: List[int]
+    stays: List[QuoteStay]
+    # totals[i][j]: price of room_ids[i] for stays[j]; null for unknown rooms
+    totals: List[Optional[List[float]]]
@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional
+from datetime import date
+from models.rates import RateRuleKind
+from models.rooms import RoomType
+
+class RateRuleBase(BaseModel):
+    kind: RateRuleKind
+    room_type: Optional[RoomType] = None
+    multiplier: float = Field(..., gt=0)
+    weekdays: Optional[str] = Field(None, pattern=r"^[0-6](,[0-6])*$", description="Monday=0, e.g. '4,5'")
+    min_nights: Optional[int] = Field(None, ge=1)
+    valid_from: Optional[date] = None
+    valid_to: Optional[date] = None
+
+class RateRuleCreate(RateRuleBase):
+    @model_validator(mode='after')
+    def check_kind(self):
+        if self.kind == RateRuleKind.WEEKDAY and not self.weekdays:
+            raise ValueError('weekday rules need weekdays')
+        if self.kind == RateRuleKind.LENGTH_OF_STAY and not self.min_nights:
+            raise ValueError('length of stay rules need min_nights')
+        if self.valid_from and self.valid_to and self.valid_to <= self.valid_from:
+            raise ValueError('valid_to must be after valid_from')
+        return self
+
+class RateRuleResponse(RateRuleBase):
+    id: int
+    
+    class Config:
+        from_attributes = True
+
+class RateOverrideSet(BaseModel):
+    room_type: RoomType
+    start: date
+    end: date
+    # None clears the overrides in [start, end)
+    multiplier: Optional[float] = Field(None, gt=0)
+    
+    @model_validator(mode='after')
+    def check_dates(self):
+        if self.end <= self.start:
+            raise ValueError('end must be after start')
+        return self
+
+class RateOverrideResponse(BaseModel):
+    room_type: RoomType
+    night: date
+    multiplier: float
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,20 @@
+from datetime import date
+from pydantic import BaseModel
+from typing import Optional, Union
+from models.rooms import RoomType
+
+# The night, room type or floor the row aggregates, depending on group_by
+ReportGroup = Union[date, RoomType, int, None]
+
+class OccupancyReportRow(BaseModel):
+    group: ReportGroup
+    sold_nights: int
+    available_nights: int
+    occupancy: float
+
+class RevenueReportRow(BaseModel):
+    group: ReportGroup
+    sold_nights: int
+    revenue: float
+    adr: float
+    revpar: float
@@ -1,7 +1,10 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
 from datetime import datetime
 from models.reservations import ReservationStatus
+from schemas.guests import GuestResponse
+from schemas.rooms import RoomResponse
+from services.availability import check_stay_length, naive_local
 
 class ReservationBase(BaseModel):
     guest_id: int
@@ -11,6 +14,12 @@ class ReservationBase(BaseModel):
     number_of_guests: int = Field(default=1, ge=1)
     special_requests: Optional[str] = None
     
+    # Runs before check_dates, so aware and naive values never meet
+    @field_validator('check_in_date', 'check_out_date')
+    @classmethod
+    def as_naive_local(cls, v):
+        return naive_local(v)
+    
     @field_validator('check_out_date')
     @classmethod
     def check_dates(cls, v, info):
@@ -19,7 +28,10 @@ class ReservationBase(BaseModel):
         return v
 
 class ReservationCreate(ReservationBase):
-    pass
+    @model_validator(mode='after')
+    def check_length(self):
+        check_stay_length(self.check_in_date, self.check_out_date)
+        return self
 
 class ReservationUpdate(BaseModel):
     check_in_date: Optional[datetime] = None
@@ -27,13 +39,46 @@ class ReservationUpdate(BaseModel):
     status: Optional[ReservationStatus] = None
     number_of_guests: Optional[int] = Field(None, ge=1)
     special_requests: Optional[str] = None
+    
+    @field_validator('check_in_date', 'check_out_date')
+    @classmethod
+    def as_naive_local(cls, v):
+        return naive_local(v)
+    
+    # With one date given, the handler checks the length against the stored one
+    @model_validator(mode='after')
+    def check_length(self):
+        if self.check_in_date and self.check_out_date:
+            check_stay_length(self.check_in_date, self.check_out_date)
+        return self
 
 class ReservationResponse(ReservationBase):
     id: int
     status: ReservationStatus
     total_price: float
-    created_at: datetime
-    updated_at: datetime
+    # Unset on rows written before these were maintained
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    change_seq: Optional[int] = None
+    overdue_at: Optional[datetime] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ReservationBulkCreate(BaseModel):
+    items: List[ReservationCreate] = Field(..., min_length=1, max_length=1000)
+    # False: insert the valid items and report the rest
+    all_or_nothing: bool = True
+
+class ReservationBulkError(BaseModel):
+    index: int
+    detail: str
+
+class ReservationBulkResponse(BaseModel):
+    created: List[ReservationResponse]
+    errors: List[ReservationBulkError]
+
+class ReservationExpandedResponse(ReservationResponse):
+    # Only present when requested with ?expand=room,guest
+    room: Optional[RoomResponse] = None
+    guest: Optional[GuestResponse] = None
@@ -1,5 +1,6 @@
+from datetime import date, datetime
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional, Union
 from models.rooms import RoomStatus, RoomType
 
 class RoomBase(BaseModel):
@@ -25,6 +26,18 @@ class RoomUpdate(BaseModel):
 class RoomResponse(RoomBase):
     id: int
     status: RoomStatus
+    updated_at: Optional[datetime] = None
+    change_seq: Optional[int] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class RoomGridResponse(BaseModel):
+    start: date
+    days: int
+    encoding: Literal["bitmap", "rle"]
+    room_ids: List[int]
+    room_numbers: List[str]
+    # Per room: base64 bitmap (bit d = start + d is held) or alternating
+    # free/held run lengths, depending on encoding
+    occupancy: List[Union[str, List[int]]]
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from typing import Dict
+from sqlalchemy import Table, text
+from sqlalchemy.orm import Session
+from cache import cache
+from database import SessionLocal
+from models.archive import guests_archive, reservations_archive, rooms_archive
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room
+from services import catalogue_cache
+from config import settings
+from logger import logger
+
+# Live table, its archive, and which rows to move (:cutoff is the age limit).
+# Guests and rooms go only once nothing live references them.
+_ARCHIVABLE = (
+    (
+        Reservation.__table__, reservations_archive,
+        f"deleted_at < :cutoff OR (status = '{ReservationStatus.CHECKED_OUT.name}' AND check_out_date < :cutoff)",
+    ),
+    (
+        Guest.__table__, guests_archive,
+        "deleted_at < :cutoff AND NOT EXISTS (SELECT 1 FROM reservations r WHERE r.guest_id = guests.id)",
+    ),
+    (
+        Room.__table__, rooms_archive,
+        "deleted_at < :cutoff AND NOT EXISTS (SELECT 1 FROM reservations r WHERE r.room_id = rooms.id)",
+    ),
+)
+
+
+def _move_batches(db: Session, table: Table, archive: Table, condition: str, cutoff: datetime, batch_size: int) -> int:
+    """Move matching rows in id order, one committed batch at a time.
+
+    Batches claim rows with SKIP LOCKED, so concurrent runs (one per
+    worker) split the work instead of blocking, and resume after the last
+    id moved so the scan walks the primary key once.
+    """
+    columns = ", ".join(column.name for column in table.columns)
+    stmt = text(f"""
+        WITH moved AS (
+            DELETE FROM {table.name} WHERE id IN (
+                SELECT id FROM {table.name}
+                WHERE id > :after AND ({condition})
+                ORDER BY id LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {columns}
+        )
+        INSERT INTO {archive.name} ({columns}, archived_at)
+        SELECT {columns}, now() FROM moved
+        RETURNING id
+    """)
+    moved, after = 0, 0
+    while True:
+        ids = db.scalars(stmt, {"after": after, "cutoff": cutoff, "batch_size": batch_size}).all()
+        db.commit()
+        moved += len(ids)
+        if len(ids) < batch_size:
+            return moved
+        after = max(ids)
+
+
+def archive_old_rows(db: Session, months: int, batch_size: int) -> Dict[str, int]:
+    """Move soft-deleted rows and checked-out reservations older than
+    ``months`` into the ``*_archive`` tables. Returns rows moved per table."""
+    cutoff = datetime.now() - timedelta(days=30 * months)
+    moved = {
+        table.name: _move_batches(db, table, archive, condition, cutoff, batch_size)
+        for table, archive, condition in _ARCHIVABLE
+    }
+    if moved[Room.__tablename__]:
+        # Archived rooms drop out of include_deleted listings
+        cache.invalidate(catalogue_cache.ROOMS)
+    return moved
+
+
+def run_archive_job():
+    """Scheduler entry point, configured by the archive_* settings"""
+    with SessionLocal() as db:
+        moved = archive_old_rows(db, settings.archive_after_months, settings.archive_batch_size)
+    if any(moved.values()):
+        logger.info(f"Archived {moved}")
@@ -0,0 +1,147 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import and_, exists, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from config import settings
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus, RoomType
+
+# Reservations in these states hold the room for their whole stay
+ACTIVE_STATUSES = (
+    ReservationStatus.PENDING,
+    ReservationStatus.CONFIRMED,
+    ReservationStatus.CHECKED_IN,
+)
+
+# Exclusion constraint used when settings.booking_mode == "exclusion"
+EXCLUSION_CONSTRAINT = "reservations_no_overlap"
+EXCLUSION_VIOLATION = "23P01"
+
+
+class RoomUnavailableError(Exception):
+    """A booking overlaps another active reservation for the same room"""
+
+    def __init__(self, room_id: int):
+        super().__init__(f"Room {room_id} is not available for the selected dates")
+        self.room_id = room_id
+
+
+def naive_local(value: Optional[datetime]) -> Optional[datetime]:
+    """``value`` as the naive local time DateTime columns hold. Aware values
+    (``...Z`` or ``+05:30`` from a client) are converted; naive ones are
+    taken as local already, like ``datetime.now()`` everywhere else."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def check_stay_length(check_in: datetime, check_out: datetime):
+    """Raise ValueError for a stay longer than ``settings.max_stay_nights``"""
+    if (check_out.date() - check_in.date()).days > settings.max_stay_nights:
+        raise ValueError(f"A stay cannot be longer than {settings.max_stay_nights} nights")
+
+
+def active_overlap(check_in: datetime, check_out: datetime):
+    """Predicate for live, active reservations overlapping [check_in, check_out)"""
+    return and_(
+        Reservation.status.in_(ACTIVE_STATUSES),
+        Reservation.deleted_at.is_(None),
+        Reservation.check_out_date > check_in,
+        Reservation.check_in_date < check_out,
+    )
+
+
+def check_search_dates(check_in: Optional[datetime], check_out: Optional[datetime]):
+    """Reject half-open or inverted search windows"""
+    if (check_in is None) != (check_out is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="check_in_date and check_out_date must be given together"
+        )
+    if check_in and check_out <= check_in:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="check_out_date must be after check_in_date"
+        )
+
+
+def available_rooms_statement(
+    check_in: Optional[datetime] = None,
+    check_out: Optional[datetime] = None,
+    room_type: Optional[RoomType] = None,
+    min_capacity: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+):
+    """Build a single SELECT for rooms that are free for the whole stay.
+
+    With dates, booked rooms are removed with an anti-join (NOT EXISTS) against
+    overlapping active reservations, served by ``ix_reservations_live_room_stay``.
+    Without dates it falls back to the room's current status flag.
+    """
+    stmt = select(Room).where(Room.deleted_at.is_(None))
+
+    if check_in is not None and check_out is not None:
+        booked = exists().where(
+            Reservation.room_id == Room.id,
+            active_overlap(check_in, check_out),
+        )
+        stmt = stmt.where(Room.status != RoomStatus.MAINTENANCE, ~booked)
+    else:
+        stmt = stmt.where(Room.status == RoomStatus.AVAILABLE)
+
+    if room_type is not None:
+        stmt = stmt.where(Room.room_type == room_type)
+    if min_capacity is not None:
+        stmt = stmt.where(Room.capacity >= min_capacity)
+    if min_price is not None:
+        stmt = stmt.where(Room.price >= min_price)
+    if max_price is not None:
+        stmt = stmt.where(Room.price <= max_price)
+
+    return stmt.order_by(Room.price, Room.id)
+
+
+def install_exclusion_constraint(engine):
+    """Add the ``stay`` range column and the GiST no-overlap constraint.
+
+    Idempotent, so it is safe to run on every startup. Fails if the table
+    already holds overlapping active reservations; those must be resolved first.
+    """
+    active = ", ".join(f"'{s.name}'" for s in ACTIVE_STATUSES)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+        conn.execute(text(
+            "ALTER TABLE reservations ADD COLUMN IF NOT EXISTS stay tsrange "
+            "GENERATED ALWAYS AS (tsrange(check_in_date, check_out_date, '[)')) STORED"
+        ))
+        installed = conn.execute(
+            text("SELECT 1 FROM pg_constraint WHERE conname = :name"),
+            {"name": EXCLUSION_CONSTRAINT}
+        ).first()
+        if not installed:
+            conn.execute(text(
+                f"ALTER TABLE reservations ADD CONSTRAINT {EXCLUSION_CONSTRAINT} "
+                f"EXCLUDE USING gist (room_id WITH =, stay WITH &&) "
+                f"WHERE (status IN ({active}) AND deleted_at IS NULL)"
+            ))
+
+
+def is_exclusion_violation(exc: IntegrityError) -> bool:
+    """True if the database rejected a write for overlapping another stay"""
+    orig = exc.orig
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return code == EXCLUSION_VIOLATION or EXCLUSION_CONSTRAINT in str(orig)
+
+
+def commit_booking(db: Session, room_id: int):
+    """Commit, turning a no-overlap constraint violation into RoomUnavailableError"""
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if is_exclusion_violation(exc):
+            raise RoomUnavailableError(room_id) from exc
+        raise
@@ -0,0 +1,196 @@
+import bisect
+import threading
+from datetime import datetime
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, event, inspect, or_, select
+from sqlalchemy.orm import Session
+from config import settings
+from models.reservations import Reservation, ReservationStatus
+from services.availability import ACTIVE_STATUSES, RoomUnavailableError, active_overlap, naive_local
+
+# (check_in, check_out, reservation_id), kept sorted by check_in per room
+Interval = Tuple[datetime, datetime, int]
+
+# session.info keys for changes waiting on the current transaction
+_STAGED = "availability_index_staged"
+_TO_CONFIRM = "availability_index_to_confirm"
+
+
+class AvailabilityIndex:
+    """In-process interval index of active reservations, keyed by room_id.
+
+    Rooms are loaded lazily (or all at once by ``warm``) and then maintained
+    from committed sessions only. The index is advisory: a "free" answer is
+    re-checked by one overlap query at commit, and a "booked" answer is
+    re-read from the database before a request is rejected, so bookings
+    made by other workers can never make it wrong for long.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rooms: Dict[int, List[Interval]] = {}
+        self._room_of: Dict[int, int] = {}
+
+    def warm(self, db: Session):
+        """Load every active reservation in one pass"""
+        rows = db.execute(
+            select(Reservation.id, Reservation.room_id, Reservation.check_in_date, Reservation.check_out_date)
+            .where(Reservation.status.in_(ACTIVE_STATUSES), Reservation.deleted_at.is_(None))
+        )
+        rooms: Dict[int, List[Interval]] = {}
+        room_of: Dict[int, int] = {}
+        for reservation_id, room_id, check_in, check_out in rows:
+            rooms.setdefault(room_id, []).append((check_in, check_out, reservation_id))
+            room_of[reservation_id] = room_id
+        for intervals in rooms.values():
+            intervals.sort()
+        with self._lock:
+            self._rooms = rooms
+            self._room_of = room_of
+
+    def load_room(self, db: Session, room_id: int):
+        """(Re)load one room's active reservations from the database"""
+        rows = db.execute(
+            select(Reservation.id, Reservation.check_in_date, Reservation.check_out_date)
+            .where(
+                Reservation.room_id == room_id,
+                Reservation.status.in_(ACTIVE_STATUSES),
+                Reservation.deleted_at.is_(None),
+            )
+        )
+        intervals = sorted((check_in, check_out, reservation_id) for reservation_id, check_in, check_out in rows)
+        with self._lock:
+            for _, _, reservation_id in self._rooms.get(room_id, ()):
+                self._room_of.pop(reservation_id, None)
+            self._rooms[room_id] = intervals
+            for _, _, reservation_id in intervals:
+                self._room_of[reservation_id] = room_id
+
+    def invalidate(self, room_id: int):
+        """Forget a room so the next lookup reloads it"""
+        with self._lock:
+            for _, _, reservation_id in self._rooms.pop(room_id, ()):
+                self._room_of.pop(reservation_id, None)
+
+    def is_free(self, db: Session, room_id: int, check_in: datetime, check_out: datetime,
+                exclude_reservation_id: Optional[int] = None) -> bool:
+        """Return True if no indexed interval overlaps [check_in, check_out)"""
+        check_in, check_out = naive_local(check_in), naive_local(check_out)
+        with self._lock:
+            loaded = room_id in self._rooms
+        if not loaded:
+            self.load_room(db, room_id)
+
+        with self._lock:
+            intervals = self._rooms.get(room_id, [])
+            # Only intervals starting before check_out can overlap. A room's
+            # active stays never overlap each other, so their ends are ordered
+            # like their starts: the nearest one is the only candidate, unless
+            # it is the stay being moved.
+            position = bisect.bisect_left(intervals, (check_out,)) - 1
+            while position >= 0:
+                start, end, reservation_id = intervals[position]
+                if end <= check_in:
+                    break
+                if reservation_id != exclude_reservation_id:
+                    return False
+                position -= 1
+        return True
+
+    def apply(self, changes: Dict[int, Optional[Tuple[int, datetime, datetime]]]):
+        """Apply committed changes: reservation_id -> (room_id, check_in, check_out) or None"""
+        with self._lock:
+            for reservation_id, stay in changes.items():
+                previous_room = self._room_of.pop(reservation_id, None)
+                if previous_room is not None:
+                    self._rooms[previous_room] = [
+                        interval for interval in self._rooms.get(previous_room, [])
+                        if interval[2] != reservation_id
+                    ]
+                if stay is None:
+                    continue
+                room_id, check_in, check_out = stay
+                check_in, check_out = naive_local(check_in), naive_local(check_out)
+                # Rooms that were never loaded are filled on first lookup
+                if room_id in self._rooms:
+                    bisect.insort(self._rooms[room_id], (check_in, check_out, reservation_id))
+                    self._room_of[reservation_id] = room_id
+
+
+availability_index = AvailabilityIndex()
+
+
+def _needs_confirmation(session: Session, reservation: Reservation) -> bool:
+    """New bookings, moved stays and reactivated reservations must be re-checked"""
+    if reservation in session.new:
+        return True
+    attrs = inspect(reservation).attrs
+    if any(attrs[name].history.has_changes() for name in ("room_id", "check_in_date", "check_out_date")):
+        return True
+    previous_status = attrs.status.history.deleted
+    return bool(previous_status) and previous_status[0] not in ACTIVE_STATUSES
+
+
+@event.listens_for(Session, "after_flush")
+def _stage_reservation_changes(session, flush_context):
+    staged = session.info.setdefault(_STAGED, {})
+    to_confirm = session.info.setdefault(_TO_CONFIRM, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Reservation):
+            continue
+        active = (
+            obj not in session.deleted
+            and (obj.status or ReservationStatus.PENDING) in ACTIVE_STATUSES
+            and obj.deleted_at is None
+        )
+        if active:
+            staged[obj.id] = (obj.room_id, obj.check_in_date, obj.check_out_date)
+            if _needs_confirmation(session, obj):
+                to_confirm.add(obj.id)
+        else:
+            staged[obj.id] = None
+            to_confirm.discard(obj.id)
+
+
+@event.listens_for(Session, "before_commit")
+def _confirm_staged_bookings(session):
+    """One overlap query per commit stands in for the per-request availability check"""
+    if not settings.availability_index_enabled or settings.booking_mode == "exclusion":
+        return
+    session.flush()
+    staged = session.info.get(_STAGED, {})
+    pending = [(reservation_id, staged[reservation_id]) for reservation_id in session.info.get(_TO_CONFIRM, ())
+               if staged.get(reservation_id)]
+    if not pending:
+        return
+
+    clash = session.execute(
+        select(Reservation.room_id)
+        .where(or_(*[
+            and_(
+                Reservation.id != reservation_id,
+                Reservation.room_id == room_id,
+                active_overlap(check_in, check_out),
+            )
+            for reservation_id, (room_id, check_in, check_out) in pending
+        ]))
+        .limit(1)
+    ).first()
+    if clash:
+        availability_index.invalidate(clash.room_id)
+        raise RoomUnavailableError(clash.room_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_staged_changes(session):
+    staged = session.info.pop(_STAGED, None)
+    session.info.pop(_TO_CONFIRM, None)
+    if staged and settings.availability_index_enabled:
+        availability_index.apply(staged)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_staged_changes(session):
+    session.info.pop(_STAGED, None)
+    session.info.pop(_TO_CONFIRM, None)
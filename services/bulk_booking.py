@@ -0,0 +1,93 @@
+from typing import Dict, List, Sequence, Tuple
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+from models.guests import Guest
+from models.reservations import Reservation
+from models.rooms import Room
+from schemas.reservations import ReservationBulkError, ReservationCreate
+from services.availability import ACTIVE_STATUSES, naive_local
+
+
+def plan_bulk_reservations(
+    db: Session, items: Sequence[ReservationCreate]
+) -> Tuple[List[Tuple[int, ReservationCreate, Room]], List[ReservationBulkError]]:
+    """Validate a batch of bookings with three queries in total.
+
+    Guests and rooms are fetched with one IN query each, and existing
+    bookings with one query bounded per room by the batch's date span.
+    Items are then checked in order against those bookings and against the
+    items already accepted, so two bookings in the same batch cannot overlap.
+    Returns the accepted (index, item, room) triples and per-item errors.
+    """
+    # The schemas already do this for request bodies; items built any other
+    # way must not bring aware datetimes into the comparisons below either
+    items = [
+        item.model_copy(update={
+            "check_in_date": naive_local(item.check_in_date),
+            "check_out_date": naive_local(item.check_out_date),
+        })
+        for item in items
+    ]
+    guest_ids = set(db.scalars(select(Guest.id).where(Guest.id.in_({item.guest_id for item in items}))))
+    rooms: Dict[int, Room] = {
+        room.id: room for room in db.scalars(select(Room).where(Room.id.in_({item.room_id for item in items})))
+    }
+
+    windows: Dict[int, List] = {}
+    for item in items:
+        if item.room_id in rooms:
+            low, high = windows.get(item.room_id, (item.check_in_date, item.check_out_date))
+            windows[item.room_id] = [min(low, item.check_in_date), max(high, item.check_out_date)]
+
+    booked: Dict[int, List[Tuple]] = {room_id: [] for room_id in windows}
+    if windows:
+        rows = db.execute(
+            select(Reservation.room_id, Reservation.check_in_date, Reservation.check_out_date)
+            .where(
+                Reservation.status.in_(ACTIVE_STATUSES),
+                Reservation.deleted_at.is_(None),
+                or_(*[
+                    and_(
+                        Reservation.room_id == room_id,
+                        Reservation.check_out_date > low,
+                        Reservation.check_in_date < high,
+                    )
+                    for room_id, (low, high) in windows.items()
+                ]),
+            )
+        )
+        for room_id, check_in, check_out in rows:
+            booked[room_id].append((check_in, check_out, None))
+
+    accepted = []
+    errors = []
+    for index, item in enumerate(items):
+        room = rooms.get(item.room_id)
+        if item.guest_id not in guest_ids:
+            errors.append(ReservationBulkError(index=index, detail="Guest not found"))
+            continue
+        if room is None:
+            errors.append(ReservationBulkError(index=index, detail="Room not found"))
+            continue
+        if item.number_of_guests > room.capacity:
+            errors.append(ReservationBulkError(
+                index=index, detail=f"Number of guests exceeds room capacity ({room.capacity})"
+            ))
+            continue
+
+        clash = next(
+            (other for check_in, check_out, other in booked[room.id]
+             if check_in < item.check_out_date and check_out > item.check_in_date),
+            False,
+        )
+        if clash is not False:
+            detail = "Room is not available for the selected dates"
+            if clash is not None:
+                detail += f" (conflicts with item {clash})"
+            errors.append(ReservationBulkError(index=index, detail=detail))
+            continue
+
+        booked[room.id].append((item.check_in_date, item.check_out_date, index))
+        accepted.append((index, item, room))
+
+    return accepted, errors
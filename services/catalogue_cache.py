@@ -0,0 +1,161 @@
+import hashlib
+import json
+from itertools import chain
+from typing import Any, Awaitable, Callable, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from cache import cache
+from config import settings
+from database import wrote_recently
+from metrics import COALESCED, route_template
+from models.reservations import Reservation
+from models.rooms import Room
+from services.single_flight import SingleFlight
+
+# Room lists and lookups change only when rooms change; availability
+# searches also change whenever a reservation does.
+ROOMS = "rooms"
+AVAILABILITY = "availability"
+
+_DIRTY = "catalogue_cache_dirty"
+
+# Execution option for statement writes whose caller marks the cache itself,
+# from the rows RETURNING reports changed (see mark_written)
+MARKED_BY_CALLER = "catalogue_marked_by_caller"
+
+# Keys embed the namespace generation, so a committed write starts new
+# flights rather than joining ones that began before it
+flights = SingleFlight(settings.coalesce_ttl_ms / 1000, settings.coalesce_wait_ms / 1000)
+
+
+def _request_key(request: Request) -> str:
+    return f"{request.url.path}?{sorted(request.query_params.multi_items())}"
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    return etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(","))
+
+
+def _respond(request: Request, etag: str, headers: dict, body: bytes) -> Response:
+    headers = {**headers, "ETag": etag, "Cache-Control": "no-cache"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def lookup(request: Request, namespace: str):
+    """Return ``(response, key)``: a cached response (or 304) if present, and
+    the resolved key to pass to ``store`` on a miss.
+
+    A client that wrote recently reads the primary (database.reads_from_replica),
+    but a cached body may have been filled from a replica still behind that
+    write. Such clients bypass the cache: the key is None and nothing is stored.
+    """
+    if wrote_recently(request):
+        return None, None
+    key = cache.key(namespace, _request_key(request))
+    entry = cache.get(key)
+    if entry is None:
+        return None, key
+    meta, body = entry.split(b"\n", 1)
+    meta = json.loads(meta)
+    return _respond(request, meta["etag"], meta["headers"], body), key
+
+
+def _store_entry(response: Response, key: Optional[str], adapter: TypeAdapter, content: Any) -> Tuple[str, dict, bytes]:
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    # Keep headers the handler set (e.g. X-Next-Cursor)
+    headers = {
+        name: value for name, value in response.headers.items()
+        if name.lower() not in ("content-length", "content-type")
+    }
+    if key is not None:
+        cache.set(key, json.dumps({"etag": etag, "headers": headers}).encode() + b"\n" + body)
+    return etag, headers, body
+
+
+def store(request: Request, response: Response, key: str, adapter: TypeAdapter, content: Any) -> Response:
+    """Serialize ``content`` through its response schema, cache it, and reply"""
+    return _respond(request, *_store_entry(response, key, adapter, content))
+
+
+def _coalesces(key: Optional[str]) -> bool:
+    # A client that just wrote has no key (see lookup): it reads the primary
+    # and never takes a result another request started before that write
+    return settings.coalesce_enabled and key is not None
+
+
+def _count(request: Request, shared: bool):
+    COALESCED.labels(route_template(request.scope), "follower" if shared else "leader").inc()
+
+
+def load_and_store(request: Request, response: Response, key: str, adapter: TypeAdapter, load: Callable[[], Any]) -> Response:
+    """On a miss, run ``load`` and ``store`` its result, once for all
+    concurrent identical requests.
+
+    Requests resolving to the same key while the query runs wait for it and
+    share its serialized body (each still gets its own 304 check), so a
+    burst of misses costs one query. ``load`` may set headers on
+    ``response``; they are shared too.
+    """
+    run = lambda: _store_entry(response, key, adapter, load())
+    if not _coalesces(key):
+        return _respond(request, *run())
+    entry, shared = flights.do(key, run)
+    _count(request, shared)
+    return _respond(request, *entry)
+
+
+async def load_and_store_async(request: Request, response: Response, key: str, adapter: TypeAdapter, load: Callable[[], Awaitable[Any]]) -> Response:
+    """``load_and_store`` for async handlers; ``load`` is a coroutine function"""
+    async def run():
+        return _store_entry(response, key, adapter, await load())
+    if not _coalesces(key):
+        return _respond(request, *await run())
+    entry, shared = await flights.do_async(key, run)
+    _count(request, shared)
+    return _respond(request, *entry)
+
+
+def _mark(session: Session, namespaces):
+    session.info.setdefault(_DIRTY, set()).update(namespaces)
+
+
+def mark_written(session: Session, model):
+    """Invalidate what a write to ``model`` changes once ``session`` commits"""
+    if model is Room:
+        _mark(session, (ROOMS, AVAILABILITY))
+    elif model is Reservation:
+        _mark(session, (AVAILABILITY,))
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed_writes(session, flush_context):
+    for obj in chain(session.new, session.dirty, session.deleted):
+        mark_written(session, type(obj))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    """Catch ORM-enabled INSERT/UPDATE/DELETE statements, which skip the flush"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.execution_options.get(MARKED_BY_CALLER):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        mark_written(orm_execute_state.session, mapper.class_)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for namespace in session.info.pop(_DIRTY, ()):
+        cache.invalidate(namespace)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_marks(session):
+    session.info.pop(_DIRTY, None)
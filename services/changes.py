@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.orm import Session
+from models.changes import current_xact_id, snapshot_xmin
+from models.guests import Guest
+from models.reservations import Reservation
+from models.rooms import Room
+
+TRACKED_MODELS = (Guest, Room, Reservation)
+
+
+def change_feed(
+    db: Session, model, columns: List, since_seq: int, since_id: int, updated_since: Optional[datetime], limit: int
+) -> Dict:
+    """One page of ``model``'s rows written after the ``(since_seq, since_id)``
+    cursor, oldest transaction first.
+
+    Each row appears once, in its latest state: live rows in full under
+    ``changes``, soft-deleted ones as tombstones. ``updated_since`` narrows
+    the page to rows last written at or after that time.
+
+    ``change_seq`` is the writing transaction's id, and ids are handed out
+    when a transaction first writes, not when it commits. Only ids below the
+    oldest transaction still running are served, so nothing can later commit
+    behind the cursor; a long-running write holds the feed back until it ends.
+    """
+    watermark = db.scalar(select(snapshot_xmin()))
+    stmt = (
+        select(*columns, model.deleted_at.label("_deleted_at"))
+        .where(
+            model.change_seq >= since_seq,
+            tuple_(model.change_seq, model.id) > tuple_(since_seq, since_id),
+            model.change_seq < watermark,
+        )
+        .order_by(model.change_seq, model.id)
+        .limit(limit + 1)
+        .execution_options(include_deleted=True)
+    )
+    if updated_since is not None:
+        stmt = stmt.where(model.updated_at >= updated_since)
+    rows = db.execute(stmt).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes, tombstones = [], []
+    for row in rows:
+        item = row._asdict()
+        deleted_at = item.pop("_deleted_at")
+        if deleted_at is None:
+            changes.append(item)
+        else:
+            tombstones.append({"id": item["id"], "change_seq": item["change_seq"], "deleted_at": deleted_at})
+    if has_more:
+        next_seq, next_id = rows[-1].change_seq, rows[-1].id
+    elif watermark > since_seq:
+        # Everything below the watermark has been served
+        next_seq, next_id = watermark, 0
+    else:
+        next_seq, next_id = since_seq, since_id
+    return {
+        "changes": changes,
+        "tombstones": tombstones,
+        "next_since_seq": next_seq,
+        "next_since_id": next_id,
+        "has_more": has_more,
+    }
+
+
+def backfill_change_seq(db: Session, batch_size: int = 5000) -> Dict[str, int]:
+    """Number rows written before change_seq existed, so the feeds can serve them.
+
+    ``updated_at`` is left as it was: those rows have no known write time.
+    """
+    counts = {}
+    for model in TRACKED_MODELS:
+        counts[model.__tablename__] = 0
+        pending = (
+            select(model.id)
+            .where(model.change_seq.is_(None))
+            .order_by(model.id)
+            .limit(batch_size)
+            .execution_options(include_deleted=True)
+        )
+        while True:
+            count = db.execute(
+                update(model)
+                .where(model.id.in_(pending))
+                .values(change_seq=current_xact_id(), updated_at=model.updated_at),
+                execution_options={"synchronize_session": False, "include_deleted": True},
+            ).rowcount
+            db.commit()
+            counts[model.__tablename__] += count
+            if count < batch_size:
+                break
+    return counts
@@ -0,0 +1,41 @@
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# Unique constraints the write handlers rely on, and the 400 each one maps to
+UNIQUE_VIOLATIONS = {
+    "ix_guests_email": "Email already registered",
+    "guests_id_number_key": "ID number already registered",
+    "ix_rooms_room_number": "Room number already exists",
+}
+
+
+def unique_violation_detail(exc: IntegrityError) -> Optional[str]:
+    """The handler message for a known unique constraint, or None"""
+    orig = exc.orig
+    # psycopg2 names the constraint in diag; asyncpg only in the message
+    name = getattr(getattr(orig, "diag", None), "constraint_name", None)
+    for constraint, detail in UNIQUE_VIOLATIONS.items():
+        if name == constraint or (name is None and f'"{constraint}"' in str(orig)):
+            return detail
+    return None
+
+
+def write_returning(db: Session, stmt):
+    """Execute an INSERT/UPDATE ... RETURNING and return its first row.
+
+    The unique constraints are the duplicate check: a violation rolls back
+    and becomes the same 400 the handlers used to raise after a SELECT.
+    """
+    try:
+        return db.execute(stmt).first()
+    except IntegrityError as exc:
+        db.rollback()
+        detail = unique_violation_detail(exc)
+        if detail is None:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        ) from exc
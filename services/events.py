@@ -0,0 +1,316 @@
+import asyncio
+import itertools
+import json
+import select as select_module
+import threading
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from config import settings
+from database import engine
+from models.events import event_sequence
+from logger import logger
+# Registers its before_commit booking check ahead of _notify_staged_events
+import services.availability_index  # noqa: F401
+
+# Postgres channel every worker LISTENs on
+CHANNEL = "hms_events"
+# NOTIFY payloads must stay under 8000 bytes
+_NOTIFY_LIMIT = 7900
+
+# Draws one sequence number per event and NOTIFYs the chunks, in one round
+# trip. Each chunk carries its events' numbers.
+_NUMBER_AND_NOTIFY = text(f"""
+    SELECT pg_notify(:channel, json_build_object('seqs', numbers.seqs, 'events', CAST(chunk.events AS json))::text)
+    FROM unnest(CAST(:chunks AS text[]), CAST(:sizes AS int[])) WITH ORDINALITY AS chunk(events, size, ordinal)
+    CROSS JOIN LATERAL (
+        SELECT array_agg(nextval('{event_sequence.name}') ORDER BY n) AS seqs
+        FROM generate_series(1, chunk.size) AS n
+    ) AS numbers
+    ORDER BY chunk.ordinal
+""")
+
+_STAGED = "events_staged"
+
+
+def room_event(room) -> Dict:
+    return {"id": room.id, "room_number": room.room_number, "status": room.status.value if room.status else None}
+
+
+def reservation_event(reservation, action: str) -> Dict:
+    return {
+        "id": reservation.id,
+        "action": action,
+        "room_id": reservation.room_id,
+        "status": reservation.status.value if reservation.status else None,
+        "check_in_date": reservation.check_in_date.isoformat(),
+        "check_out_date": reservation.check_out_date.isoformat(),
+    }
+
+
+def emit_event(session, kind: str, data: Dict):
+    """Stage an event on the session; it is published only if the transaction commits.
+
+    ``session`` may be a Session or an AsyncSession.
+    """
+    session = getattr(session, "sync_session", session)
+    session.info.setdefault(_STAGED, []).append((kind, data))
+
+
+class EventBroker:
+    """In-process fan-out of committed events to stream subscribers.
+
+    Events sit in a ring buffer of pre-encoded SSE frames, so a reconnecting
+    client resumes from its last sequence number as long as that is still
+    buffered. Subscribers hold no queue of their own: all of them await one
+    shared asyncio.Event that is swapped on each publish, so an idle
+    subscriber costs one parked coroutine, and a publish wakes each once.
+    Buffer state is only touched on
+    the event loop; other threads hand events over with publish_threadsafe.
+    """
+
+    def __init__(self, size: int):
+        self._buffer = deque(maxlen=size)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._local_seq = itertools.count(1)
+        self.last_seq = 0
+        # Highest sequence number that may have been missed: evicted from the
+        # ring, or published before this worker started listening
+        self._floor = 0
+        # Events that arrived ahead of a lower number, by sequence number
+        self._held: Dict[int, Dict] = {}
+        self._gap_timer: Optional[asyncio.TimerHandle] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._changed = asyncio.Event()
+        loop.call_soon(self._heartbeat)
+
+    def _heartbeat(self):
+        # One timer for all subscribers: a wake-up with nothing new makes each
+        # send a keep-alive, so none needs a timeout of its own
+        self._wake()
+        self._loop.call_later(settings.events_heartbeat_seconds, self._heartbeat)
+
+    def next_local_seq(self) -> int:
+        return next(self._local_seq)
+
+    def publish_threadsafe(self, events: List[Dict]):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._publish, events)
+
+    def reset_threadsafe(self, floor: int):
+        """Start over after events up to ``floor`` may have been missed (listener (re)connect)"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._reset, floor)
+
+    def _publish(self, events: List[Dict]):
+        """Buffer events strictly in sequence order.
+
+        An event arriving ahead of a lower number is held until that number
+        comes in, so a subscriber never moves past an event it has not been
+        sent. Numbers that never come (drawn by a transaction that then
+        failed to commit) are given up on after ``events_gap_timeout_seconds``.
+        """
+        for item in events:
+            if item["seq"] <= self.last_seq:
+                logger.warning(f"Dropped event {item['seq']}: it arrived after its gap was given up on")
+                continue
+            self._held[item["seq"]] = item
+        self._release()
+
+    def _release(self, skip_gap: bool = False):
+        released = False
+        while self._held:
+            seq = self.last_seq + 1
+            if seq not in self._held:
+                if not skip_gap:
+                    break
+                seq, skip_gap = min(self._held), False
+            item = self._held.pop(seq)
+            frame = f"id: {seq}\nevent: {item['type']}\ndata: {json.dumps(item['data'])}\n\n".encode()
+            if len(self._buffer) == self._buffer.maxlen:
+                self._floor = max(self._floor, self._buffer[0][0])
+            self._buffer.append((seq, frame))
+            self.last_seq = seq
+            released = True
+        if not self._held and self._gap_timer is not None:
+            self._gap_timer.cancel()
+            self._gap_timer = None
+        elif self._held and self._gap_timer is None and self._loop is not None:
+            self._gap_timer = self._loop.call_later(settings.events_gap_timeout_seconds, self._gap_expired)
+        if released:
+            self._wake()
+
+    def _gap_expired(self):
+        self._gap_timer = None
+        self._release(skip_gap=True)
+
+    def _reset(self, floor: int):
+        self._buffer.clear()
+        self._held.clear()
+        self._floor = self.last_seq = max(self.last_seq, floor)
+        self._release()
+        self._wake()
+
+    def _wake(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _frames_after(self, seq: int) -> Optional[List[bytes]]:
+        """Frames newer than ``seq``, or None if some of them may be missing"""
+        if seq < self._floor:
+            return None
+        if seq > self.last_seq and settings.events_backend == "local":
+            # A sequence number from before this process restarted
+            return None
+        frames = []
+        for item_seq, frame in reversed(self._buffer):
+            if item_seq <= seq:
+                break
+            frames.append(frame)
+        return frames[::-1]
+
+    async def subscribe(self, since: Optional[int] = None) -> AsyncIterator[bytes]:
+        """SSE frames from ``since`` on (from now when None), with keep-alive comments.
+
+        A client too far behind gets a ``reset`` event carrying the current
+        sequence number and should re-read the lists it mirrors.
+        """
+        last = self.last_seq if since is None else since
+        yield b"retry: 3000\n\n"
+        while True:
+            changed = self._changed
+            frames = self._frames_after(last)
+            if frames is None:
+                last = self.last_seq
+                yield f"id: {last}\nevent: reset\ndata: {json.dumps({'seq': last})}\n\n".encode()
+            elif frames:
+                last = max(last, self.last_seq)
+                yield b"".join(frames)
+            else:
+                await changed.wait()
+                if last == self.last_seq:
+                    yield b": keep-alive\n\n"
+
+
+event_broker = EventBroker(settings.events_buffer_size)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_staged_events(session):
+    """Number staged events and NOTIFY them inside the transaction, in one statement.
+
+    Postgres delivers notifications only on commit, so listeners never see
+    events of a rolled-back write. Numbers are drawn without a lock, so
+    concurrent transactions can commit out of number order; the broker holds
+    an early number back until the ones below it arrive (EventBroker._publish).
+    Importing availability_index first registers its before_commit check
+    ahead of this hook, so a booking clash rolls back before any number is
+    drawn and leaves no gap for the broker to wait out.
+    """
+    if settings.events_backend != "postgres":
+        return
+    session.flush()
+    staged = session.info.pop(_STAGED, None)
+    if not staged:
+        return
+    # chunks: JSON arrays of events; sizes: events in each
+    chunks, sizes, chunk, size = [], [], [], 2
+    for kind, data in staged:
+        encoded = json.dumps({"type": kind, "data": data})
+        # Leave room for the {"seqs": [...], "events": ...} wrapper, 20 digits a number
+        if chunk and size + len(encoded) + 22 > _NOTIFY_LIMIT - 64:
+            chunks.append(f"[{','.join(chunk)}]")
+            sizes.append(len(chunk))
+            chunk, size = [], 2
+        chunk.append(encoded)
+        size += len(encoded) + 22
+    chunks.append(f"[{','.join(chunk)}]")
+    sizes.append(len(chunk))
+    session.execute(_NUMBER_AND_NOTIFY, {"channel": CHANNEL, "chunks": chunks, "sizes": sizes})
+
+
+def _numbered(payload: Dict) -> List[Dict]:
+    """Events of one NOTIFY payload with their sequence numbers"""
+    return [{"seq": seq, **item} for seq, item in zip(payload["seqs"], payload["events"])]
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_staged_events(session):
+    """Local backend: hand committed events straight to this worker's broker"""
+    staged = session.info.pop(_STAGED, None)
+    if staged and settings.events_backend == "local":
+        event_broker.publish_threadsafe([
+            {"seq": event_broker.next_local_seq(), "type": kind, "data": data} for kind, data in staged
+        ])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_staged_events(session):
+    session.info.pop(_STAGED, None)
+
+
+class NotificationListener:
+    """Thread that LISTENs on ``CHANNEL`` over its own connection (outside the
+    pool) and feeds every notification to the broker, reconnecting on failure."""
+
+    def __init__(self, broker: EventBroker):
+        self.broker = broker
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="hms-event-listener", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _connect(self):
+        """Returns the connection and the sequence value as of LISTEN: events
+        numbered up to it were published before this worker could hear them."""
+        args, kwargs = engine.dialect.create_connect_args(engine.url)
+        connection = engine.dialect.connect(*args, **kwargs)
+        connection.autocommit = True
+        cursor = connection.cursor()
+        cursor.execute(f"LISTEN {CHANNEL}")
+        cursor.execute(f"SELECT last_value FROM {event_sequence.name}")
+        return connection, cursor.fetchone()[0]
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                connection, floor = self._connect()
+            except Exception:
+                logger.exception("Event listener could not connect")
+                self._stopped.wait(5)
+                continue
+            # Anything published while we were not listening is gone
+            self.broker.reset_threadsafe(floor)
+            try:
+                while not self._stopped.is_set():
+                    if select_module.select([connection], [], [], 5) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notification = connection.notifies.pop(0)
+                        self.broker.publish_threadsafe(_numbered(json.loads(notification.payload)))
+            except Exception:
+                logger.exception("Event listener lost its connection")
+            finally:
+                connection.close()
+
+
+listener = NotificationListener(event_broker)
+
+
+def start_event_stream(loop: asyncio.AbstractEventLoop):
+    event_broker.bind(loop)
+    if settings.events_backend == "postgres":
+        listener.start()
+
+
+def stop_event_stream():
+    listener.stop()
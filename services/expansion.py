@@ -0,0 +1,69 @@
+from typing import FrozenSet, List, Optional, Sequence
+from fastapi import HTTPException, status
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from models.reservations import Reservation
+from schemas.guests import GuestResponse
+from schemas.reservations import ReservationExpandedResponse, ReservationResponse
+from schemas.rooms import RoomResponse
+from services.fast_lists import response_columns
+
+EXPANDABLE = {
+    "room": (Reservation.room, RoomResponse),
+    "guest": (Reservation.guest, GuestResponse),
+}
+
+
+def parse_expand(expand: Optional[str]) -> FrozenSet[str]:
+    """Parse ?expand=room,guest"""
+    fields = frozenset(part.strip() for part in (expand or "").split(",") if part.strip())
+    unknown = fields - EXPANDABLE.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot expand {', '.join(sorted(unknown))}; choose from {', '.join(EXPANDABLE)}"
+        )
+    return fields
+
+
+def expand_options(fields: FrozenSet[str], many: bool = False):
+    """Eager-load options: one JOIN for a single row, one IN query per relation for lists"""
+    loader = selectinload if many else joinedload
+    return [loader(EXPANDABLE[field][0]) for field in sorted(fields)]
+
+
+def expanded(reservation: Reservation, fields: FrozenSet[str]) -> ReservationExpandedResponse:
+    """Build the response explicitly so unrequested relations are never touched (or lazy-loaded).
+
+    Endpoints set ``response_model_exclude_unset=True`` so unexpanded keys are omitted.
+    """
+    data = ReservationResponse.model_validate(reservation).model_dump()
+    for field in fields:
+        related = getattr(reservation, field)
+        data[field] = EXPANDABLE[field][1].model_validate(related) if related is not None else None
+    return ReservationExpandedResponse(**data)
+
+
+def expanded_rows(db: Session, rows: Sequence[Row], fields: FrozenSet[str]) -> List[dict]:
+    """Response dicts for reservation rows selected with ``response_columns``.
+
+    Each requested relation costs one IN query on its columns; soft-deleted
+    rooms and guests are included, as they are when loaded through the
+    relationship.
+    """
+    items = [row._asdict() for row in rows]
+    for field, (relationship, schema) in EXPANDABLE.items():
+        if field not in fields:
+            continue
+        model = relationship.property.mapper.class_
+        key = f"{field}_id"
+        ids = {item[key] for item in items}
+        related = {
+            row.id: row._asdict()
+            for row in db.execute(
+                select(*response_columns(model, schema)).where(model.id.in_(ids)).execution_options(include_deleted=True)
+            )
+        } if ids else {}
+        for item in items:
+            item[field] = related.get(item[key])
+    return items
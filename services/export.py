@@ -0,0 +1,49 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Sequence
+from database import SessionLocal
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def stream_export(stmt, columns: Sequence[str], fmt: str, batch_size: int = 1000) -> Iterator[str]:
+    """Stream the rows of a column SELECT as NDJSON or CSV.
+
+    ``yield_per`` makes the driver use a server-side cursor, so only one
+    batch of rows is in memory no matter how large the result is. Rows are
+    plain tuples rather than ORM entities, so the identity map never grows.
+    The generator opens its own session because it outlives the request handler.
+    """
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(columns)
+        for partition in result.partitions():
+            for row in partition:
+                values = [_plain(value) for value in row]
+                if fmt == "csv":
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, values))))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
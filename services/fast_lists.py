@@ -0,0 +1,27 @@
+from typing import Any, List, Optional, Type
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def response_columns(model, schema: Type[BaseModel]) -> List:
+    """Columns of ``model`` backing ``schema``'s fields, in the schema's field order.
+
+    Selecting these returns rows whose ``_asdict()`` is already the response
+    body, key order included, so no ORM objects are built and nothing is
+    validated on the way out.
+    """
+    columns = model.__table__.columns
+    return [getattr(model, name) for name in schema.model_fields if name in columns]
+
+
+def list_response(content: List[Any], response: Optional[Response] = None) -> ORJSONResponse:
+    """Serialize row dicts straight to JSON, skipping response_model validation.
+
+    Returning a Response bypasses FastAPI's handling of the injected
+    ``response``, so headers set on it (e.g. X-Next-Cursor) are copied over.
+    """
+    json_response = ORJSONResponse(content)
+    if response is not None:
+        json_response.raw_headers.extend(response.headers.raw)
+    return json_response
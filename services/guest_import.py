@@ -0,0 +1,163 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models.changes import current_xact_id
+from models.guests import Guest
+from schemas.guests import GuestCreate
+
+GUEST_COLUMNS = ("first_name", "last_name", "email", "phone", "address", "id_number", "created_at", "updated_at")
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[Dict]:
+    """Parse CSV (with a header row) or NDJSON one line at a time"""
+    if fmt == "csv":
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield {"_parse_error": str(exc)}
+
+
+def _csv_row(values) -> str:
+    """One COPY csv line: None as an unquoted empty cell, which COPY reads as
+    NULL, and every other value quoted, which it reads as text even when empty"""
+    return ",".join(
+        "" if value is None else '"' + str(value).replace('"', '""') + '"' for value in values
+    ) + "\n"
+
+
+def _copy_rows(db: Session, rows: List[Dict]):
+    """Load a chunk with COPY ... FROM STDIN on the session's psycopg2 connection"""
+    # COPY skips the change_seq default SQLAlchemy adds to INSERTs: stamp it here
+    change_seq = db.scalar(select(current_xact_id()))
+    buffer = io.StringIO("".join(
+        _csv_row([*(row[column] for column in GUEST_COLUMNS), change_seq]) for row in rows
+    ))
+    cursor = db.connection().connection.driver_connection.cursor()
+    cursor.copy_expert(
+        f"COPY guests ({', '.join(GUEST_COLUMNS)}, change_seq) FROM STDIN WITH (FORMAT csv)", buffer
+    )
+
+
+def _load_chunk(db: Session, rows: List[Dict]) -> List[Dict]:
+    """Insert a deduplicated chunk; return rows lost to a concurrent writer"""
+    try:
+        with db.begin_nested():
+            if db.get_bind().dialect.driver == "psycopg2":
+                _copy_rows(db, rows)
+            else:
+                db.execute(pg_insert(Guest), rows)
+        return []
+    except IntegrityError:
+        # Someone registered one of these guests since the batch check: keep the rest
+        inserted = set(db.scalars(
+            pg_insert(Guest).values(rows).on_conflict_do_nothing().returning(Guest.email)
+        ))
+        return [row for row in rows if row["email"] not in inserted]
+
+
+def import_guests(db: Session, records: Iterable[Dict], batch_size: int = 1000) -> Iterator[Dict]:
+    """Validate, deduplicate and load guests chunk by chunk.
+
+    Yields ``reject`` events for rows that fail ``GuestCreate`` validation or
+    duplicate an earlier row or an existing guest, a ``progress`` event per
+    committed chunk, and a final ``done`` event. Only one chunk, plus the
+    emails and ID numbers seen so far, is held in memory.
+    """
+    seen_emails = set()
+    seen_ids = set()
+    processed = inserted = rejected = 0
+    chunk: List[Dict] = []
+    chunk_rows: List[int] = []
+
+    def flush_chunk():
+        nonlocal inserted, rejected
+        if not chunk:
+            return []
+        events = []
+        # Soft-deleted guests still hold their email and ID number in the unique constraints
+        existing = db.execute(
+            select(Guest.email, Guest.id_number).where(or_(
+                Guest.email.in_([row["email"] for row in chunk]),
+                Guest.id_number.in_([row["id_number"] for row in chunk]),
+            )).execution_options(include_deleted=True)
+        ).all()
+        taken_emails = {email for email, _ in existing}
+        taken_ids = {id_number for _, id_number in existing}
+
+        fresh = {}
+        for row_number, row in zip(chunk_rows, chunk):
+            if row["email"] in taken_emails:
+                events.append(_reject(row_number, "Email already registered"))
+            elif row["id_number"] in taken_ids:
+                events.append(_reject(row_number, "ID number already registered"))
+            else:
+                fresh[row["email"]] = (row_number, row)
+        if fresh:
+            lost = _load_chunk(db, [row for _, row in fresh.values()])
+            events.extend(
+                _reject(fresh[row["email"]][0], "Email or ID number already registered") for row in lost
+            )
+            inserted += len(fresh) - len(lost)
+        db.commit()
+        rejected += len(events)
+        chunk.clear()
+        chunk_rows.clear()
+        events.append({"type": "progress", "processed": processed, "inserted": inserted, "rejected": rejected})
+        return events
+
+    for row_number, record in enumerate(records, start=1):
+        processed += 1
+        guest = _validate(record)
+        if isinstance(guest, str):
+            rejected += 1
+            yield _reject(row_number, guest)
+            continue
+        if guest.email in seen_emails:
+            rejected += 1
+            yield _reject(row_number, "Duplicate email in file")
+            continue
+        if guest.id_number in seen_ids:
+            rejected += 1
+            yield _reject(row_number, "Duplicate ID number in file")
+            continue
+        seen_emails.add(guest.email)
+        seen_ids.add(guest.id_number)
+
+        now = datetime.now()
+        chunk.append({**guest.model_dump(), "created_at": now, "updated_at": now})
+        chunk_rows.append(row_number)
+        if len(chunk) >= batch_size:
+            yield from flush_chunk()
+
+    yield from flush_chunk()
+    yield {"type": "done", "processed": processed, "inserted": inserted, "rejected": rejected}
+
+
+def _validate(record: Dict):
+    """GuestCreate on success, otherwise a readable error string"""
+    if isinstance(record, dict) and "_parse_error" in record:
+        return f"Invalid JSON: {record['_parse_error']}"
+    if not isinstance(record, dict):
+        return "Expected a JSON object"
+    # CSV leaves missing optional cells as empty strings
+    record = {key: (value if value != "" else None) for key, value in record.items() if key}
+    try:
+        return GuestCreate(**record)
+    except ValidationError as exc:
+        return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in exc.errors())
+
+
+def _reject(row: int, detail: str) -> Dict:
+    return {"type": "reject", "row": row, "detail": detail}
@@ -0,0 +1,238 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import Dict, List
+from sqlalchemy import event, func, inspect, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from models.inventory import RoomInventory
+from models.reservations import Reservation
+from models.rooms import Room, RoomType
+from services.availability import ACTIVE_STATUSES
+
+_inventory = RoomInventory.__table__
+
+# Attributes whose change can move a reservation's or room's counters
+_STAY_ATTRIBUTES = ("room_id", "check_in_date", "check_out_date", "status", "deleted_at")
+_ROOM_ATTRIBUTES = ("room_type", "deleted_at")
+
+
+def _day(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _nights(check_in, check_out):
+    night, last = _day(check_in), _day(check_out)
+    while night < last:
+        yield night
+        night += timedelta(days=1)
+
+
+def _before(obj, attribute):
+    """Value of ``attribute`` as of the last load, before this flush"""
+    history = inspect(obj).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, attribute)
+
+
+def _changed(obj, attributes) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+def _holds(status, deleted_at) -> bool:
+    return status in ACTIVE_STATUSES and deleted_at is None
+
+
+def room_totals(connection) -> Dict[RoomType, int]:
+    return dict(connection.execute(
+        select(Room.room_type, func.count()).where(Room.deleted_at.is_(None)).group_by(Room.room_type)
+    ).all())
+
+
+def apply_inventory_deltas(connection, sold: Counter, totals: Counter = None):
+    """Apply ``(room_type, night) -> change`` to ``sold`` and
+    ``room_type -> change`` to ``total`` of today's and later nights.
+
+    Totals go first so rows created here pick up the room count as of
+    this transaction exactly once. Rows are upserted in key order so
+    concurrent bookings lock them in the same order.
+    """
+    for room_type, change in sorted((totals or {}).items(), key=lambda item: item[0].name):
+        if change:
+            connection.execute(
+                update(_inventory)
+                .where(_inventory.c.room_type == room_type, _inventory.c.night >= func.current_date())
+                .values(total=_inventory.c.total + change)
+            )
+    rows = [
+        (room_type, night, change)
+        for (room_type, night), change in sorted(sold.items(), key=lambda item: (item[0][0].name, item[0][1]))
+        if change
+    ]
+    if not rows:
+        return
+    current_totals = room_totals(connection)
+    stmt = pg_insert(_inventory).values([
+        {"room_type": room_type, "night": night, "total": current_totals.get(room_type, 0), "sold": change}
+        for room_type, night, change in rows
+    ])
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=[_inventory.c.room_type, _inventory.c.night],
+        set_={"sold": _inventory.c.sold + stmt.excluded.sold},
+    ))
+
+
+def _room_deltas(connection, room_id: int, before, after, sold: Counter, totals: Counter):
+    """Add the counter changes of a room going from ``before`` to ``after``,
+    each ``(room_type, live)`` or None when the row does not exist."""
+    if before and before[1]:
+        totals[before[0]] -= 1
+    if after and after[1]:
+        totals[after[0]] += 1
+    if before and after and before[0] != after[0]:
+        # The room's existing bookings now count against its new type
+        held = connection.execute(
+            select(Reservation.check_in_date, Reservation.check_out_date).where(
+                Reservation.room_id == room_id,
+                Reservation.status.in_(ACTIVE_STATUSES),
+                Reservation.deleted_at.is_(None),
+            )
+        )
+        for check_in, check_out in held:
+            for night in _nights(check_in, check_out):
+                sold[(before[0], night)] -= 1
+                sold[(after[0], night)] += 1
+
+
+def apply_room_change(connection, room_id: int, before, after):
+    """Move the counters for a room write that bypassed the flush
+    (INSERT/UPDATE ... RETURNING); see ``_room_deltas`` for the arguments."""
+    sold, totals = Counter(), Counter()
+    _room_deltas(connection, room_id, before, after, sold, totals)
+    apply_inventory_deltas(connection, sold, totals)
+
+
+def apply_stay_deltas(connection, stays):
+    """Move the counters for reservation writes that bypassed the flush,
+    given as ``(room_type, check_in, check_out, +1/-1)``."""
+    sold = Counter()
+    for room_type, check_in, check_out, change in stays:
+        for night in _nights(check_in, check_out):
+            sold[(room_type, night)] += change
+    apply_inventory_deltas(connection, sold)
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_writes(session, flush_context):
+    """Move the counters by the difference each flushed row makes, in the same transaction"""
+    connection = session.connection()
+    sold, totals = Counter(), Counter()
+    stays = []  # (room_id, check_in, check_out, +1/-1)
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if obj in session.dirty and not _changed(obj, _ROOM_ATTRIBUTES if isinstance(obj, Room) else _STAY_ATTRIBUTES):
+            continue
+        if isinstance(obj, Reservation):
+            if obj not in session.new and _holds(_before(obj, "status"), _before(obj, "deleted_at")):
+                stays.append((
+                    _before(obj, "room_id"), _before(obj, "check_in_date"), _before(obj, "check_out_date"), -1
+                ))
+            if obj not in session.deleted and _holds(obj.status, obj.deleted_at):
+                stays.append((obj.room_id, obj.check_in_date, obj.check_out_date, 1))
+        elif isinstance(obj, Room):
+            before = None if obj in session.new else (_before(obj, "room_type"), _before(obj, "deleted_at") is None)
+            after = None if obj in session.deleted else (obj.room_type, obj.deleted_at is None)
+            _room_deltas(connection, obj.id, before, after, sold, totals)
+
+    if stays:
+        room_types = dict(connection.execute(
+            select(Room.id, Room.room_type).where(Room.id.in_({room_id for room_id, _, _, _ in stays}))
+        ).all())
+        for room_id, check_in, check_out, change in stays:
+            for night in _nights(check_in, check_out):
+                sold[(room_types[room_id], night)] += change
+
+    apply_inventory_deltas(connection, sold, totals)
+
+
+def inventory_grid(db: Session, start: date, end: date) -> List[Dict]:
+    """Total, sold and available rooms per type for each night in [start, end).
+
+    Nights with no counter row have nothing sold and the current room count.
+    """
+    counters = {
+        (row.night, row.room_type): row
+        for row in db.execute(
+            select(_inventory).where(_inventory.c.night >= start, _inventory.c.night < end)
+        )
+    }
+    current_totals = room_totals(db)
+    grid = []
+    for offset in range((end - start).days):
+        night = start + timedelta(days=offset)
+        rooms = {}
+        for room_type in RoomType:
+            row = counters.get((night, room_type))
+            total, sold = (row.total, row.sold) if row else (current_totals.get(room_type, 0), 0)
+            rooms[room_type] = {"total": total, "sold": sold, "available": max(total - sold, 0)}
+        grid.append({"night": night, "rooms": rooms})
+    return grid
+
+
+_EXPECTED = f"""
+    WITH expected_sold AS (
+        SELECT rm.room_type, n::date AS night, count(*) AS sold
+        FROM reservations r
+        JOIN rooms rm ON rm.id = r.room_id
+        CROSS JOIN LATERAL generate_series(
+            r.check_in_date::date, r.check_out_date::date - 1, interval '1 day'
+        ) AS n
+        WHERE r.status IN ({", ".join(f"'{s.name}'" for s in ACTIVE_STATUSES)})
+          AND r.deleted_at IS NULL
+        GROUP BY 1, 2
+    ), expected_total AS (
+        SELECT room_type, count(*) AS total FROM rooms WHERE deleted_at IS NULL GROUP BY 1
+    )
+    SELECT coalesce(e.room_type, i.room_type) AS room_type,
+           coalesce(e.night, i.night) AS night,
+           coalesce(e.sold, 0) AS expected_sold,
+           i.sold,
+           coalesce(t.total, 0) AS expected_total,
+           i.total
+    FROM expected_sold e
+    FULL JOIN room_inventory i ON i.room_type = e.room_type AND i.night = e.night
+    LEFT JOIN expected_total t ON t.room_type = coalesce(e.room_type, i.room_type)
+    WHERE coalesce(e.sold, 0) <> coalesce(i.sold, 0)
+       OR (coalesce(e.night, i.night) >= CURRENT_DATE AND i.total <> coalesce(t.total, 0))
+    ORDER BY 2, 1
+"""
+
+
+def check_inventory(db: Session, fix: bool = False) -> List[Dict]:
+    """Reconcile the counters against ``reservations`` and ``rooms``.
+
+    Returns one entry per drifted (room_type, night). With ``fix`` the
+    counters are overwritten with the expected values and committed.
+    Totals are only checked from today on; past nights keep the room
+    count they had.
+    """
+    drift = [dict(row) for row in db.execute(text(_EXPECTED)).mappings()]
+    if fix and drift:
+        for row in drift:
+            today = row["night"] >= date.today()
+            stmt = pg_insert(_inventory).values(
+                room_type=RoomType[row["room_type"]],
+                night=row["night"],
+                total=row["expected_total"] if today or row["total"] is None else row["total"],
+                sold=row["expected_sold"],
+            )
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[_inventory.c.room_type, _inventory.c.night],
+                set_={"total": stmt.excluded.total, "sold": stmt.excluded.sold},
+            ))
+        db.commit()
+    return drift
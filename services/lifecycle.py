@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+from sqlalchemy import case, exists, literal, or_, select, update
+from sqlalchemy.orm import Session
+from database import SessionLocal
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus
+from services.availability_index import availability_index
+from services.catalogue_cache import MARKED_BY_CALLER, mark_written
+from services.events import emit_event, room_event
+from services.inventory import apply_stay_deltas
+from config import settings
+from logger import logger
+
+def _status(value: RoomStatus):
+    return literal(value, Room.status.type)
+
+
+def derived_room_status(now: datetime):
+    """Status a room should show, from its live reservations at ``now``:
+    occupied while a stay is checked in, reserved while a pending or
+    confirmed stay has not ended, available otherwise."""
+    live = (Reservation.room_id == Room.id, Reservation.deleted_at.is_(None))
+    occupied = exists().where(*live, Reservation.status == ReservationStatus.CHECKED_IN)
+    reserved = exists().where(
+        *live,
+        Reservation.status.in_([ReservationStatus.PENDING, ReservationStatus.CONFIRMED]),
+        Reservation.check_out_date > now,
+    )
+    return case(
+        (occupied, _status(RoomStatus.OCCUPIED)),
+        (reserved, _status(RoomStatus.RESERVED)),
+        else_=_status(RoomStatus.AVAILABLE),
+    )
+
+
+def reconcile_room_statuses(db: Session, room_ids: Optional[Iterable[int]] = None, now: Optional[datetime] = None) -> int:
+    """Recompute ``Room.status`` for ``room_ids`` (every room when None) in one UPDATE.
+
+    Rooms under maintenance keep their flag, and rooms already showing the
+    right status are not written. Each change is emitted to the event
+    stream, and the room caches are invalidated only when a row changed.
+    Returns the number of rooms changed.
+    """
+    new_status = derived_room_status(now or datetime.now())
+    stmt = update(Room).where(
+        Room.status.is_distinct_from(RoomStatus.MAINTENANCE),
+        Room.status.is_distinct_from(new_status),
+    )
+    if room_ids is not None:
+        stmt = stmt.where(Room.id.in_(room_ids))
+    changed = db.execute(
+        stmt.values(status=new_status).returning(Room.id, Room.room_number, Room.status),
+        execution_options={"synchronize_session": False, MARKED_BY_CALLER: True},
+    ).all()
+    if changed:
+        mark_written(db, Room)
+    for room in changed:
+        emit_event(db, "room", room_event(room))
+    return len(changed)
+
+
+def _claim(condition, batch_size: int):
+    """Ids of the next batch of live reservations matching ``condition``, locked
+    with SKIP LOCKED so concurrent runs take disjoint batches"""
+    return (
+        select(Reservation.id)
+        .where(Reservation.deleted_at.is_(None), condition)
+        .order_by(Reservation.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def cancel_stale_pending(db: Session, now: datetime, batch_size: int) -> int:
+    """Cancel PENDING reservations never confirmed: held longer than
+    ``pending_hold_hours`` or past their check-in by ``no_show_grace_hours``.
+
+    Each batch is one UPDATE ... RETURNING, committed with its inventory
+    counters and room flags.
+    """
+    stale = (Reservation.status == ReservationStatus.PENDING) & or_(
+        Reservation.created_at < now - timedelta(hours=settings.pending_hold_hours),
+        Reservation.check_in_date < now - timedelta(hours=settings.no_show_grace_hours),
+    )
+    cancelled = 0
+    while True:
+        rows = db.execute(
+            update(Reservation)
+            .where(Reservation.id.in_(_claim(stale, batch_size)))
+            .values(status=ReservationStatus.CANCELLED, updated_at=now)
+            .returning(
+                Reservation.id, Reservation.room_id, Reservation.check_in_date, Reservation.check_out_date,
+                select(Room.room_type).where(Room.id == Reservation.room_id).scalar_subquery(),
+            ),
+            execution_options={"synchronize_session": False},
+        ).all()
+        if rows:
+            # A statement write skips the flush hooks: move the counters and flags here
+            apply_stay_deltas(db, [(room_type, check_in, check_out, -1) for _, _, check_in, check_out, room_type in rows])
+            reconcile_room_statuses(db, sorted({row.room_id for row in rows}), now)
+        db.commit()
+        availability_index.apply({row.id: None for row in rows})
+        cancelled += len(rows)
+        if len(rows) < batch_size:
+            return cancelled
+
+
+def flag_overdue_checkouts(db: Session, now: datetime, batch_size: int) -> int:
+    """Stamp ``overdue_at`` on checked-in stays past their check-out by ``checkout_grace_minutes``"""
+    overdue = (
+        (Reservation.status == ReservationStatus.CHECKED_IN)
+        & Reservation.overdue_at.is_(None)
+        & (Reservation.check_out_date < now - timedelta(minutes=settings.checkout_grace_minutes))
+    )
+    flagged = 0
+    while True:
+        count = db.execute(
+            update(Reservation)
+            .where(Reservation.id.in_(_claim(overdue, batch_size)))
+            .values(overdue_at=now),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        db.commit()
+        flagged += count
+        if count < batch_size:
+            return flagged
+
+
+def run_lifecycle(db: Session, batch_size: int) -> Dict[str, int]:
+    """Cancel stale holds, flag overdue check-outs, then reconcile every room's flag"""
+    now = datetime.now()
+    counts = {
+        "cancelled": cancel_stale_pending(db, now, batch_size),
+        "overdue": flag_overdue_checkouts(db, now, batch_size),
+    }
+    # Catches flags that drift with time alone, e.g. a stay ending or a no-show
+    counts["rooms_updated"] = reconcile_room_statuses(db, now=now)
+    db.commit()
+    return counts
+
+
+def run_room_status_job():
+    """Scheduler entry point: bring every room's flag in line with its
+    reservations, so booking writes never pay for it"""
+    with SessionLocal() as db:
+        changed = reconcile_room_statuses(db)
+        if changed:
+            db.commit()
+    if changed:
+        logger.info(f"Room statuses reconciled: {changed} changed")
+
+
+def run_lifecycle_job():
+    """Scheduler entry point, configured by the lifecycle settings"""
+    with SessionLocal() as db:
+        counts = run_lifecycle(db, settings.lifecycle_batch_size)
+    if any(counts.values()):
+        logger.info(f"Reservation lifecycle: {counts}")
@@ -0,0 +1,117 @@
+from datetime import date, datetime
+from typing import Sequence, Tuple
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from models.rates import RateOverride, RateRule, RateRuleKind
+from models.rooms import Room, RoomType
+
+# Row of each room type in the calendar's factor matrix
+TYPE_INDEX = {room_type: index for index, room_type in enumerate(RoomType)}
+
+
+def _ordinal(value) -> int:
+    return (value.date() if isinstance(value, datetime) else value).toordinal()
+
+
+def _ordinals(values) -> np.ndarray:
+    return np.fromiter((_ordinal(value) for value in values), dtype=np.int64, count=len(values))
+
+
+def _type_rows(room_type):
+    return slice(None) if room_type is None else TYPE_INDEX[room_type]
+
+
+class RateCalendar:
+    """Nightly price multipliers per room type over [first, first + days).
+
+    ``cumulative[t, d]`` is the sum of type t's multipliers before night d,
+    so any stay's nightly total is a difference of two lookups.
+    """
+
+    def __init__(self, first: int, days: int, factors: np.ndarray, stay_rules: Sequence[RateRule]):
+        self.first = first
+        self.days = days
+        self.cumulative = np.zeros((len(TYPE_INDEX), days + 1))
+        np.cumsum(factors, axis=1, out=self.cumulative[:, 1:])
+        # Ascending min_nights, so the longest qualifying rule is applied last
+        self.stay_rules = sorted(stay_rules, key=lambda rule: rule.min_nights or 0)
+
+    def price(self, base: np.ndarray, types: np.ndarray, check_ins: np.ndarray, check_outs: np.ndarray) -> np.ndarray:
+        """Totals for stays given as broadcastable arrays of base price,
+        type row and check-in/check-out ordinals."""
+        start = check_ins - self.first
+        end = check_outs - self.first
+        totals = base * (self.cumulative[types, end] - self.cumulative[types, start])
+        nights = check_outs - check_ins
+        discount = np.ones(np.broadcast(types, nights).shape)
+        for rule in self.stay_rules:
+            applies = nights >= (rule.min_nights or 0)
+            if rule.room_type is not None:
+                applies = applies & (types == TYPE_INDEX[rule.room_type])
+            if rule.valid_from is not None:
+                applies = applies & (check_ins >= rule.valid_from.toordinal())
+            if rule.valid_to is not None:
+                applies = applies & (check_ins < rule.valid_to.toordinal())
+            discount[np.broadcast_to(applies, discount.shape)] = rule.multiplier
+        return np.round(totals * discount, 2)
+
+
+def load_calendar(db: Session, first: int, last: int) -> RateCalendar:
+    """Build the calendar for nights [first, last) (date ordinals) with two queries"""
+    days = max(last - first, 0)
+    start, end = date.fromordinal(first), date.fromordinal(last)
+    factors = np.ones((len(TYPE_INDEX), days))
+
+    rules = db.scalars(select(RateRule).where(
+        or_(RateRule.valid_from.is_(None), RateRule.valid_from < end),
+        or_(RateRule.valid_to.is_(None), RateRule.valid_to > start),
+    )).all()
+    if days:
+        night_ordinals = np.arange(first, last)
+        # date.weekday() of each night: ordinal 1 (0001-01-01) was a Monday
+        weekdays = (night_ordinals - 1) % 7
+        for rule in rules:
+            if rule.kind != RateRuleKind.WEEKDAY or not rule.weekdays:
+                continue
+            nights = np.isin(weekdays, [int(day) for day in rule.weekdays.split(",")])
+            if rule.valid_from is not None:
+                nights &= night_ordinals >= rule.valid_from.toordinal()
+            if rule.valid_to is not None:
+                nights &= night_ordinals < rule.valid_to.toordinal()
+            factors[_type_rows(rule.room_type), nights] *= rule.multiplier
+
+        overrides = db.execute(
+            select(RateOverride.room_type, RateOverride.night, RateOverride.multiplier)
+            .where(RateOverride.night >= start, RateOverride.night < end)
+        ).all()
+        if overrides:
+            rows = np.array([TYPE_INDEX[room_type] for room_type, _, _ in overrides])
+            columns = np.array([night.toordinal() - first for _, night, _ in overrides])
+            factors[rows, columns] *= np.array([multiplier for _, _, multiplier in overrides])
+
+    stay_rules = [rule for rule in rules if rule.kind == RateRuleKind.LENGTH_OF_STAY]
+    return RateCalendar(first, days, factors, stay_rules)
+
+
+def quote_matrix(db: Session, rooms: Sequence[Room], stays: Sequence[Tuple]) -> np.ndarray:
+    """Price every room for every (check_in, check_out) stay: shape (rooms, stays)"""
+    check_ins, check_outs = _ordinals([stay[0] for stay in stays]), _ordinals([stay[1] for stay in stays])
+    calendar = load_calendar(db, int(check_ins.min()), int(check_outs.max()))
+    base = np.array([room.price for room in rooms], dtype=float)[:, None]
+    types = np.array([TYPE_INDEX[room.room_type] for room in rooms])[:, None]
+    return calendar.price(base, types, check_ins[None, :], check_outs[None, :])
+
+
+def quote_stays(db: Session, rooms: Sequence[Room], stays: Sequence[Tuple]) -> np.ndarray:
+    """Price ``rooms[i]`` for ``stays[i]``: shape (len(rooms),)"""
+    check_ins, check_outs = _ordinals([stay[0] for stay in stays]), _ordinals([stay[1] for stay in stays])
+    calendar = load_calendar(db, int(check_ins.min()), int(check_outs.max()))
+    base = np.array([room.price for room in rooms], dtype=float)
+    types = np.array([TYPE_INDEX[room.room_type] for room in rooms])
+    return calendar.price(base, types, check_ins, check_outs)
+
+
+def quote_price(db: Session, room: Room, check_in: datetime, check_out: datetime) -> float:
+    """Total price of one stay, through the same engine as POST /quotes"""
+    return float(quote_stays(db, [room], [(check_in, check_out)])[0])
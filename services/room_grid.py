@@ -0,0 +1,89 @@
+import base64
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models.reservations import Reservation
+from models.rooms import Room, RoomType
+from services.availability import active_overlap
+
+def _day(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def build_bitsets(
+    room_ids: List[int], stays: Iterable[Tuple[int, date, date]], start: date, days: int
+) -> List[int]:
+    """One int per room with bit ``d`` set when the room is held on ``start + d``.
+
+    Each stay sets its clipped range of bits with a single shift-and-OR.
+    """
+    position = {room_id: index for index, room_id in enumerate(room_ids)}
+    bits = [0] * len(room_ids)
+    for room_id, check_in, check_out in stays:
+        index = position.get(room_id)
+        if index is None:
+            continue
+        low = max((_day(check_in) - start).days, 0)
+        high = min((_day(check_out) - start).days, days)
+        if high > low:
+            bits[index] |= ((1 << (high - low)) - 1) << low
+    return bits
+
+
+def encode_bitmap(bits: int, days: int) -> str:
+    """Base64 of the bitset, little-endian: day ``d`` is bit ``d % 8`` of byte ``d // 8``"""
+    return base64.b64encode(bits.to_bytes((days + 7) // 8, "little")).decode()
+
+
+def encode_runs(bits: int, days: int) -> List[int]:
+    """Alternating run lengths starting with free days: [2, 3, 85] is
+    2 free, 3 held, 85 free. A leading 0 means the window starts held."""
+    runs = []
+    position, held = 0, False
+    while position < days:
+        rest = bits >> position
+        if held:
+            # Length of the run of ones at the bottom of rest
+            length = ((~rest) & (rest + 1)).bit_length() - 1
+        else:
+            length = (rest & -rest).bit_length() - 1 if rest else days - position
+        length = min(length, days - position)
+        runs.append(length)
+        position += length
+        held = not held
+    return runs
+
+
+def room_grid(
+    db: Session, start: date, days: int, encoding: str = "bitmap", room_type: Optional[RoomType] = None
+) -> Dict:
+    """Occupancy of every room for ``days`` nights from ``start``, in two queries.
+
+    Returned column-wise: ``room_ids[i]`` and ``room_numbers[i]`` describe
+    the room whose encoded occupancy is ``occupancy[i]``.
+    """
+    rooms_query = select(Room.id, Room.room_number).where(Room.deleted_at.is_(None)).order_by(Room.id)
+    if room_type:
+        rooms_query = rooms_query.where(Room.room_type == room_type)
+    rooms = db.execute(rooms_query).all()
+    room_ids = [room.id for room in rooms]
+
+    window_start = datetime.combine(start, datetime.min.time())
+    window_end = window_start + timedelta(days=days)
+    stays_query = select(Reservation.room_id, Reservation.check_in_date, Reservation.check_out_date).where(
+        active_overlap(window_start, window_end)
+    )
+    if room_type:
+        stays_query = stays_query.join(Room, Room.id == Reservation.room_id).where(Room.room_type == room_type)
+    bits = build_bitsets(room_ids, db.execute(stays_query), start, days)
+
+    encode = encode_runs if encoding == "rle" else encode_bitmap
+    return {
+        "start": start,
+        "days": days,
+        "encoding": encoding,
+        "room_ids": room_ids,
+        "room_numbers": [room.room_number for room in rooms],
+        "occupancy": [encode(room_bits, days) for room_bits in bits],
+    }
@@ -0,0 +1,163 @@
+from datetime import date, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, event, func, inspect, select, text, update
+from sqlalchemy.orm import Session
+from models.reservations import Reservation, ReservationStatus
+from models.room_nights import RoomNight
+from models.rooms import Room
+
+# Reservations that occupy their nights; PENDING and CANCELLED do not.
+# Enum columns store member names, which the raw SQL below matches on.
+SOLD_STATUSES = tuple(s.name for s in (
+    ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN, ReservationStatus.CHECKED_OUT
+))
+
+# Attributes whose change alters a reservation's nights or their revenue
+_FACT_ATTRIBUTES = ("room_id", "check_in_date", "check_out_date", "status", "total_price", "deleted_at")
+
+# Keeps a day-grouped report to a few hundred rows
+MAX_REPORT_DAYS = 731
+
+_EXPLODE = """
+    INSERT INTO room_nights (night, reservation_id, room_id, room_type, floor, revenue)
+    SELECT n::date, r.id, r.room_id, rm.room_type, rm.floor,
+           r.total_price / GREATEST(r.check_out_date::date - r.check_in_date::date, 1)
+    FROM {reservations} r
+    JOIN {rooms} rm ON rm.id = r.room_id
+    CROSS JOIN LATERAL generate_series(
+        r.check_in_date::date, r.check_out_date::date - 1, interval '1 day'
+    ) AS n
+    WHERE r.status IN ({sold})
+      AND r.deleted_at IS NULL
+""".replace("{sold}", ", ".join(f"'{s}'" for s in SOLD_STATUSES))
+
+_LIVE_SOURCES = {"reservations": "reservations", "rooms": "rooms"}
+
+# Archived stays still count in the reports (see services/archive.py)
+_ALL_SOURCES = {
+    "reservations": """(
+        SELECT id, room_id, check_in_date, check_out_date, status, total_price, deleted_at FROM reservations
+        UNION ALL
+        SELECT id, room_id, check_in_date, check_out_date, status, total_price, deleted_at FROM reservations_archive
+    )""",
+    "rooms": """(
+        SELECT id, room_type, floor FROM rooms
+        UNION ALL
+        SELECT id, room_type, floor FROM rooms_archive
+    )""",
+}
+
+
+def sync_room_nights(connection, reservation_ids: Iterable[int]):
+    """Re-derive the fact rows of the given reservations.
+
+    Call this after any write to ``reservations`` that bypasses the ORM
+    flush (Core or bulk UPDATEs); flushed writes are synced automatically.
+    """
+    ids = list(set(reservation_ids))
+    if not ids:
+        return
+    connection.execute(
+        text("DELETE FROM room_nights WHERE reservation_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": ids},
+    )
+    connection.execute(
+        text(_EXPLODE.format(**_LIVE_SOURCES) + " AND r.id IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": ids},
+    )
+
+
+def restamp_room_nights(connection, room_id: int, room_type, floor):
+    """Copy a room's new type and floor onto its fact rows.
+
+    Flushed room updates do this automatically; call it after an UPDATE
+    statement that changes either.
+    """
+    connection.execute(
+        update(RoomNight.__table__)
+        .where(RoomNight.__table__.c.room_id == room_id)
+        .values(room_type=room_type, floor=floor)
+    )
+
+
+def rebuild_room_nights(db: Session):
+    """Recompute the whole fact table from live and archived reservations"""
+    db.execute(text("TRUNCATE room_nights"))
+    db.execute(text(_EXPLODE.format(**_ALL_SOURCES)))
+    db.commit()
+
+
+def _changed(obj, attributes) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_flushed_reservations(session, flush_context):
+    """Keep room_nights in step with flushed writes, in the same transaction"""
+    reservation_ids = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Reservation) and (obj in session.new or _changed(obj, _FACT_ATTRIBUTES)):
+            reservation_ids.add(obj.id)
+        elif isinstance(obj, Room) and obj in session.dirty and _changed(obj, ("room_type", "floor")):
+            restamp_room_nights(session.connection(), obj.id, obj.room_type, obj.floor)
+    sync_room_nights(session.connection(), reservation_ids)
+
+
+def check_report_window(start: date, end: date):
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be after start"
+        )
+    if (end - start).days > MAX_REPORT_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Report window cannot exceed {MAX_REPORT_DAYS} days"
+        )
+
+
+def room_night_report(db: Session, start: date, end: date, group_by: str) -> List[Dict]:
+    """Sold nights, available nights, occupancy, revenue, ADR and RevPAR per group.
+
+    ``end`` is exclusive. Sold nights and revenue are aggregated from
+    room_nights; available nights are the current (non-deleted) rooms in the
+    group times the days in the window.
+    """
+    days = (end - start).days
+    fact_key = {"day": RoomNight.night, "room_type": RoomNight.room_type, "floor": RoomNight.floor}[group_by]
+    sold = {
+        key: (nights, revenue)
+        for key, nights, revenue in db.execute(
+            select(fact_key, func.count(), func.sum(RoomNight.revenue))
+            .where(RoomNight.night >= start, RoomNight.night < end)
+            .group_by(fact_key)
+        )
+    }
+
+    live_rooms = select(func.count()).select_from(Room).where(Room.deleted_at.is_(None))
+    if group_by == "day":
+        total_rooms = db.scalar(live_rooms)
+        groups = [(start + timedelta(days=offset), total_rooms) for offset in range(days)]
+    else:
+        room_key = getattr(Room, group_by)
+        rooms = {key: count for count, key in db.execute(live_rooms.add_columns(room_key).group_by(room_key))}
+        keys = sorted(rooms.keys() | sold.keys(), key=lambda key: (key is None, getattr(key, "value", key) or 0))
+        groups = [(key, rooms.get(key, 0) * days) for key in keys]
+
+    rows = []
+    for key, available in groups:
+        nights, revenue = sold.get(key, (0, 0.0))
+        revenue = round(revenue or 0.0, 2)
+        rows.append({
+            "group": key,
+            "sold_nights": nights,
+            "available_nights": available,
+            "occupancy": round(nights / available, 4) if available else 0.0,
+            "revenue": revenue,
+            "adr": round(revenue / nights, 2) if nights else 0.0,
+            "revpar": round(revenue / available, 2) if available else 0.0,
+        })
+    return rows
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Finished calls kept for a micro-TTL are swept once this many keys pile up
+_SWEEP_AT = 1024
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "expires_at")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.expires_at: Optional[float] = None
+
+
+def _follower_error(error: BaseException) -> BaseException:
+    """A copy of the leader's exception for one follower to raise. Raising the
+    shared object from several threads at once would splice all their frames
+    into its one ``__traceback__``."""
+    # Skip __init__: exceptions raised with keyword arguments (HTTPException)
+    # cannot be rebuilt from ``args`` the way copy.copy would try
+    try:
+        copied = type(error).__new__(type(error), *error.args)
+        copied.__dict__.update(error.__dict__)
+        return copied
+    except Exception:
+        return RuntimeError(f"Coalesced call failed: {error!r}")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait and get its result (or exception). With ``ttl`` > 0 the result
+    is also handed to callers arriving up to ``ttl`` seconds after it
+    finished. ``do`` serves threadpool callers, ``do_async`` coroutines on
+    the event loop; the two keep separate flights.
+
+    A ``do`` follower holds a threadpool thread while it waits, so with
+    ``wait_timeout`` set it gives up after that many seconds and runs the
+    function itself rather than park the pool behind one slow call.
+    """
+
+    def __init__(self, ttl: float = 0, wait_timeout: Optional[float] = None):
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[str, Tuple[asyncio.Future, Optional[float]]] = {}
+
+    def _sweep(self, calls: Dict, expires_at: Callable[[Any], Optional[float]]):
+        if len(calls) < _SWEEP_AT:
+            return
+        now = time.monotonic()
+        for key in [key for key, value in calls.items() if (expires_at(value) or now + 1) <= now]:
+            del calls[key]
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Returns ``(result, shared)``; ``shared`` is True when another caller ran ``fn``"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None or (call.expires_at is not None and call.expires_at <= time.monotonic()):
+                self._sweep(self._calls, lambda call: call.expires_at)
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                return fn(), False
+            if call.error is not None:
+                raise _follower_error(call.error) from call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self.ttl and call.error is None:
+                    call.expires_at = time.monotonic() + self.ttl
+                elif self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Coroutine version of ``do``; ``fn`` returns an awaitable"""
+        entry = self._tasks.get(key)
+        if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+            self._sweep(self._tasks, lambda entry: entry[1])
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = (task, None)
+            task.add_done_callback(lambda task: self._finished(key, task))
+            shared = False
+        else:
+            task, shared = entry[0], True
+        # A follower giving up must not cancel the query others are waiting on
+        try:
+            return await asyncio.shield(task), shared
+        except Exception as exc:
+            if not shared:
+                raise
+            raise _follower_error(exc) from exc
+
+    def _finished(self, key: str, task: asyncio.Future):
+        entry = self._tasks.get(key)
+        if entry is None or entry[0] is not task:
+            return
+        if self.ttl and not task.cancelled() and task.exception() is None:
+            self._tasks[key] = (task, time.monotonic() + self.ttl)
+        else:
+            del self._tasks[key]
@@ -0,0 +1,40 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session, with_loader_criteria
+from models.guests import Guest
+from models.reservations import Reservation
+from models.rooms import Room
+
+SOFT_DELETE_MODELS = (Guest, Room, Reservation)
+
+# Execution option that lets a statement see soft-deleted rows:
+#   query.execution_options(include_deleted=True)
+INCLUDE_DELETED = "include_deleted"
+
+
+def _entities(state):
+    if state.is_select:
+        return {description.get("entity") for description in state.statement.column_descriptions}
+    if state.is_update or state.is_delete:
+        return {state.statement.entity_description.get("entity")}
+    return set()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_deleted(state):
+    """Add ``deleted_at IS NULL`` for the soft-deletable entities a statement selects,
+    updates or deletes.
+
+    Only the statement's own entities are filtered: related objects loaded
+    along with them (a reservation's room, a room's reservations) still
+    load when deleted, so history keeps resolving. Refreshes and lazy
+    loads are left alone for the same reason.
+    """
+    if state.is_column_load or state.is_relationship_load or state.execution_options.get(INCLUDE_DELETED, False):
+        return
+    entities = _entities(state)
+    criteria = [
+        with_loader_criteria(model, lambda cls: cls.deleted_at.is_(None))
+        for model in SOFT_DELETE_MODELS if model in entities
+    ]
+    if criteria:
+        state.statement = state.statement.options(*criteria)
@@ -0,0 +1,96 @@
+import itertools
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+# Settings are read on import: keep test runs from writing a log file
+os.environ.setdefault("LOG_DIR", "")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+POSTGRES = "postgres"
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", f"{POSTGRES}: needs the Postgres database named by HMS_TEST_DATABASE_URL"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Every test on pg_engine is a Postgres test: CI runs them with -m postgres
+    for item in items:
+        if "pg_engine" in item.fixturenames:
+            item.add_marker(POSTGRES)
+
+
+@pytest.fixture
+def sqlite_db():
+    """Session on an in-memory SQLite copy of the guest, room and reservation tables.
+
+    SQLite has no transaction ids: pg_current_xact_id() is stood in for by a
+    counter, so change_seq still grows with every write.
+    """
+    from database import Base
+    from models.guests import Guest
+    from models.reservations import Reservation
+    from models.rooms import Room
+
+    engine = create_engine("sqlite://")
+    xact_ids = itertools.count(1)
+
+    @event.listens_for(engine, "connect")
+    def _register_functions(dbapi_connection, connection_record):
+        dbapi_connection.create_function("pg_current_xact_id", 0, lambda: next(xact_ids))
+
+    Base.metadata.create_all(engine, tables=[Guest.__table__, Room.__table__, Reservation.__table__])
+    with Session(engine) as db:
+        yield db
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def pg_engine(request):
+    """Engine on the Postgres database named by HMS_TEST_DATABASE_URL, with
+    the schema created. Tests using it are skipped when it is not set, unless
+    the run selected them with ``-m postgres``: then they fail, so a CI job
+    without its database cannot pass by skipping everything."""
+    url = os.environ.get("HMS_TEST_DATABASE_URL")
+    if not url:
+        if request.config.getoption("markexpr").strip() == POSTGRES:
+            pytest.fail("-m postgres needs HMS_TEST_DATABASE_URL")
+        pytest.skip("HMS_TEST_DATABASE_URL is not set")
+    import models.archive  # noqa: F401  (registers every table)
+    import models.events  # noqa: F401
+    from database import Base
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@contextmanager
+def _recording(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def record_statements():
+    """``with record_statements(engine) as statements:`` collects the SQL
+    the engine sends to the database (transaction control excluded)"""
+    return _recording
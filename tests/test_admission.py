@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, AdmissionMiddleware, route_group
+from config import settings
+
+
+@pytest.mark.parametrize("method, path, group", [
+    ("GET", "/reservations/", "reads"),
+    ("POST", "/reservations/", "bookings"),
+    ("PUT", "/reservations/3", "bookings"),
+    ("POST", "/quotes/", "reads"),
+    ("GET", "/rooms/1", "reads"),
+    ("DELETE", "/guests/1", "writes"),
+    ("GET", "/health", None),
+    ("GET", "/events/stream", None),
+])
+def test_routes_fall_into_their_groups(method, path, group):
+    assert route_group(method, path) == group
+
+
+def controller(max_concurrency=1, queue=2) -> AdmissionController:
+    groups = ("bookings", "writes", "reads")
+    return AdmissionController(max_concurrency, {name: 1 for name in groups}, {name: queue for name in groups})
+
+
+def test_freed_slots_go_to_bookings_first_then_fifo():
+    async def run():
+        admission = controller()
+        assert await admission.acquire("reads", 1) is None
+        admitted = []
+
+        async def wait(name, label):
+            assert await admission.acquire(name, 1) is None
+            admitted.append(label)
+
+        waiting = [
+            asyncio.create_task(wait("reads", "read 1")),
+            asyncio.create_task(wait("reads", "read 2")),
+            asyncio.create_task(wait("bookings", "booking")),
+        ]
+        await asyncio.sleep(0)
+        for name in ("reads", "bookings", "reads"):
+            admission.release(name)
+            await asyncio.sleep(0)
+        admission.release("reads")
+        await asyncio.gather(*waiting)
+        assert admitted == ["booking", "read 1", "read 2"]
+        assert admission.active == 0
+
+    asyncio.run(run())
+
+
+def test_requests_are_shed_when_the_queue_is_full_or_the_wait_runs_out():
+    async def run():
+        admission = controller(queue=1)
+        assert await admission.acquire("writes", 1) is None
+        waiter = asyncio.create_task(admission.acquire("writes", 0.05))
+        await asyncio.sleep(0)
+        assert await admission.acquire("writes", 1) == "queue_full"
+        assert await waiter == "timeout"
+
+        # The timed-out waiter left the queue: the freed slot is not handed to it
+        admission.release("writes")
+        assert admission.active == 0 and not admission.groups["writes"].waiters
+        assert await admission.acquire("writes", 1) is None
+
+    asyncio.run(run())
+
+
+def test_a_cancelled_waiter_gives_its_place_up():
+    async def run():
+        admission = controller()
+        assert await admission.acquire("reads", 1) is None
+        waiter = asyncio.create_task(admission.acquire("reads", 1))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        admission.release("reads")
+        assert admission.active == 0 and not admission.groups["reads"].waiters
+
+    asyncio.run(run())
+
+
+def test_shed_requests_get_a_503_with_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "admission_queue_timeout_seconds", 0.01)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def call(middleware, method, path):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await middleware({"type": "http", "method": method, "path": path, "headers": []}, None, send)
+        start = sent[0]
+        return start["status"], dict(start["headers"])
+
+    async def run():
+        admission = controller(queue=0)
+        middleware = AdmissionMiddleware(app, admission)
+        assert (await call(middleware, "POST", "/reservations/"))[0] == 200
+        assert admission.active == 0
+
+        assert await admission.acquire("bookings", 1) is None
+        status, headers = await call(middleware, "POST", "/reservations/")
+        assert status == 503
+        assert headers[b"retry-after"] == str(settings.admission_retry_after_seconds).encode()
+        # Ungrouped routes are never held back
+        assert (await call(middleware, "GET", "/health"))[0] == 200
+
+    asyncio.run(run())
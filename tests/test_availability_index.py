@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+from schemas.reservations import ReservationCreate, ReservationUpdate
+from services.availability_index import AvailabilityIndex
+
+START = datetime(2025, 6, 1, 14, 0)
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+class Rows:
+    """Stands in for the session in AvailabilityIndex.warm/load_room"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, statement):
+        return list(self.rows)
+
+
+def aware(value: datetime, tz=timezone.utc) -> datetime:
+    """The same instant as naive local ``value``, with an offset"""
+    return value.astimezone(tz)
+
+
+def nights(first: int, count: int):
+    return START + timedelta(days=first), START + timedelta(days=first + count)
+
+
+def index_with(*stays):
+    """Room 1 booked for each (first night, nights) in ``stays``, ids from 1"""
+    index = AvailabilityIndex()
+    index.warm(Rows([(i, 1, *nights(first, count)) for i, (first, count) in enumerate(stays, start=1)]))
+    return index
+
+
+def test_aware_timestamps_are_compared_as_local_time():
+    index = index_with((0, 2), (5, 2))
+    check_in, check_out = nights(1, 1)
+    assert not index.is_free(None, 1, aware(check_in), aware(check_out))
+    assert not index.is_free(None, 1, aware(check_in, IST), check_out)
+    check_in, check_out = nights(2, 3)
+    assert index.is_free(None, 1, aware(check_in), aware(check_out, IST))
+
+
+def test_applied_aware_stays_are_stored_naive():
+    index = index_with((0, 2))
+    check_in, check_out = nights(3, 2)
+    index.apply({7: (1, aware(check_in, IST), aware(check_out, IST))})
+    assert not index.is_free(None, 1, *nights(4, 1))
+    assert index.is_free(None, 1, *nights(2, 1))
+
+
+def test_only_the_neighbouring_stay_decides():
+    index = index_with(*[(day, 1) for day in range(0, 2000, 2)])
+    assert index.is_free(None, 1, *nights(1001, 1))
+    assert not index.is_free(None, 1, *nights(1000, 1))
+    assert not index.is_free(None, 1, *nights(999, 2))
+    assert index.is_free(None, 1, *nights(-5, 5))
+    assert index.is_free(None, 1, *nights(2000, 30))
+
+
+def test_excluded_stay_is_skipped_but_not_the_one_before_it():
+    index = index_with((0, 3), (3, 3))
+    # Moving stay 2 (nights 3-5) one night later is fine
+    assert index.is_free(None, 1, *nights(4, 3), exclude_reservation_id=2)
+    # Moving it one night earlier runs into stay 1
+    assert not index.is_free(None, 1, *nights(2, 3), exclude_reservation_id=2)
+
+
+def test_reservation_schemas_normalize_offsets():
+    check_in, check_out = nights(0, 2)
+    created = ReservationCreate(
+        guest_id=1, room_id=1, check_in_date=aware(check_in).isoformat(), check_out_date=check_out.isoformat(),
+    )
+    assert (created.check_in_date, created.check_out_date) == (check_in, check_out)
+    updated = ReservationUpdate(check_in_date=aware(check_in, IST).isoformat())
+    assert updated.check_in_date == check_in and updated.check_in_date.tzinfo is None
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus, RoomType
+from schemas.reservations import ReservationBulkCreate, ReservationCreate
+from services.bulk_booking import plan_bulk_reservations
+
+START = datetime(2025, 6, 1, 14, 0)
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def day(offset: int) -> datetime:
+    return START + timedelta(days=offset)
+
+
+def seed(db):
+    db.execute(insert(Guest).values(
+        id=1, first_name="Ada", last_name="Guest", email="ada@example.com", phone="5550000000",
+        id_number="ID1", change_seq=1,
+    ))
+    db.execute(insert(Room), [
+        {"id": room_id, "room_number": f"R{room_id}", "room_type": RoomType.DOUBLE, "price": 100.0,
+         "status": RoomStatus.AVAILABLE, "capacity": 2, "change_seq": room_id}
+        for room_id in (1, 2)
+    ])
+    db.execute(insert(Reservation).values(
+        id=1, guest_id=1, room_id=1, check_in_date=day(0), check_out_date=day(3), number_of_guests=1,
+        status=ReservationStatus.CONFIRMED, total_price=300.0, change_seq=1,
+    ))
+
+
+def item(room_id: int, check_in: datetime, check_out: datetime) -> dict:
+    return {"guest_id": 1, "room_id": room_id, "check_in_date": check_in, "check_out_date": check_out}
+
+
+def plan(db, items):
+    accepted, errors = plan_bulk_reservations(db, items)
+    return [index for index, _, _ in accepted], {error.index: error.detail for error in errors}
+
+
+def test_mixed_aware_and_naive_request_items(sqlite_db):
+    seed(sqlite_db)
+    batch = ReservationBulkCreate.model_validate({"items": [
+        item(1, day(2).astimezone(timezone.utc).isoformat(), day(4).isoformat()),  # overlaps stay 1
+        item(2, day(0).astimezone(IST).isoformat(), day(2).astimezone(IST).isoformat()),
+        item(2, day(1).isoformat(), day(3).isoformat()),  # overlaps item 1
+        item(1, day(3).astimezone(timezone.utc).isoformat(), day(5).isoformat()),
+    ]})
+    accepted, errors = plan(sqlite_db, batch.items)
+    assert accepted == [1, 3]
+    assert errors == {
+        0: "Room is not available for the selected dates",
+        2: "Room is not available for the selected dates (conflicts with item 1)",
+    }
+
+
+def test_items_built_without_validation_are_normalized(sqlite_db):
+    seed(sqlite_db)
+    items = [
+        ReservationCreate.model_construct(**item(2, day(0).astimezone(IST), day(2).astimezone(IST))),
+        ReservationCreate.model_construct(**item(2, day(1), day(3))),
+        ReservationCreate.model_construct(**item(1, day(1).astimezone(timezone.utc), day(2))),
+    ]
+    accepted, errors = plan(sqlite_db, items)
+    assert accepted == [0]
+    assert set(errors) == {1, 2}
+    accepted, _ = plan_bulk_reservations(sqlite_db, items[:1])
+    assert accepted[0][1].check_in_date == day(0)
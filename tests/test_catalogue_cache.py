@@ -0,0 +1,104 @@
+import json
+import time
+
+from datetime import datetime, timedelta
+
+from fastapi import Request, Response
+from sqlalchemy import insert, update
+
+from database import LAST_WRITE_COOKIE
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus, RoomType
+from routes.rooms import get_room, search_available_rooms
+
+START = datetime(2025, 6, 1, 14, 0)
+
+
+def make_request(path: str, cookie: str = None, etag: str = None) -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    if etag:
+        headers.append((b"if-none-match", etag.encode()))
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": headers, "app": None})
+
+
+def seed(db):
+    db.execute(insert(Room).values(
+        id=1, room_number="R1", room_type=RoomType.DOUBLE, price=100.0, status=RoomStatus.AVAILABLE,
+    ))
+    db.commit()
+
+
+def price(response: Response) -> float:
+    return json.loads(response.body)["price"]
+
+
+def search(db, path: str, etag: str = None) -> Response:
+    return search_available_rooms(
+        make_request(path, etag=etag), Response(), START, START + timedelta(days=2),
+        min_capacity=None, min_price=None, max_price=None, db=db,
+    )
+
+
+def test_matching_etag_gets_a_304_from_the_store_and_the_cache(sqlite_db):
+    seed(sqlite_db)
+    path = "/rooms/1?test=etag"
+    first = get_room(1, make_request(path), Response(), db=sqlite_db)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    cached = get_room(1, make_request(path, etag=etag), Response(), db=sqlite_db)
+    assert (cached.status_code, cached.body, cached.headers["etag"]) == (304, b"", etag)
+    assert get_room(1, make_request(path, etag='"stale"'), Response(), db=sqlite_db).status_code == 200
+
+    # After a committed change the body, and so the ETag, is new
+    sqlite_db.execute(update(Room).where(Room.id == 1).values(price=120.0))
+    sqlite_db.commit()
+    changed = get_room(1, make_request(path, etag=etag), Response(), db=sqlite_db)
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert price(changed) == 120.0
+
+
+def test_reservation_writes_refresh_searches_but_not_room_reads(sqlite_db):
+    seed(sqlite_db)
+    sqlite_db.execute(insert(Guest).values(
+        id=1, first_name="Ada", last_name="Guest", email="ada@example.com", phone="5550000000", id_number="ID1",
+    ))
+    sqlite_db.commit()
+    room_path, search_path = "/rooms/1?test=reservation-write", "/rooms/available/search?test=reservation-write"
+    room_etag = get_room(1, make_request(room_path), Response(), db=sqlite_db).headers["etag"]
+    assert [room["id"] for room in json.loads(search(sqlite_db, search_path).body)] == [1]
+
+    sqlite_db.execute(insert(Reservation).values(
+        guest_id=1, room_id=1, check_in_date=START, check_out_date=START + timedelta(days=2),
+        number_of_guests=1, status=ReservationStatus.CONFIRMED, total_price=200.0,
+    ))
+    sqlite_db.commit()
+    assert json.loads(search(sqlite_db, search_path).body) == []
+    assert get_room(1, make_request(room_path, etag=room_etag), Response(), db=sqlite_db).status_code == 304
+
+
+def test_rolled_back_writes_leave_the_cache_alone(sqlite_db):
+    seed(sqlite_db)
+    path = "/rooms/1?test=rollback"
+    etag = get_room(1, make_request(path), Response(), db=sqlite_db).headers["etag"]
+    sqlite_db.execute(update(Room).where(Room.id == 1).values(price=120.0))
+    sqlite_db.rollback()
+    assert get_room(1, make_request(path, etag=etag), Response(), db=sqlite_db).status_code == 304
+
+
+def test_client_that_just_wrote_bypasses_a_stale_cached_body(sqlite_db):
+    seed(sqlite_db)
+    path = "/rooms/1?test=read-your-writes"
+    assert price(get_room(1, make_request(path), Response(), db=sqlite_db)) == 100.0
+
+    # A write the cache has not caught up with, as when a lagging replica
+    # refilled it after the write's invalidation
+    sqlite_db.connection().exec_driver_sql("UPDATE rooms SET price = 120 WHERE id = 1")
+    sqlite_db.commit()
+    sqlite_db.expire_all()
+
+    writer = make_request(path, f"{LAST_WRITE_COOKIE}={time.time()}")
+    assert price(get_room(1, writer, Response(), db=sqlite_db)) == 120.0
+    # ...and its fresh read is not stored for clients reading replicas
+    assert price(get_room(1, make_request(path), Response(), db=sqlite_db)) == 100.0
@@ -0,0 +1,89 @@
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.guests import Guest
+from routes.guests import GUEST_COLUMNS
+from services.changes import change_feed
+from services.guest_import import import_guests
+
+
+def _catch_up(db: Session, since_seq: int = 0, since_id: int = 0):
+    """Read the guest feed to its end; returns the emails served and the final cursor"""
+    emails = []
+    while True:
+        page = change_feed(db, Guest, GUEST_COLUMNS, since_seq, since_id, None, 500)
+        db.rollback()
+        emails += [item["email"] for item in page["changes"]]
+        since_seq, since_id = page["next_since_seq"], page["next_since_id"]
+        if not page["has_more"]:
+            return emails, (since_seq, since_id)
+
+
+def _guest(tag: str, i: int) -> dict:
+    return {
+        "first_name": "Feed", "last_name": f"Guest{i}", "email": f"{tag}-{i}@example.com",
+        "phone": "5550000000", "id_number": f"{tag}-{i}",
+    }
+
+
+def test_imported_guests_appear_in_the_feed(pg_engine):
+    """The COPY path stamps change_seq and updated_at like ORM writes do"""
+    tag = uuid.uuid4().hex[:12]
+    with Session(pg_engine) as db:
+        _, cursor = _catch_up(db)
+        events = list(import_guests(db, [_guest(tag, i) for i in range(25)], batch_size=10))
+        assert events[-1]["inserted"] == 25
+        stamped = db.execute(
+            select(Guest.change_seq, Guest.updated_at).where(Guest.email.like(f"{tag}-%"))
+        ).all()
+        assert all(seq is not None and updated_at is not None for seq, updated_at in stamped)
+
+        emails, _ = _catch_up(db, *cursor)
+    assert sorted(email for email in emails if email.startswith(tag)) == sorted(
+        f"{tag}-{i}@example.com" for i in range(25)
+    )
+
+
+def test_feed_waits_for_earlier_transactions_to_commit(pg_engine):
+    """A write that started first but commits last is still served after the cursor"""
+    tag = uuid.uuid4().hex[:12]
+    with Session(pg_engine) as reader, Session(pg_engine) as slow, Session(pg_engine) as fast:
+        _, cursor = _catch_up(reader)
+
+        slow.add(Guest(**_guest(tag, 0)))
+        slow.flush()  # takes the lower transaction id
+        fast.add(Guest(**_guest(tag, 1)))
+        fast.commit()
+
+        emails, cursor = _catch_up(reader, *cursor)
+        assert f"{tag}-1@example.com" not in emails  # held back behind the open write
+
+        slow.commit()
+        emails, _ = _catch_up(reader, *cursor)
+    assert {f"{tag}-0@example.com", f"{tag}-1@example.com"} <= set(emails)
+
+
+def test_pages_split_inside_one_transaction(pg_engine):
+    """Rows of one transaction share a change_seq; the id keeps paging exact"""
+    tag = uuid.uuid4().hex[:12]
+    with Session(pg_engine) as db:
+        _, cursor = _catch_up(db)
+        db.add_all(Guest(**_guest(tag, i)) for i in range(7))
+        db.commit()
+
+        emails, seen = [], 0
+        since_seq, since_id = cursor
+        while True:
+            page = change_feed(db, Guest, GUEST_COLUMNS, since_seq, since_id, None, 3)
+            db.rollback()
+            emails += [item["email"] for item in page["changes"]]
+            since_seq, since_id = page["next_since_seq"], page["next_since_id"]
+            seen += 1
+            if not page["has_more"]:
+                break
+    ours = [email for email in emails if email.startswith(tag)]
+    assert sorted(ours) == sorted(f"{tag}-{i}@example.com" for i in range(7))
+    assert len(ours) == len(set(ours))
+    assert seen >= 3
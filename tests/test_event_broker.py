@@ -0,0 +1,152 @@
+import asyncio
+import json
+import re
+import threading
+
+import pytest
+from sqlalchemy.orm import Session
+
+from config import settings
+from services.events import CHANNEL, EventBroker, _notify_staged_events, _numbered, emit_event
+
+
+def event(seq: int) -> dict:
+    return {"seq": seq, "type": "room", "data": {"id": seq}}
+
+
+async def received(stream, count: int) -> list:
+    """Sequence numbers of the next ``count`` events on ``stream``"""
+    seqs = []
+    while len(seqs) < count:
+        chunk = await asyncio.wait_for(stream.__anext__(), 5)
+        seqs += [int(seq) for seq in re.findall(rb"^id: (\d+)$", chunk, re.M) if b"event: room" in chunk]
+    return seqs
+
+
+async def started(broker: EventBroker, since=None):
+    stream = broker.subscribe(since)
+    assert await stream.__anext__() == b"retry: 3000\n\n"
+    return stream
+
+
+def test_out_of_order_events_reach_live_and_resumed_subscribers():
+    async def run():
+        broker = EventBroker(100)
+        broker.bind(asyncio.get_running_loop())
+        live = await started(broker)
+        # 10 committed after 11 and 12: nobody may move past it
+        broker._publish([event(11), event(12)])
+        assert broker.last_seq == 0
+        broker._publish([event(10)])
+        broker._publish([event(i) for i in range(1, 10)])
+        assert await received(live, 12) == list(range(1, 13))
+        resumed = await started(broker, 9)
+        assert await received(resumed, 3) == [10, 11, 12]
+
+    asyncio.run(run())
+
+
+def test_a_number_that_never_arrives_is_given_up_on(monkeypatch):
+    monkeypatch.setattr(settings, "events_gap_timeout_seconds", 0.05)
+
+    async def run():
+        broker = EventBroker(100)
+        broker.bind(asyncio.get_running_loop())
+        live = await started(broker)
+        broker._publish([event(1), event(3), event(4)])
+        assert await received(live, 3) == [1, 3, 4]
+        # Too late: 3 and 4 were already sent
+        broker._publish([event(2)])
+        broker._publish([event(5)])
+        assert await received(live, 1) == [5]
+        assert await received(await started(broker, 0), 4) == [1, 3, 4, 5]
+
+    asyncio.run(run())
+
+
+def test_reset_drops_held_events():
+    async def run():
+        broker = EventBroker(100)
+        broker.bind(asyncio.get_running_loop())
+        broker._publish([event(5)])
+        broker._reset(7)
+        broker._publish([event(8)])
+        assert broker.last_seq == 8
+        assert await received(await started(broker, 7), 1) == [8]
+
+    asyncio.run(run())
+
+
+def test_concurrent_commits_reach_subscribers_in_number_order(pg_engine):
+    """Writers racing to commit may notify out of number order; the broker
+    still hands every number out once, in order"""
+    listener = pg_engine.raw_connection()
+    listener.driver_connection.autocommit = True
+    listener.cursor().execute(f"LISTEN {CHANNEL}")
+
+    def write(batches: int):
+        for _ in range(batches):
+            with Session(pg_engine) as db:
+                for i in range(3):
+                    emit_event(db, "room", {"id": i})
+                db.commit()
+
+    writers = [threading.Thread(target=write, args=(50,)) for _ in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    connection = listener.driver_connection
+    connection.poll()
+    notifications = [_numbered(json.loads(note.payload)) for note in connection.notifies]
+    listener.close()
+    seqs = sorted(item["seq"] for items in notifications for item in items)
+    assert seqs == list(range(seqs[0], seqs[0] + 4 * 50 * 3))
+
+    async def run():
+        broker = EventBroker(1000)
+        broker.bind(asyncio.get_running_loop())
+        broker._reset(seqs[0] - 1)
+        live = await started(broker)
+        for items in notifications:
+            broker._publish(items)
+        assert await received(live, len(seqs)) == seqs
+
+    asyncio.run(run())
+
+
+def test_numbering_does_not_wait_for_other_transactions(pg_engine):
+    """An open transaction that has numbered its events does not hold up another's commit"""
+    with Session(pg_engine) as slow:
+        emit_event(slow, "room", {"id": 1})
+        _notify_staged_events(slow)
+
+        def write():
+            with Session(pg_engine) as db:
+                emit_event(db, "room", {"id": 2})
+                db.commit()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        writer.join(5)
+        assert not writer.is_alive()
+        slow.commit()
+
+
+def test_large_batches_are_split_across_notifications(pg_engine):
+    listener = pg_engine.raw_connection()
+    listener.driver_connection.autocommit = True
+    listener.cursor().execute(f"LISTEN {CHANNEL}")
+    with Session(pg_engine) as db:
+        for i in range(400):
+            emit_event(db, "room", {"id": i, "room_number": f"R{i:05d}", "status": "available"})
+        db.commit()
+    connection = listener.driver_connection
+    connection.poll()
+    payloads = [json.loads(note.payload) for note in connection.notifies]
+    listener.close()
+    assert len(payloads) > 1
+    seqs = [item["seq"] for payload in payloads for item in _numbered(payload)]
+    assert seqs == list(range(seqs[0], seqs[0] + 400))
+    assert [item["data"]["id"] for payload in payloads for item in payload["events"]] == list(range(400))
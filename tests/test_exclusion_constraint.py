@@ -0,0 +1,66 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomType
+from routes.reservations import create_reservation
+from schemas.reservations import ReservationCreate
+from services.availability import RoomUnavailableError, install_exclusion_constraint
+
+START = datetime(2091, 3, 1, 14, 0)
+
+
+@pytest.fixture
+def exclusion_mode(pg_engine, monkeypatch):
+    # Idempotent; the other Postgres tests book rooms of their own, so the
+    # constraint can stay installed on the test database
+    install_exclusion_constraint(pg_engine)
+    monkeypatch.setattr(settings, "booking_mode", "exclusion")
+
+
+@pytest.fixture
+def guest_and_room(pg_engine):
+    tag = uuid.uuid4().hex[:12]
+    with Session(pg_engine) as db:
+        guest = Guest(first_name="Ex", last_name="Clusion", email=f"ex-{tag}@example.com",
+                      phone="5550000000", id_number=f"EX-{tag}")
+        room = Room(room_number=f"EX-{tag}", room_type=RoomType.SINGLE, price=100.0, capacity=1)
+        db.add_all([guest, room])
+        db.commit()
+        return guest.id, room.id
+
+
+def book(pg_engine, guest_and_room, first_night: int, nights: int) -> int:
+    guest_id, room_id = guest_and_room
+    with Session(pg_engine) as db:
+        reservation = create_reservation(ReservationCreate(
+            guest_id=guest_id, room_id=room_id, number_of_guests=1,
+            check_in_date=START + timedelta(days=first_night),
+            check_out_date=START + timedelta(days=first_night + nights),
+        ), db=db, current_user=None)
+        return reservation.id
+
+
+def test_overlapping_stay_is_rejected_by_the_constraint(pg_engine, exclusion_mode, guest_and_room):
+    book(pg_engine, guest_and_room, 0, 3)
+    with pytest.raises(RoomUnavailableError):
+        book(pg_engine, guest_and_room, 2, 2)
+    # Stays are half-open: checking in on the previous check-out day is fine
+    book(pg_engine, guest_and_room, 3, 2)
+
+
+def test_cancelled_and_deleted_stays_do_not_hold_the_room(pg_engine, exclusion_mode, guest_and_room):
+    cancelled = book(pg_engine, guest_and_room, 10, 3)
+    deleted = book(pg_engine, guest_and_room, 20, 3)
+    with Session(pg_engine) as db:
+        db.execute(update(Reservation).where(Reservation.id == cancelled).values(status=ReservationStatus.CANCELLED))
+        db.execute(update(Reservation).where(Reservation.id == deleted).values(deleted_at=datetime.now()))
+        db.commit()
+    book(pg_engine, guest_and_room, 11, 1)
+    book(pg_engine, guest_and_room, 21, 1)
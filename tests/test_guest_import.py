@@ -0,0 +1,50 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+import services.soft_delete  # noqa: F401  (registers the soft-delete filter)
+from models.guests import Guest
+from services.guest_import import _csv_row, import_guests
+
+
+def test_copy_rows_leave_null_cells_unquoted():
+    assert _csv_row([None, "", 'say "hi"', 5]) == ',"","say ""hi""","5"\n'
+
+
+def test_imported_guest_without_address_stores_null(pg_engine):
+    tag = uuid.uuid4().hex[:12]
+    records = [
+        {"first_name": "No", "last_name": "Address", "email": f"{tag}-0@example.com",
+         "phone": "5550000000", "id_number": f"{tag}-0"},
+        {"first_name": "Empty", "last_name": "Address", "email": f"{tag}-1@example.com",
+         "phone": "5550000000", "id_number": f"{tag}-1", "address": ""},
+    ]
+    with Session(pg_engine) as db:
+        events = list(import_guests(db, records))
+        assert events[-1]["inserted"] == 2
+        stored = dict(db.execute(
+            select(Guest.email, Guest.address).where(Guest.email.like(f"{tag}-%"))
+        ).all())
+    assert stored == {f"{tag}-0@example.com": None, f"{tag}-1@example.com": ""}
+
+
+def test_soft_deleted_guests_still_count_as_duplicates(sqlite_db):
+    sqlite_db.execute(insert(Guest).values(
+        first_name="Gone", last_name="Guest", email="gone@example.com", phone="5550000000",
+        id_number="GONE-1", deleted_at=datetime(2025, 1, 1),
+    ))
+    sqlite_db.commit()
+    records = [
+        {"first_name": "Same", "last_name": "Email", "email": "gone@example.com",
+         "phone": "5550000000", "id_number": "NEW-1"},
+        {"first_name": "Same", "last_name": "Id", "email": "new@example.com",
+         "phone": "5550000000", "id_number": "GONE-1"},
+        {"first_name": "Fresh", "last_name": "Guest", "email": "fresh@example.com",
+         "phone": "5550000000", "id_number": "FRESH-1"},
+    ]
+    events = list(import_guests(sqlite_db, records))
+    rejects = [(event["row"], event["detail"]) for event in events if event["type"] == "reject"]
+    assert rejects == [(1, "Email already registered"), (2, "ID number already registered")]
+    assert events[-1]["inserted"] == 1
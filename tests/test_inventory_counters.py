@@ -0,0 +1,117 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.guests import Guest
+from models.inventory import RoomInventory
+from models.reservations import ReservationStatus
+from models.rooms import Room, RoomType
+from routes.reservations import create_reservation, delete_reservation, update_reservation
+from routes.rooms import delete_room, update_room
+from schemas.reservations import ReservationCreate, ReservationUpdate
+from schemas.rooms import RoomUpdate
+from services.inventory import check_inventory
+
+
+@pytest.fixture
+def stay(pg_engine):
+    """A guest, a room and a first night no other test books: counters are
+    per room type, so assertions are on how far they move from here"""
+    tag = uuid.uuid4().hex[:12]
+    with Session(pg_engine) as db:
+        guest = Guest(first_name="In", last_name="Ventory", email=f"inv-{tag}@example.com",
+                      phone="5550000000", id_number=f"INV-{tag}")
+        room = Room(room_number=f"INV-{tag}", room_type=RoomType.SUITE, price=100.0, capacity=1)
+        db.add_all([guest, room])
+        db.commit()
+        first = datetime(2095, 1, 1, 14) + timedelta(days=int(tag, 16) % 3000 * 10)
+        return guest.id, room.id, first
+
+
+def counters(pg_engine, room_type: RoomType, first: datetime, nights: int):
+    """Rooms sold per night from ``first``, 0 where no row exists yet"""
+    start = first.date()
+    with Session(pg_engine) as db:
+        rows = dict(db.execute(
+            select(RoomInventory.night, RoomInventory.sold).where(
+                RoomInventory.room_type == room_type,
+                RoomInventory.night >= start,
+                RoomInventory.night < start + timedelta(days=nights),
+            )
+        ).all())
+    return [rows.get(start + timedelta(days=offset), 0) for offset in range(nights)]
+
+
+def total(pg_engine, room_type: RoomType, night: datetime) -> int:
+    with Session(pg_engine) as db:
+        return db.scalar(select(RoomInventory.total).where(
+            RoomInventory.room_type == room_type, RoomInventory.night == night.date(),
+        ))
+
+
+def moved(before, after):
+    return [new - old for old, new in zip(before, after)]
+
+
+def call(pg_engine, handler, *args):
+    with Session(pg_engine) as db:
+        return handler(*args, db=db, current_user=None)
+
+
+def book(pg_engine, stay, first_night: int, nights: int) -> int:
+    guest_id, room_id, first = stay
+    return call(pg_engine, create_reservation, ReservationCreate(
+        guest_id=guest_id, room_id=room_id, number_of_guests=1,
+        check_in_date=first + timedelta(days=first_night),
+        check_out_date=first + timedelta(days=first_night + nights),
+    )).id
+
+
+def no_drift(pg_engine, first: datetime, nights: int) -> bool:
+    start = first.date()
+    with Session(pg_engine) as db:
+        drift = check_inventory(db)
+    return not [row for row in drift if start <= row["night"] < start + timedelta(days=nights)]
+
+
+def test_bookings_move_sold_on_create_move_cancel_and_delete(pg_engine, stay):
+    _, _, first = stay
+    before = counters(pg_engine, RoomType.SUITE, first, 6)
+
+    reservation_id = book(pg_engine, stay, 0, 2)
+    assert moved(before, counters(pg_engine, RoomType.SUITE, first, 6)) == [1, 1, 0, 0, 0, 0]
+
+    call(pg_engine, update_reservation, reservation_id, ReservationUpdate(
+        check_in_date=first + timedelta(days=3), check_out_date=first + timedelta(days=6),
+    ))
+    assert moved(before, counters(pg_engine, RoomType.SUITE, first, 6)) == [0, 0, 0, 1, 1, 1]
+
+    call(pg_engine, update_reservation, reservation_id, ReservationUpdate(status=ReservationStatus.CANCELLED))
+    assert moved(before, counters(pg_engine, RoomType.SUITE, first, 6)) == [0] * 6
+
+    other_id = book(pg_engine, stay, 1, 1)
+    assert moved(before, counters(pg_engine, RoomType.SUITE, first, 6)) == [0, 1, 0, 0, 0, 0]
+    call(pg_engine, delete_reservation, other_id)
+    assert moved(before, counters(pg_engine, RoomType.SUITE, first, 6)) == [0] * 6
+    assert no_drift(pg_engine, first, 6)
+
+
+def test_room_changes_move_bookings_and_totals(pg_engine, stay):
+    _, room_id, first = stay
+    book(pg_engine, stay, 0, 2)
+    suites = counters(pg_engine, RoomType.SUITE, first, 2)
+    doubles = counters(pg_engine, RoomType.DOUBLE, first, 2)
+
+    # Retyping the room moves its booked nights to the new type
+    call(pg_engine, update_room, room_id, RoomUpdate(room_type=RoomType.DOUBLE))
+    assert moved(suites, counters(pg_engine, RoomType.SUITE, first, 2)) == [-1, -1]
+    assert moved(doubles, counters(pg_engine, RoomType.DOUBLE, first, 2)) == [1, 1]
+
+    # Booking made a row for the night; its total follows live rooms from today on
+    live = total(pg_engine, RoomType.DOUBLE, first)
+    call(pg_engine, delete_room, room_id)
+    assert total(pg_engine, RoomType.DOUBLE, first) == live - 1
+    assert no_drift(pg_engine, first, 2)
@@ -0,0 +1,72 @@
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus, RoomType
+from routes.guests import get_guests
+from routes.reservations import get_reservations
+from schemas.guests import GuestResponse
+from schemas.reservations import ReservationExpandedResponse, ReservationResponse
+from services.pagination import NEXT_CURSOR_HEADER
+
+START = datetime(2025, 6, 1, 14, 0)
+
+
+@pytest.fixture
+def seeded(sqlite_db):
+    sqlite_db.execute(insert(Guest), [
+        {"id": guest_id, "first_name": "Ada", "last_name": f"Guest {guest_id}", "email": f"ada{guest_id}@example.com",
+         "phone": "5550000000", "id_number": f"ID{guest_id}", "address": None if guest_id % 2 else "1 Main St",
+         "created_at": START, "change_seq": guest_id}
+        for guest_id in range(1, 6)
+    ])
+    sqlite_db.execute(insert(Room), [
+        {"id": room_id, "room_number": f"R{room_id}", "room_type": RoomType.DOUBLE, "price": 99.5,
+         "status": RoomStatus.AVAILABLE, "floor": room_id}
+        for room_id in (1, 2)
+    ])
+    sqlite_db.execute(insert(Reservation), [
+        {"id": reservation_id, "guest_id": reservation_id % 5 + 1, "room_id": reservation_id % 2 + 1,
+         "check_in_date": START + timedelta(days=3 * reservation_id),
+         "check_out_date": START + timedelta(days=3 * reservation_id + 2), "number_of_guests": 1,
+         "status": list(ReservationStatus)[reservation_id % len(ReservationStatus)], "total_price": 199.0,
+         "special_requests": "Late arrival" if reservation_id % 3 else None}
+        for reservation_id in range(1, 8)
+    ])
+    sqlite_db.commit()
+    return sqlite_db
+
+
+def validated_body(schema, objects) -> list:
+    """What the route used to send: ORM objects through its response_model"""
+    adapter = TypeAdapter(List[schema])
+    return json.loads(adapter.dump_json(adapter.validate_python(objects, from_attributes=True)))
+
+
+def as_items(body: list) -> list:
+    # Lists of pairs, so key order is compared too
+    return [list(item.items()) for item in body]
+
+
+@pytest.mark.parametrize("expand, schema", [(None, ReservationResponse), ("room,guest", ReservationExpandedResponse)])
+def test_reservation_rows_serialize_like_the_response_model(seeded, expand, schema):
+    rows = json.loads(get_reservations(Response(), expand=expand, db=seeded, current_user=None).body)
+    objects = seeded.scalars(select(Reservation).order_by(Reservation.id)).all()
+    assert as_items(rows) == as_items(validated_body(schema, objects))
+
+
+def test_guest_rows_serialize_like_the_response_model_and_keep_the_cursor(seeded):
+    response = get_guests(Response(), limit=3, db=seeded, current_user=None)
+    objects = seeded.scalars(select(Guest).order_by(Guest.id)).all()
+    assert as_items(json.loads(response.body)) == as_items(validated_body(GuestResponse, objects[:3]))
+
+    rest = get_guests(Response(), limit=3, cursor=response.headers[NEXT_CURSOR_HEADER], db=seeded, current_user=None)
+    assert [guest["id"] for guest in json.loads(rest.body)] == [4, 5]
+    assert NEXT_CURSOR_HEADER not in rest.headers
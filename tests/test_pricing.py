@@ -0,0 +1,109 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from models.rates import RateOverride, RateRule, RateRuleKind
+from models.rooms import Room, RoomStatus, RoomType
+from routes.quotes import create_quotes
+from schemas.quotes import QuoteRequest
+from services.pricing import quote_matrix, quote_price
+
+MONDAY = datetime(2025, 6, 2, 14, 0)
+
+RULES = [
+    {"kind": RateRuleKind.WEEKDAY, "weekdays": "4,5", "multiplier": 1.5},
+    {"kind": RateRuleKind.WEEKDAY, "weekdays": "0", "multiplier": 0.9, "room_type": RoomType.SUITE},
+    {"kind": RateRuleKind.WEEKDAY, "weekdays": "2", "multiplier": 2.0,
+     "valid_from": date(2025, 6, 10), "valid_to": date(2025, 6, 20)},
+    {"kind": RateRuleKind.LENGTH_OF_STAY, "min_nights": 3, "multiplier": 0.95},
+    {"kind": RateRuleKind.LENGTH_OF_STAY, "min_nights": 7, "multiplier": 0.8},
+    {"kind": RateRuleKind.LENGTH_OF_STAY, "min_nights": 5, "multiplier": 0.7, "room_type": RoomType.DOUBLE,
+     "valid_from": date(2025, 6, 1), "valid_to": date(2025, 6, 8)},
+]
+OVERRIDES = [
+    {"room_type": RoomType.DOUBLE, "night": date(2025, 6, 4), "multiplier": 3.0},
+    {"room_type": RoomType.SUITE, "night": date(2025, 6, 13), "multiplier": 0.5},
+]
+
+
+@pytest.fixture
+def priced_db(sqlite_db):
+    """The fixture database with the rate tables, the rules above and one room per type"""
+    RateRule.__table__.create(sqlite_db.get_bind())
+    RateOverride.__table__.create(sqlite_db.get_bind())
+    sqlite_db.execute(insert(RateRule), [{"room_type": None, **rule} for rule in RULES])
+    sqlite_db.execute(insert(RateOverride), OVERRIDES)
+    sqlite_db.execute(insert(Room), [
+        {"id": index + 1, "room_number": f"R{index + 1}", "room_type": room_type, "price": 100.0 + 10 * index,
+         "status": RoomStatus.AVAILABLE}
+        for index, room_type in enumerate(RoomType)
+    ])
+    sqlite_db.commit()
+    return sqlite_db
+
+
+def _applies(rule, room_type, day) -> bool:
+    return (
+        rule.get("room_type") in (None, room_type)
+        and (rule.get("valid_from") is None or day >= rule["valid_from"])
+        and (rule.get("valid_to") is None or day < rule["valid_to"])
+    )
+
+
+def expected_price(room: Room, check_in: datetime, check_out: datetime) -> float:
+    """The rules as models/rates.py documents them, one night at a time"""
+    nights = [check_in.date() + timedelta(days=offset) for offset in range((check_out.date() - check_in.date()).days)]
+    total = 0.0
+    for night in nights:
+        factor = 1.0
+        for rule in RULES:
+            if rule["kind"] == RateRuleKind.WEEKDAY and _applies(rule, room.room_type, night) \
+                    and str(night.weekday()) in rule["weekdays"].split(","):
+                factor *= rule["multiplier"]
+        for override in OVERRIDES:
+            if (override["room_type"], override["night"]) == (room.room_type, night):
+                factor *= override["multiplier"]
+        total += room.price * factor
+    discounts = [
+        rule for rule in RULES
+        if rule["kind"] == RateRuleKind.LENGTH_OF_STAY and len(nights) >= rule["min_nights"]
+        and _applies(rule, room.room_type, check_in.date())
+    ]
+    if discounts:
+        total *= max(discounts, key=lambda rule: rule["min_nights"])["multiplier"]
+    return round(total, 2)
+
+
+def test_single_stays_apply_weekday_override_and_stay_rules(priced_db):
+    double, suite = priced_db.get(Room, 2), priced_db.get(Room, 3)
+    # Mon-Thu nights for a double: Wednesday overridden to 3x, 4 nights at 0.95
+    assert quote_price(priced_db, double, MONDAY, MONDAY + timedelta(days=4)) == round(110 * 6 * 0.95, 2)
+    # Adding Friday (1.5x) makes five nights, which earn the double's own 0.7 for check-ins in its window
+    assert quote_price(priced_db, double, MONDAY, MONDAY + timedelta(days=5)) == round(110 * 7.5 * 0.7, 2)
+    # The longest qualifying rule wins: 7 nights earn 0.8 rather than 0.95 for a suite
+    assert quote_price(priced_db, suite, MONDAY, MONDAY + timedelta(days=7)) == round(120 * 7.9 * 0.8, 2)
+    # A suite night on 06-11 (a Wednesday inside the window) doubles; 06-13 is halved
+    assert quote_price(priced_db, suite, MONDAY + timedelta(days=9), MONDAY + timedelta(days=10)) == 240.0
+    assert quote_price(priced_db, suite, MONDAY + timedelta(days=11), MONDAY + timedelta(days=12)) == 90.0
+
+
+def test_matrix_matches_night_by_night_pricing(priced_db):
+    rooms = [priced_db.get(Room, room_id) for room_id in range(1, len(RoomType) + 1)]
+    picks = random.Random(15)
+    stays = []
+    for _ in range(40):
+        check_in = MONDAY + timedelta(days=picks.randrange(-5, 30))
+        stays.append((check_in, check_in + timedelta(days=picks.randrange(1, 12))))
+    totals = quote_matrix(priced_db, rooms, stays)
+    assert totals.shape == (len(rooms), len(stays))
+    for row, room in enumerate(rooms):
+        for column, (check_in, check_out) in enumerate(stays):
+            assert totals[row, column] == pytest.approx(expected_price(room, check_in, check_out), abs=0.01)
+
+
+def test_quotes_leave_unknown_rooms_null(priced_db):
+    stays = [{"check_in_date": MONDAY, "check_out_date": MONDAY + timedelta(days=1)}]
+    quotes = create_quotes(QuoteRequest(room_ids=[99, 1], stays=stays), db=priced_db, current_user=None)
+    assert quotes.totals == [None, [100.0]]
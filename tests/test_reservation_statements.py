@@ -0,0 +1,126 @@
+import re
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Response
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus, RoomType
+from routes.reservations import (
+    check_in, check_out, delete_reservation, get_guest_reservations, get_reservation, get_reservations,
+    update_reservation,
+)
+from schemas.reservations import ReservationUpdate
+
+START = datetime(2025, 6, 1, 14, 0)
+COMMIT, COMMITTED = "-- commit", "-- committed"
+# A lazy load of a reservation's room: what loading it with the lookup avoids
+ROOM_LAZY_LOAD = re.compile(r"FROM rooms\s+WHERE rooms\.id = ")
+
+
+def seed(db):
+    db.execute(insert(Guest), [
+        {"id": guest_id, "first_name": "Ada", "last_name": "Guest", "email": f"ada{guest_id}@example.com",
+         "phone": "5550000000", "id_number": f"ID{guest_id}", "change_seq": 1}
+        for guest_id in (1, 2)
+    ])
+    db.execute(insert(Room), [
+        {"id": room_id, "room_number": f"R{room_id}", "room_type": RoomType.DOUBLE, "price": 100.0,
+         "status": RoomStatus.AVAILABLE, "capacity": 2, "change_seq": 1}
+        for room_id in (1, 2)
+    ])
+    db.execute(insert(Reservation), [
+        {"id": reservation_id, "guest_id": reservation_id % 2 + 1, "room_id": reservation_id % 2 + 1,
+         "check_in_date": START + timedelta(days=3 * reservation_id),
+         "check_out_date": START + timedelta(days=3 * reservation_id + 2), "number_of_guests": 1,
+         "status": ReservationStatus.CONFIRMED, "total_price": 200.0, "change_seq": 1}
+        for reservation_id in range(1, 7)
+    ])
+    db.commit()
+
+
+@pytest.mark.parametrize("expand, count", [(None, 1), ("room", 2), ("room,guest", 3)])
+def test_list_expansion_costs_one_query_per_relation(sqlite_db, record_statements, expand, count):
+    seed(sqlite_db)
+    with record_statements(sqlite_db.get_bind()) as statements:
+        get_reservations(Response(), expand=expand, db=sqlite_db, current_user=None)
+    assert len(statements) == count
+
+
+def test_guest_reservations_expand_in_three_queries(sqlite_db, record_statements):
+    seed(sqlite_db)
+    with record_statements(sqlite_db.get_bind()) as statements:
+        get_guest_reservations(2, expand="room,guest", db=sqlite_db, current_user=None)
+    assert len(statements) == 3
+
+
+def test_single_reservation_expands_in_one_query(sqlite_db, record_statements):
+    seed(sqlite_db)
+    with record_statements(sqlite_db.get_bind()) as statements:
+        reservation = get_reservation(1, expand="room,guest", db=sqlite_db, current_user=None)
+    assert len(statements) == 1
+    assert (reservation.room.id, reservation.guest.id) == (2, 2)
+
+
+@pytest.fixture
+def booking(pg_engine):
+    """A confirmed stay on a room of its own, far enough out to clash with nothing"""
+    tag = uuid.uuid4().hex[:12]
+    with Session(pg_engine) as db:
+        guest = Guest(first_name="Count", last_name="Statements", email=f"count-{tag}@example.com",
+                      phone="5550000000", id_number=f"COUNT-{tag}")
+        room = Room(room_number=f"COUNT-{tag}", room_type=RoomType.SINGLE, price=100.0, capacity=1)
+        db.add_all([guest, room])
+        db.flush()
+        check_in_date = datetime(2090, 1, 1, 14) + timedelta(days=int(tag, 16) % 3000)
+        reservation = Reservation(
+            guest_id=guest.id, room_id=room.id, check_in_date=check_in_date,
+            check_out_date=check_in_date + timedelta(days=2), number_of_guests=1,
+            status=ReservationStatus.CONFIRMED, total_price=200.0,
+        )
+        db.add(reservation)
+        db.commit()
+        return reservation.id
+
+
+def run(pg_engine, record_statements, handler, *args):
+    """Statements ``handler`` sends before and after its commit.
+
+    What the commit itself sends (the flush, derived tables, events) is
+    budgeted per write elsewhere; these counts cover the handler's own reads.
+    """
+    with Session(pg_engine) as db, record_statements(pg_engine) as statements:
+        commit = db.commit
+
+        def marked_commit():
+            statements.append(COMMIT)
+            commit()
+            statements.append(COMMITTED)
+
+        db.commit = marked_commit
+        handler(*args, db=db, current_user=None)
+    assert not any(ROOM_LAZY_LOAD.search(statement) for statement in statements)
+    return statements[:statements.index(COMMIT)], statements[statements.index(COMMITTED) + 1:]
+
+
+def test_update_loads_reservation_and_room_in_one_query(pg_engine, record_statements, booking):
+    before, after = run(pg_engine, record_statements, update_reservation, booking,
+                        ReservationUpdate(special_requests="Late arrival"))
+    assert len(before) == 1 and "JOIN rooms" in before[0]
+    assert len(after) == 1  # refresh
+
+
+def test_delete_reads_once(pg_engine, record_statements, booking):
+    before, after = run(pg_engine, record_statements, delete_reservation, booking)
+    assert (len(before), len(after)) == (1, 0)
+
+
+def test_check_in_and_out_read_once_each(pg_engine, record_statements, booking):
+    before, after = run(pg_engine, record_statements, check_in, booking)
+    assert (len(before), len(after)) == (1, 1)
+    before, after = run(pg_engine, record_statements, check_out, booking)
+    assert (len(before), len(after)) == (1, 1)
@@ -0,0 +1,100 @@
+import base64
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus, RoomType
+from services.room_grid import encode_runs, room_grid
+
+START = date(2025, 6, 1)
+DAYS = 20
+
+
+def held_days_from_bitmap(encoded: str, days: int):
+    bits = int.from_bytes(base64.b64decode(encoded), "little")
+    return [bool(bits >> day & 1) for day in range(days)]
+
+
+def held_days_from_runs(runs, days: int):
+    held = []
+    for index, length in enumerate(runs):
+        held += [index % 2 == 1] * length
+    assert len(held) == days
+    return held
+
+
+@pytest.mark.parametrize("bits, runs", [
+    (0, [DAYS]),
+    ((1 << DAYS) - 1, [0, DAYS]),
+    (0b11100, [2, 3, DAYS - 5]),
+    (1 << (DAYS - 1), [DAYS - 1, 1]),
+    # Bits past the window are ignored
+    (1 << DAYS | 1, [0, 1, DAYS - 1]),
+])
+def test_runs_alternate_free_and_held(bits, runs):
+    assert encode_runs(bits, DAYS) == runs
+
+
+@pytest.fixture
+def booked_db(sqlite_db):
+    """Six rooms with random stays around the window, some cancelled or
+    soft-deleted, and one soft-deleted room"""
+    picks = random.Random(14)
+    sqlite_db.execute(insert(Guest).values(
+        id=1, first_name="Ada", last_name="Guest", email="ada@example.com", phone="5550000000", id_number="ID1",
+    ))
+    sqlite_db.execute(insert(Room), [
+        {"id": room_id, "room_number": f"R{room_id}", "room_type": RoomType.SUITE if room_id % 2 else RoomType.SINGLE,
+         "price": 100.0, "status": RoomStatus.AVAILABLE, "deleted_at": datetime(2025, 1, 1) if room_id == 6 else None}
+        for room_id in range(1, 7)
+    ])
+    stays = []
+    for room_id in range(1, 7):
+        check_out = datetime(2025, 5, 25, 14)
+        while check_out < datetime(2025, 6, 28):
+            check_in = check_out + timedelta(days=picks.randrange(0, 4))
+            check_out = check_in + timedelta(days=picks.randrange(1, 6))
+            stays.append({
+                "guest_id": 1, "room_id": room_id, "check_in_date": check_in, "check_out_date": check_out,
+                "number_of_guests": 1, "total_price": 100.0,
+                "status": picks.choice([ReservationStatus.CONFIRMED, ReservationStatus.CHECKED_IN,
+                                        ReservationStatus.CANCELLED]),
+                "deleted_at": datetime(2025, 1, 1) if picks.random() < 0.2 else None,
+            })
+    sqlite_db.execute(insert(Reservation), stays)
+    sqlite_db.commit()
+    return sqlite_db, stays
+
+
+def expected_held(stays, room_id: int):
+    held = [False] * DAYS
+    for stay in stays:
+        if stay["room_id"] != room_id or stay["deleted_at"] or stay["status"] == ReservationStatus.CANCELLED:
+            continue
+        for day in range(DAYS):
+            if stay["check_in_date"].date() <= START + timedelta(days=day) < stay["check_out_date"].date():
+                held[day] = True
+    return held
+
+
+@pytest.mark.parametrize("encoding, decode", [("bitmap", held_days_from_bitmap), ("rle", held_days_from_runs)])
+def test_grid_matches_day_by_day_occupancy(booked_db, encoding, decode):
+    db, stays = booked_db
+    grid = room_grid(db, START, DAYS, encoding)
+    assert grid["room_ids"] == [1, 2, 3, 4, 5]
+    assert grid["room_numbers"] == ["R1", "R2", "R3", "R4", "R5"]
+    for room_id, occupancy in zip(grid["room_ids"], grid["occupancy"]):
+        assert decode(occupancy, DAYS) == expected_held(stays, room_id), room_id
+
+
+def test_grid_filters_by_room_type(booked_db):
+    db, stays = booked_db
+    grid = room_grid(db, START, DAYS, "rle", RoomType.SINGLE)
+    assert grid["room_ids"] == [2, 4]
+    assert [held_days_from_runs(runs, DAYS) for runs in grid["occupancy"]] == [
+        expected_held(stays, 2), expected_held(stays, 4),
+    ]
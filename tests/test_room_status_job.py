@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from cache import cache
+from config import settings
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus, RoomType
+from services import catalogue_cache
+from services.lifecycle import reconcile_room_statuses
+
+NOW = datetime(2025, 6, 2, 12, 0)
+
+
+@pytest.fixture(autouse=True)
+def local_events(monkeypatch):
+    # Room changes emit events; the postgres backend NOTIFYs on commit
+    monkeypatch.setattr(settings, "events_backend", "local")
+
+
+def generations():
+    return {namespace: cache.key(namespace, "") for namespace in (catalogue_cache.ROOMS, catalogue_cache.AVAILABILITY)}
+
+
+def seed(db, status: RoomStatus):
+    db.execute(insert(Guest).values(
+        id=1, first_name="Ada", last_name="Guest", email="ada@example.com", phone="5550000000", id_number="ID1",
+    ))
+    db.execute(insert(Room).values(id=1, room_number="R1", room_type=RoomType.DOUBLE, price=100.0, status=status))
+    db.execute(insert(Reservation).values(
+        id=1, guest_id=1, room_id=1, check_in_date=NOW - timedelta(days=1), check_out_date=NOW + timedelta(days=2),
+        number_of_guests=1, status=ReservationStatus.CHECKED_IN, total_price=300.0,
+    ))
+    db.commit()
+
+
+def test_idle_run_leaves_the_room_caches_alone(sqlite_db):
+    seed(sqlite_db, RoomStatus.OCCUPIED)
+    before = generations()
+    assert reconcile_room_statuses(sqlite_db, now=NOW) == 0
+    sqlite_db.commit()
+    assert generations() == before
+
+
+def test_changed_rooms_invalidate_the_room_caches(sqlite_db):
+    seed(sqlite_db, RoomStatus.AVAILABLE)
+    before = generations()
+    assert reconcile_room_statuses(sqlite_db, now=NOW) == 1
+    sqlite_db.commit()
+    after = generations()
+    assert all(after[namespace] != before[namespace] for namespace in before)
+    assert sqlite_db.get(Room, 1).status == RoomStatus.OCCUPIED
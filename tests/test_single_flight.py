@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+import traceback
+
+import pytest
+from fastapi import HTTPException
+
+from services.single_flight import SingleFlight
+
+
+def test_follower_stops_waiting_and_runs_the_call_itself():
+    flight = SingleFlight(wait_timeout=0.05)
+    release = threading.Event()
+    entered = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append("leader")
+        entered.set()
+        release.wait(5)
+        return "leader"
+
+    leader = threading.Thread(target=flight.do, args=("k", slow))
+    leader.start()
+    entered.wait(5)
+    result = flight.do("k", lambda: calls.append("follower") or "follower")
+    release.set()
+    leader.join()
+    assert result == ("follower", False)
+    assert calls == ["leader", "follower"]
+
+
+def test_followers_share_a_result_within_the_wait():
+    flight = SingleFlight(wait_timeout=5)
+    release = threading.Event()
+    entered = threading.Event()
+    results = []
+
+    def slow():
+        entered.set()
+        release.wait(5)
+        return 42
+
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    entered.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", lambda: 0))) for _ in range(4)]
+    for follower in followers:
+        follower.start()
+    time.sleep(0.1)  # let the followers join the flight
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+    assert sorted(results) == [(42, False)] + [(42, True)] * 4
+
+
+def test_followers_raise_their_own_copy_of_the_leaders_error():
+    flight = SingleFlight(wait_timeout=5)
+    release = threading.Event()
+    entered = threading.Event()
+    errors = []
+
+    def failing():
+        entered.set()
+        release.wait(5)
+        raise HTTPException(status_code=404, detail="Room not found")
+
+    def call():
+        try:
+            flight.do("k", failing)
+        except HTTPException as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    entered.wait(5)
+    followers = [threading.Thread(target=call) for _ in range(4)]
+    for follower in followers:
+        follower.start()
+    time.sleep(0.1)  # let the followers join the flight
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(errors) == 5
+    assert len({id(error) for error in errors}) == 5
+    original = next(error for error in errors if error.__cause__ is None)
+    assert all(error.__cause__ is original for error in errors if error is not original)
+    assert all(error.status_code == 404 and error.detail == "Room not found" for error in errors)
+    # The leader's traceback holds only its own frames
+    frames = [frame.name for frame in traceback.extract_tb(original.__traceback__)]
+    assert frames.count("call") == 1
+
+
+def test_errors_with_their_own_init_are_copied():
+    class Odd(Exception):
+        def __init__(self, a, b):
+            super().__init__(a)
+            self.b = b
+
+    flight = SingleFlight(wait_timeout=5)
+    release = threading.Event()
+    entered = threading.Event()
+
+    def failing():
+        entered.set()
+        release.wait(5)
+        raise Odd(1, 2)
+
+    leader = threading.Thread(target=lambda: pytest.raises(Odd, flight.do, "k", failing))
+    leader.start()
+    entered.wait(5)
+    threading.Timer(0.05, release.set).start()
+    with pytest.raises(Odd) as info:
+        flight.do("k", failing)
+    leader.join()
+    assert (info.value.args, info.value.b) == ((1,), 2)
+    assert isinstance(info.value.__cause__, Odd) and info.value.__cause__ is not info.value
+
+
+def test_async_followers_raise_copies():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise HTTPException(status_code=409, detail="Room is not available")
+
+    async def call():
+        try:
+            await flight.do_async("k", failing)
+        except HTTPException as exc:
+            return exc
+
+    async def main():
+        return await asyncio.gather(*(call() for _ in range(5)))
+
+    errors = asyncio.run(main())
+    assert len({id(error) for error in errors}) == 5
+    original = next(error for error in errors if error.__cause__ is None)
+    assert all(error.__cause__ is original for error in errors if error is not original)
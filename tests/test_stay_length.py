@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+
+from config import settings
+from models.guests import Guest
+from models.reservations import Reservation, ReservationStatus
+from models.rooms import Room, RoomStatus, RoomType
+from routes.reservations import update_reservation
+from schemas.quotes import QuoteRequest
+from schemas.reservations import ReservationBulkCreate, ReservationCreate, ReservationUpdate
+
+START = datetime(2025, 6, 1, 14, 0)
+
+
+def stay(nights: int) -> dict:
+    return {"check_in_date": START, "check_out_date": START + timedelta(days=nights)}
+
+
+def test_create_accepts_the_longest_stay_and_rejects_longer():
+    ReservationCreate(guest_id=1, room_id=1, **stay(settings.max_stay_nights))
+    with pytest.raises(ValidationError, match="cannot be longer"):
+        ReservationCreate(guest_id=1, room_id=1, **stay(settings.max_stay_nights + 1))
+    with pytest.raises(ValidationError, match="cannot be longer"):
+        ReservationBulkCreate(items=[{"guest_id": 1, "room_id": 1, **stay(30 * 365)}])
+
+
+def test_update_and_quotes_reject_long_stays():
+    with pytest.raises(ValidationError, match="cannot be longer"):
+        ReservationUpdate(**stay(settings.max_stay_nights + 1))
+    ReservationUpdate(check_out_date=START + timedelta(days=10 * 365))  # checked by the handler
+    with pytest.raises(ValidationError, match="cannot be longer"):
+        QuoteRequest(room_ids=[1], stays=[stay(settings.max_stay_nights + 1)])
+
+
+def test_update_moving_one_date_checks_against_the_stored_one(sqlite_db):
+    sqlite_db.execute(insert(Guest).values(
+        id=1, first_name="Ada", last_name="Guest", email="ada@example.com", phone="5550000000", id_number="ID1",
+    ))
+    sqlite_db.execute(insert(Room).values(
+        id=1, room_number="R1", room_type=RoomType.DOUBLE, price=100.0, status=RoomStatus.AVAILABLE,
+    ))
+    sqlite_db.execute(insert(Reservation).values(
+        id=1, guest_id=1, room_id=1, number_of_guests=1, status=ReservationStatus.CONFIRMED, total_price=300.0,
+        **stay(3),
+    ))
+    sqlite_db.commit()
+    with pytest.raises(HTTPException) as info:
+        update_reservation(
+            1, ReservationUpdate(check_out_date=START + timedelta(days=20 * 365)), db=sqlite_db, current_user=None
+        )
+    assert info.value.status_code == 400
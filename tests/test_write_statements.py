@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from models.rooms import RoomType
+from routes.guests import create_guest, update_guest
+from routes.rooms import create_room, update_room
+from schemas.guests import GuestCreate, GuestUpdate
+from schemas.rooms import RoomCreate, RoomUpdate
+
+
+@pytest.fixture
+def measure(pg_engine, record_statements):
+    """Call a write handler on its own session; returns its result (or
+    HTTPException) and the statements it sent"""
+    def run(handler, *args):
+        with Session(pg_engine) as db, record_statements(pg_engine) as statements:
+            try:
+                result = handler(*args, db=db, current_user=None)
+            except HTTPException as exc:
+                result = exc
+        return result, [statement.split(None, 1)[0].upper() for statement in statements]
+    return run
+
+
+def guest_payload(tag: str, id_number: str) -> GuestCreate:
+    return GuestCreate(
+        first_name="Count", last_name="Statements", email=f"count-{tag}@example.com",
+        phone="0000000000", id_number=id_number,
+    )
+
+
+def test_guest_writes_take_one_statement(measure):
+    tag = uuid.uuid4().hex[:8]
+    guest, statements = measure(create_guest, guest_payload(tag, f"COUNT-{tag}"))
+    assert statements == ["INSERT"]
+
+    duplicate, statements = measure(create_guest, guest_payload(tag, f"COUNT-{tag}-2"))
+    assert isinstance(duplicate, HTTPException)
+    assert len(statements) == 1
+
+    _, statements = measure(update_guest, guest.id, GuestUpdate(phone="1111111111"))
+    assert statements == ["UPDATE"]
+
+
+def test_room_writes_stay_within_budget(measure):
+    tag = uuid.uuid4().hex[:8]
+    # Creating a room also moves room_inventory totals: one more statement
+    room, statements = measure(create_room, RoomCreate(room_number=f"COUNT-{tag}", room_type=RoomType.SINGLE, price=100))
+    assert len(statements) <= 2, statements
+    assert statements[0] == "INSERT"
+
+    duplicate, statements = measure(create_room, RoomCreate(room_number=f"COUNT-{tag}", room_type=RoomType.SINGLE, price=100))
+    assert isinstance(duplicate, HTTPException)
+    assert len(statements) == 1
+
+    # The room event is numbered and NOTIFYed at commit: one more statement
+    _, statements = measure(update_room, room.id, RoomUpdate(price=120))
+    assert len(statements) <= 2, statements
+    assert statements[0] == "UPDATE"